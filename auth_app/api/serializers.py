@@ -1,7 +1,9 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.settings import api_settings
+from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.models import update_last_login
 
 class RegistrationSerializer(serializers.ModelSerializer):
     """
@@ -54,21 +56,27 @@ User = get_user_model()
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """
     Custom serializer to include user data in the token response.
+    The password is hashed exactly once per login: the token pair is issued
+    for the user that authenticate() already verified.
     """
     username = serializers.CharField(write_only=True)
     password = serializers.CharField(write_only=True)
 
     def validate(self, attrs):
-        username = attrs.get("username")
-        password = attrs.get("password")
+        user = authenticate(
+            request=self.context.get("request"),
+            username=attrs.get("username"),
+            password=attrs.get("password"),
+        )
 
-        try:
-            user = User.objects.get(username=username)
-        except User.DoesNotExist:
+        if not api_settings.USER_AUTHENTICATION_RULE(user):
             raise serializers.ValidationError("Ungültiger Benutzername oder Passwort")
-        
-        if not user.check_password(password):
-            raise serializers.ValidationError("Ungültige Benutzername oder Passwort")
-        
-        data = super().validate({"username": user.username, "password": password})
-        return data
\ No newline at end of file
+
+        self.user = user
+        refresh = self.get_token(user)
+        data = {"refresh": str(refresh), "access": str(refresh.access_token)}
+
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
+
+        return data
@@ -0,0 +1,63 @@
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+from auth_app.api.serializers import CustomTokenObtainPairSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark of login throughput: the current single password verification "
+        "against the previous check_password() + authenticate() double verification."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20, help="Logins per variant.")
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        username, password = f"bench-login-{uuid.uuid4().hex[:8]}", uuid.uuid4().hex
+        credentials = {"username": username, "password": password}
+
+        with transaction.atomic():
+            User.objects.create_user(username=username, password=password)
+
+            single = self.measure(lambda: self.single_verification(credentials), iterations)
+            double = self.measure(lambda: self.double_verification(credentials), iterations)
+
+            # Leave no benchmark user behind.
+            transaction.set_rollback(True)
+
+        for label, (wall, cpu) in (("single verification", single), ("double verification", double)):
+            self.stdout.write(
+                f"{label:>20}: {wall / iterations * 1000:8.1f} ms/login, "
+                f"{iterations / cpu:8.1f} logins/s per core"
+            )
+        self.stdout.write(f"{'speed-up':>20}: {double[1] / single[1]:8.2f}x")
+
+    def measure(self, login, iterations):
+        login()  # warm-up
+        wall, cpu = time.perf_counter(), time.process_time()
+        for _ in range(iterations):
+            login()
+        return time.perf_counter() - wall, max(time.process_time() - cpu, 1e-9)
+
+    def single_verification(self, credentials):
+        serializer = CustomTokenObtainPairSerializer(data=credentials)
+        serializer.is_valid(raise_exception=True)
+
+    def double_verification(self, credentials):
+        """
+        What the login used to do: check the password, then let simplejwt authenticate() again.
+        """
+        user = User.objects.get(username=credentials["username"])
+        if not user.check_password(credentials["password"]):
+            raise ValueError("Benchmark user could not log in")
+        serializer = TokenObtainPairSerializer(data=credentials)
+        serializer.is_valid(raise_exception=True)
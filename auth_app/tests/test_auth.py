@@ -1,7 +1,12 @@
+from io import StringIO
+from unittest.mock import patch
+
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.contrib.auth import get_user_model
+from django.contrib.auth import hashers
+from django.core.management import call_command
 
 User = get_user_model()
 
@@ -47,6 +52,24 @@ class AuthViewsTest(APITestCase):
         self.assertIn("refresh_token", response.cookies)
         self.assertEqual(response.data["detail"], "Login successfully")
 
+    def test_login_hashes_password_once(self):
+        User.objects.create_user(**self.get_user_create_data())
+
+        with patch("django.contrib.auth.base_user.check_password", wraps=hashers.check_password) as mock_check:
+            response = self.client.post(self.login_url, {
+                "username": "testuser",
+                "password": "testpassword123"
+            })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(mock_check.call_count, 1)
+
+    def test_bench_login_command(self):
+        out = StringIO()
+        call_command("bench_login", iterations=1, stdout=out)
+        self.assertIn("speed-up", out.getvalue())
+        self.assertFalse(User.objects.filter(username__startswith="bench-login-").exists())
+
     def test_refresh_token_success(self):
         user = User.objects.create_user(**self.get_user_create_data())
         login_response = self.client.post(self.login_url, {
@@ -0,0 +1,112 @@
+"""
+DATABASES configuration from the environment.
+
+DB_ENGINE selects the profile:
+  sqlite    (default) one file, tuned for many readers next to a few writers: WAL journal,
+            busy timeout, IMMEDIATE write transactions and larger page cache / mmap.
+  postgres  PostgreSQL through psycopg 3 with a connection pool (psycopg[pool]).
+"""
+import os
+
+SQLITE_DEFAULTS = {
+    # Readers no longer wait for writers, and writers no longer wait for readers.
+    "SQLITE_JOURNAL_MODE": "WAL",
+    # NORMAL is safe with WAL (a power loss may only lose the last transactions).
+    "SQLITE_SYNCHRONOUS": "NORMAL",
+    "SQLITE_MMAP_SIZE": str(256 * 1024 * 1024),
+    # Negative values are KiB: 64 MiB page cache per connection.
+    "SQLITE_CACHE_SIZE": str(-64 * 1024),
+    # How long a writer waits for the write lock before "database is locked".
+    "SQLITE_BUSY_TIMEOUT_SECONDS": "20",
+    # IMMEDIATE takes the write lock at the start of atomic blocks, so a transaction that
+    # reads first and writes later waits for the lock instead of failing when it upgrades.
+    "SQLITE_TRANSACTION_MODE": "IMMEDIATE",
+}
+
+
+def _env(env, name: str, default: str = None) -> str:
+    value = env.get(name)
+    return value if value not in (None, "") else default
+
+
+def _bool(value: str) -> bool:
+    return str(value).lower() in ("1", "true", "yes", "on")
+
+
+def _sqlite(env, name: str) -> str:
+    return _env(env, name, SQLITE_DEFAULTS[name])
+
+
+def sqlite_pragmas(env=None) -> list:
+    """
+    PRAGMA statements run on every new SQLite connection.
+    """
+    env = os.environ if env is None else env
+    busy_timeout_ms = int(float(_sqlite(env, "SQLITE_BUSY_TIMEOUT_SECONDS")) * 1000)
+    return [
+        f"PRAGMA journal_mode={_sqlite(env, 'SQLITE_JOURNAL_MODE')}",
+        f"PRAGMA synchronous={_sqlite(env, 'SQLITE_SYNCHRONOUS')}",
+        f"PRAGMA mmap_size={int(_sqlite(env, 'SQLITE_MMAP_SIZE'))}",
+        f"PRAGMA cache_size={int(_sqlite(env, 'SQLITE_CACHE_SIZE'))}",
+        f"PRAGMA busy_timeout={busy_timeout_ms}",
+    ]
+
+
+def sqlite_database(name, env=None) -> dict:
+    env = os.environ if env is None else env
+    return {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": name,
+        "CONN_MAX_AGE": int(_env(env, "DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": _bool(_env(env, "DB_CONN_HEALTH_CHECKS", "True")),
+        "OPTIONS": {
+            "init_command": "; ".join(sqlite_pragmas(env)),
+            # Seconds sqlite3 itself waits for a lock (the busy timeout of the connection).
+            "timeout": float(_sqlite(env, "SQLITE_BUSY_TIMEOUT_SECONDS")),
+            "transaction_mode": _sqlite(env, "SQLITE_TRANSACTION_MODE"),
+        },
+    }
+
+
+def postgres_database(env=None) -> dict:
+    """
+    PostgreSQL with Django's psycopg 3 connection pool. Pooled connections are returned to the pool
+    after every request, so CONN_MAX_AGE stays 0 (Django refuses persistent connections with a pool).
+    """
+    env = os.environ if env is None else env
+    database = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": _env(env, "DB_NAME", "quiz"),
+        "USER": _env(env, "DB_USER", "quiz"),
+        "PASSWORD": _env(env, "DB_PASSWORD", ""),
+        "HOST": _env(env, "DB_HOST", "localhost"),
+        "PORT": _env(env, "DB_PORT", "5432"),
+        "CONN_HEALTH_CHECKS": _bool(_env(env, "DB_CONN_HEALTH_CHECKS", "True")),
+        "OPTIONS": {},
+    }
+    if _bool(_env(env, "DB_POOL", "True")):
+        database["CONN_MAX_AGE"] = 0
+        database["OPTIONS"]["pool"] = {
+            "min_size": int(_env(env, "DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(_env(env, "DB_POOL_MAX_SIZE", "10")),
+            # Seconds a request waits for a free connection before failing.
+            "timeout": float(_env(env, "DB_POOL_TIMEOUT", "10")),
+            # Idle connections above min_size are closed after this many seconds.
+            "max_idle": float(_env(env, "DB_POOL_MAX_IDLE", "300")),
+        }
+    else:
+        database["CONN_MAX_AGE"] = int(_env(env, "DB_CONN_MAX_AGE", "60"))
+    return database
+
+
+def database_settings(base_dir, env=None) -> dict:
+    """
+    The DATABASES setting for the profile chosen by DB_ENGINE.
+    """
+    env = os.environ if env is None else env
+    engine = _env(env, "DB_ENGINE", "sqlite").lower()
+    if engine == "sqlite":
+        return {"default": sqlite_database(_env(env, "DB_NAME", str(base_dir / "db.sqlite3")), env)}
+    if engine in ("postgres", "postgresql"):
+        return {"default": postgres_database(env)}
+    raise ValueError(f"Unknown DB_ENGINE {engine!r}, use 'sqlite' or 'postgres'")
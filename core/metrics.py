@@ -0,0 +1,316 @@
+import atexit
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from django.conf import settings
+
+# Upper bounds in seconds; covers fast API requests as well as minute-long transcriptions.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, math.inf)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class Metric:
+    """
+    A named metric with a fixed set of label names; every combination of label values is one series.
+    """
+    type = None
+
+    def __init__(self, name: str, documentation: str, labelnames=(), registry: "MetricsRegistry" = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.registry = registry or REGISTRY
+        self._values = {}
+        self.registry.register(self)
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects the labels {', '.join(self.labelnames) or '(none)'}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _update(self, labels: dict, update):
+        key = self._key(labels)
+        with self.registry.lock:
+            self._values[key] = update(self._values.get(key))
+        self.registry.changed()
+
+    def meta(self) -> dict:
+        return {"type": self.type, "help": self.documentation, "labels": list(self.labelnames)}
+
+    def samples(self) -> dict:
+        with self.registry.lock:
+            return {key: (list(value) if isinstance(value, list) else value) for key, value in self._values.items()}
+
+    def clear(self):
+        with self.registry.lock:
+            self._values.clear()
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only go up")
+        self._update(labels, lambda value: (value or 0) + amount)
+
+
+class Gauge(Metric):
+    """
+    A value that goes up and down. Across processes the values of the live processes are summed up.
+    """
+    type = "gauge"
+
+    def set(self, value: float, **labels):
+        self._update(labels, lambda _: value)
+
+    def inc(self, amount: float = 1, **labels):
+        self._update(labels, lambda value: (value or 0) + amount)
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, **labels):
+        """
+        Count the block as in progress while it runs.
+        """
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(Metric):
+    """
+    Observations counted into buckets; a series is stored as [count per bucket..., sum].
+    """
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS, registry=None):
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+        if self.buckets[-1] != math.inf:
+            self.buckets += (math.inf,)
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value: float, **labels):
+        index = bisect_left(self.buckets, value)
+
+        def update(series):
+            series = series or [0] * (len(self.buckets) + 1)
+            series[index] += 1
+            series[-1] += value
+            return series
+
+        self._update(labels, update)
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def meta(self) -> dict:
+        return {**super().meta(), "buckets": [str(bound) for bound in self.buckets]}
+
+
+class MetricsRegistry:
+    """
+    The metrics of this process.
+
+    With METRICS_DIR set, every process writes its values to `<dir>/<pid>-<id>.json` (at most every
+    METRICS_FLUSH_SECONDS and on exit), and collect() adds up the files of all processes: counters
+    and histograms of all of them, including exited ones, gauges only of the processes that still run.
+    Clear the directory when the server (re)starts.
+    """
+    def __init__(self, directory: str = None):
+        self._directory = directory
+        self.lock = threading.RLock()
+        self._metrics = {}
+        self._dirty = threading.Event()
+        self._flusher = None
+        self._reset_identity()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    @property
+    def directory(self) -> str:
+        return self._directory if self._directory is not None else settings.METRICS_DIR
+
+    @property
+    def filename(self) -> str:
+        return f"{self._pid}-{self._id}.json"
+
+    def _reset_identity(self):
+        self._pid, self._id = os.getpid(), uuid.uuid4().hex[:8]
+
+    def _after_fork(self):
+        """
+        A forked worker starts from zero: its parent reports what it counted itself.
+        """
+        self.lock = threading.RLock()
+        self._reset_identity()
+        self._flusher = None
+        for metric in self._metrics.values():
+            metric._values.clear()
+
+    def register(self, metric: Metric):
+        with self.lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+
+    def unregister(self, metric: Metric):
+        with self.lock:
+            self._metrics.pop(metric.name, None)
+
+    def changed(self):
+        self._dirty.set()
+        if self._flusher is None and self.directory:
+            self._start_flusher()
+
+    def _start_flusher(self):
+        with self.lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._flush_forever, name="metrics-flush", daemon=True)
+            self._flusher.start()
+        atexit.register(self.flush)
+
+    def _flush_forever(self):
+        while True:
+            time.sleep(settings.METRICS_FLUSH_SECONDS)
+            if self._dirty.is_set():
+                self.flush()
+
+    def snapshot(self) -> dict:
+        """
+        {name: {"type", "help", "labels", ["buckets"], "samples": [[label values, value], ...]}} of this process.
+        """
+        with self.lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: {**metric.meta(), "samples": [[list(key), value] for key, value in metric.samples().items()]}
+                for metric in metrics}
+
+    def flush(self):
+        """
+        Write this process's values to METRICS_DIR (atomically, readers never see a partial file).
+        """
+        directory = self.directory
+        if not directory:
+            return
+        self._dirty.clear()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, self.filename)
+        with open(path + ".tmp", "w") as f:
+            json.dump({"pid": self._pid, "metrics": self.snapshot()}, f)
+        os.replace(path + ".tmp", path)
+
+    def _other_processes(self) -> list:
+        directory = self.directory
+        if not directory or not os.path.isdir(directory):
+            return []
+        snapshots = []
+        for name in os.listdir(directory):
+            if not name.endswith(".json") or name == self.filename:
+                continue
+            try:
+                with open(os.path.join(directory, name)) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            snapshots.append((data.get("pid"), data.get("metrics") or {}))
+        return snapshots
+
+    def collect(self) -> dict:
+        """
+        Metrics of all processes added up: {name: {"type", "help", "labels", ["buckets"], "samples": {key: value}}}.
+        """
+        merged = {}
+        for pid, snapshot in [(self._pid, self.snapshot()), *self._other_processes()]:
+            alive = pid == self._pid or (isinstance(pid, int) and _pid_alive(pid))
+            for name, data in snapshot.items():
+                if data["type"] == "gauge" and not alive:
+                    continue
+                target = merged.setdefault(name, {**{k: v for k, v in data.items() if k != "samples"}, "samples": {}})
+                if data.get("buckets") != target.get("buckets") or data["labels"] != target["labels"]:
+                    continue
+                for key, value in data["samples"]:
+                    key = tuple(key)
+                    current = target["samples"].get(key)
+                    if isinstance(value, list):
+                        target["samples"][key] = value if current is None else [a + b for a, b in zip(current, value)]
+                    else:
+                        target["samples"][key] = value + (current or 0)
+        return merged
+
+    def render(self) -> str:
+        """
+        All metrics in the Prometheus text exposition format.
+        """
+        lines = []
+        for name, data in sorted(self.collect().items()):
+            lines.append(f"# HELP {name} {_escape_help(data['help'])}")
+            lines.append(f"# TYPE {name} {data['type']}")
+            for key, value in sorted(data["samples"].items()):
+                labels = list(zip(data["labels"], key))
+                if data["type"] != "histogram":
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(data["buckets"], value):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(labels + [('le', _bound(bound))])} {_number(cumulative)}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(value[-1])}")
+                lines.append(f"{name}_count{_labels(labels)} {_number(cumulative)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _labels(pairs: list) -> str:
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _bound(bound: str) -> str:
+    return "+Inf" if float(bound) == math.inf else _number(float(bound))
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Time until the response of a request was ready.",
+    ["method", "endpoint", "status"],
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "Database queries per request.",
+    ["method", "endpoint"], buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
@@ -0,0 +1,63 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import connection
+from django.utils.decorators import sync_and_async_middleware
+
+from core import metrics
+
+
+@sync_and_async_middleware
+class MetricsMiddleware:
+    """
+    Record the latency and the number of database queries of every request, per URL route.
+    For streaming responses (Server-Sent Events) the time until the response started is recorded.
+    Async requests stay async under ASGI.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - started, counter.queries)
+        return response
+
+    async def __acall__(self, request):
+        # Database connections belong to threads. The ORM calls of a request run on its thread-sensitive
+        # sync thread (one per request under ASGIHandler), so the counter is installed there.
+        counter = QueryCounter()
+        started = time.perf_counter()
+        await sync_to_async(lambda: connection.execute_wrappers.append(counter))()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(lambda: connection.execute_wrappers.remove(counter))()
+        self.record(request, response, time.perf_counter() - started, counter.queries)
+        return response
+
+    def record(self, request, response, elapsed, queries):
+        match = getattr(request, "resolver_match", None)
+        endpoint = match.route if match else "unmatched"
+        metrics.REQUEST_SECONDS.observe(elapsed, method=request.method, endpoint=endpoint,
+                                        status=response.status_code)
+        metrics.REQUEST_QUERIES.observe(queries, method=request.method, endpoint=endpoint)
+
+
+class QueryCounter:
+    """
+    Database execute wrapper that counts the queries.
+    """
+    def __init__(self):
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
@@ -0,0 +1,249 @@
+import hmac
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.utils.decorators import sync_and_async_middleware
+from rest_framework.exceptions import APIException
+
+from quiz_app.api.authentication import CookieJWTAuthentication
+
+# "<date>-<time>-<microseconds>-<random>": sorting the ids sorts the profiles by age.
+_PROFILE_ID = re.compile(r"\d{8}-\d{6}-\d{6}-[0-9a-f]{6}")
+
+
+def collapse(frame) -> str:
+    """
+    The stack of `frame` in collapsed format: "module:function;module:function;..." from the root down.
+    """
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        name = f"{frame.f_globals.get('__name__', '?')}:{getattr(code, 'co_qualname', code.co_name)}"
+        names.append(name.replace(";", ":").replace(" ", "_"))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """
+    Records the stack of one thread every `interval` seconds from a background thread.
+    The profiled code is not instrumented, so it runs at full speed between the samples.
+    """
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[collapse(frame)] += 1
+
+
+class ProfileStore:
+    """
+    Profiles on disk: `<id>.collapsed` (one "stack count" line per stack, as read by flamegraph.pl,
+    inferno or speedscope) and `<id>.json` with the request details. Only the newest
+    PROFILER_MAX_PROFILES are kept.
+    """
+    def __init__(self, root: str = None, max_profiles: int = None):
+        self._root = root
+        self._max_profiles = max_profiles
+        self._lock = threading.Lock()
+
+    @property
+    def root(self) -> str:
+        return self._root or str(settings.PROFILER_DIR)
+
+    @property
+    def max_profiles(self) -> int:
+        return self._max_profiles if self._max_profiles is not None else settings.PROFILER_MAX_PROFILES
+
+    def save(self, stacks: Counter, **meta) -> str:
+        now = time.time()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+        profile_id = f"{stamp}-{int(now % 1 * 1e6):06d}-{uuid.uuid4().hex[:6]}"
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, f"{profile_id}.collapsed"), "w") as f:
+            f.writelines(f"{stack} {count}\n" for stack, count in stacks.most_common())
+        meta = {"id": profile_id, "created": now, "samples": sum(stacks.values()), **meta}
+        with open(os.path.join(self.root, f"{profile_id}.json"), "w") as f:
+            json.dump(meta, f)
+        self.rotate()
+        return profile_id
+
+    def ids(self) -> list:
+        """
+        Profile ids, newest first.
+        """
+        if not os.path.isdir(self.root):
+            return []
+        return sorted((name[:-5] for name in os.listdir(self.root)
+                       if name.endswith(".json") and _PROFILE_ID.fullmatch(name[:-5])), reverse=True)
+
+    def list(self) -> list:
+        profiles = []
+        for profile_id in self.ids():
+            meta = self.meta(profile_id)
+            if meta is not None:
+                profiles.append(meta)
+        return profiles
+
+    def meta(self, profile_id: str):
+        if not _PROFILE_ID.fullmatch(profile_id or ""):
+            return None
+        try:
+            with open(os.path.join(self.root, f"{profile_id}.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def stacks(self, profile_id: str):
+        """
+        Collapsed stacks of a profile as text, or None if it does not exist.
+        """
+        if not _PROFILE_ID.fullmatch(profile_id or ""):
+            return None
+        try:
+            with open(os.path.join(self.root, f"{profile_id}.collapsed")) as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def rotate(self):
+        with self._lock:
+            for profile_id in self.ids()[self.max_profiles:]:
+                for extension in ("collapsed", "json"):
+                    try:
+                        os.remove(os.path.join(self.root, f"{profile_id}.{extension}"))
+                    except FileNotFoundError:
+                        pass
+
+
+def summarize(collapsed: str, limit: int = 30) -> list:
+    """
+    [(function, self samples, total samples)] of the functions with the most samples
+    of their own, from collapsed stacks.
+    """
+    own, total = Counter(), Counter()
+    for line in collapsed.splitlines():
+        stack, _, count = line.rpartition(" ")
+        if not stack or not count.isdigit():
+            continue
+        frames = stack.split(";")
+        own[frames[-1]] += int(count)
+        for name in set(frames):
+            total[name] += int(count)
+    return [(name, count, total[name]) for name, count in own.most_common(limit)]
+
+
+store = ProfileStore()
+
+
+def _requesting_user(request):
+    """
+    The staff user or the token that asks for a profile with the PROFILER_HEADER header, or None.
+    Checked before anything is sampled, so other clients cannot make their requests slower with the header.
+    """
+    value = request.headers.get(settings.PROFILER_HEADER, "")
+    token = settings.PROFILER_TOKEN
+    if token and hmac.compare_digest(value.encode(), token.encode()):
+        return "token"
+
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        # API clients authenticate with the JWT (cookie or Authorization header), not with the session.
+        try:
+            user = (CookieJWTAuthentication().authenticate(request) or (None, None))[0]
+        except APIException:
+            user = None
+    if user is not None and user.is_authenticated and user.is_staff:
+        return user
+    return None
+
+
+@sync_and_async_middleware
+class ProfilerMiddleware:
+    """
+    Profile a request with the StackSampler when a staff user (session or JWT) sends the PROFILER_HEADER
+    header, or any client sends it with PROFILER_TOKEN as its value, or at random for PROFILER_SAMPLE_RATE
+    of all requests. Requesters get the id of the stored profile in the X-Profile-Id response header;
+    profiles are listed at /admin/profiles/.
+
+    The thread that runs the middleware is sampled: the view of sync requests. Under ASGI async requests
+    stay async; their samples are taken from the event loop thread, so they also contain whatever
+    other coroutines ran meanwhile. Streaming responses are profiled until they start.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def _sampled() -> bool:
+        return settings.PROFILER_SAMPLE_RATE > 0 and random.random() < settings.PROFILER_SAMPLE_RATE
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        requester = _requesting_user(request) if request.headers.get(settings.PROFILER_HEADER) else None
+        if requester is None and not self._sampled():
+            return self.get_response(request)
+
+        sampler = StackSampler(threading.get_ident(), settings.PROFILER_INTERVAL_SECONDS).start()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            stacks = sampler.stop()
+        return self._store(request, response, stacks, time.perf_counter() - started, requester)
+
+    async def __acall__(self, request):
+        requester = None
+        if request.headers.get(settings.PROFILER_HEADER):
+            requester = await sync_to_async(_requesting_user)(request)
+        if requester is None and not self._sampled():
+            return await self.get_response(request)
+
+        sampler = StackSampler(threading.get_ident(), settings.PROFILER_INTERVAL_SECONDS).start()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stacks = sampler.stop()
+        # Writing and rotating the profile files is disk I/O: keep it off the event loop.
+        return await sync_to_async(self._store)(request, response, stacks, time.perf_counter() - started, requester)
+
+    def _store(self, request, response, stacks, elapsed, requester):
+        match = getattr(request, "resolver_match", None)
+        profile_id = store.save(
+            stacks, method=request.method, path=request.path, route=match.route if match else None,
+            status=response.status_code, seconds=round(elapsed, 4),
+            user=requester.get_username() if requester not in (None, "token") else None,
+            trigger="sampling" if requester is None else "header",
+        )
+        if requester is not None:
+            response["X-Profile-Id"] = profile_id
+        return response
@@ -17,6 +17,8 @@ from datetime import timedelta
 from dotenv import load_dotenv
 load_dotenv()
 
+from core.database import database_settings
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -60,12 +62,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.MetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.profiling.ProfilerMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -75,7 +79,7 @@ ROOT_URLCONF = 'core.urls'
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
+        'DIRS': [BASE_DIR / 'core' / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -92,13 +96,31 @@ WSGI_APPLICATION = 'core.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# Configured from the environment, see core/database.py: DB_ENGINE=sqlite (WAL, busy timeout,
+# persistent connections) or DB_ENGINE=postgres (psycopg connection pool).
+
+DATABASES = database_settings(BASE_DIR)
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
 
-DATABASES = {
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Rendered quiz detail responses. Use a shared backend (e.g. Redis) when running
+    # several worker processes so that invalidations reach all of them.
+    'quiz_detail': {
+        'BACKEND': os.getenv('QUIZ_DETAIL_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('QUIZ_DETAIL_CACHE_LOCATION', 'quiz-detail'),
+        'TIMEOUT': int(os.getenv('QUIZ_DETAIL_CACHE_TIMEOUT', '3600')),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('QUIZ_DETAIL_CACHE_MAX_ENTRIES', '5000')),
+        },
+    },
 }
+QUIZ_DETAIL_CACHE_ALIAS = 'quiz_detail'
 
 
 # Password validation
@@ -146,6 +168,10 @@ SIMPLE_JWT = {
     "USER_ID_CLAIM": "user_id",
 }
 
+# Seconds an authenticated user object is reused across requests (0 = always query).
+AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+AUTH_USER_CACHE_MAXSIZE = int(os.getenv("AUTH_USER_CACHE_MAXSIZE", "10000"))
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
@@ -157,10 +183,152 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # --- yt-dlp Settings ---
+# Lowest audio bitrate (kbit/s) that is still fine for speech recognition.
+AUDIO_MIN_BITRATE_KBPS = int(os.getenv("AUDIO_MIN_BITRATE_KBPS", "32"))
 YDL_BASE_OPTS = {
-    "format": "bestaudio/best",
+    # The smallest audio-only stream that is good enough for speech; Whisper resamples to 16 kHz mono anyway.
+    "format": f"bestaudio[abr>={AUDIO_MIN_BITRATE_KBPS}]/bestaudio/best",
+    "format_sort": ["+abr", "+res", "+size"],
     "quiet": True,
     "noplaylist": True,
 }
-
-
+# Downloaded files are re-encoded to 16 kHz mono: "opus" (small) or "wav" (16-bit PCM, no decoding).
+AUDIO_INGEST_CODEC = os.getenv("AUDIO_INGEST_CODEC", "opus")
+AUDIO_SAMPLE_RATE = 16000
+
+# --- Whisper Settings ---
+WHISPER_DEFAULT_MODEL = os.getenv("WHISPER_DEFAULT_MODEL", "small")
+# A language code, or "auto" to detect the language from the first 30 seconds of every video.
+WHISPER_LANGUAGE = os.getenv("WHISPER_LANGUAGE", "de")
+# "fp32" or "int8" (torch dynamic quantization of the linear layers: faster on CPUs, slightly less accurate).
+WHISPER_PRECISION = os.getenv("WHISPER_PRECISION", "fp32")
+# Torch threads of in-process transcription (0 = torch default).
+WHISPER_THREADS = int(os.getenv("WHISPER_THREADS", "0"))
+# Engine keys ("small", "small-int8") to load at startup.
+WHISPER_PRELOAD_MODELS = [
+    name.strip() for name in os.getenv(
+        "WHISPER_PRELOAD_MODELS", WHISPER_DEFAULT_MODEL + ("-int8" if WHISPER_PRECISION == "int8" else "")
+    ).split(",") if name.strip()
+]
+WHISPER_WARMUP_ON_STARTUP = os.getenv("WHISPER_WARMUP_ON_STARTUP", "True").lower() == "true"
+# Seconds a loaded model (or a transcription worker pool) may stay unused before it is evicted (0 = keep forever).
+WHISPER_MODEL_IDLE_TIMEOUT = int(os.getenv("WHISPER_MODEL_IDLE_TIMEOUT", "1800"))
+# Parallel transcription: audio is cut into chunks while it downloads and the chunks are
+# transcribed on a pool of TRANSCRIPTION_WORKERS processes (0 = one Whisper call per file).
+TRANSCRIPTION_WORKERS = int(os.getenv("TRANSCRIPTION_WORKERS", "2"))
+TRANSCRIPTION_CHUNK_SECONDS = int(os.getenv("TRANSCRIPTION_CHUNK_SECONDS", "120"))
+# Torch threads per worker process (0 = spread the CPU cores evenly over the workers).
+TRANSCRIPTION_THREADS_PER_WORKER = int(os.getenv("TRANSCRIPTION_THREADS_PER_WORKER", "0"))
+# Worker pools (one per engine, each worker holding its model) kept at once; idle ones beyond are shut down.
+TRANSCRIPTION_MAX_POOLS = int(os.getenv("TRANSCRIPTION_MAX_POOLS", "2"))
+
+# --- Transcription engines ---
+TRANSCRIPTION_BACKEND = os.getenv("TRANSCRIPTION_BACKEND", "whisper")
+# Models a job may ask for, from the fastest to the most accurate. With a latency budget
+# the most accurate model that is expected to finish in time is used.
+TRANSCRIPTION_MODELS = [
+    name.strip() for name in os.getenv("TRANSCRIPTION_MODELS", "tiny,base,small,medium").split(",") if name.strip()
+]
+# Seconds of audio each model transcribes per second on one worker (fp32); measure on your hardware.
+WHISPER_MODEL_SPEED = {
+    name: float(speed) for name, speed in (
+        item.split("=") for item in os.getenv("WHISPER_MODEL_SPEED", "tiny=8,base=4.5,small=1.5,medium=0.5").split(",")
+    )
+}
+WHISPER_INT8_SPEEDUP = float(os.getenv("WHISPER_INT8_SPEEDUP", "1.4"))
+
+# --- Voice activity detection ---
+# Cut silence out of the audio before Whisper decodes it (energy-based, CPU only).
+VAD_ENABLED = os.getenv("VAD_ENABLED", "True").lower() == "true"
+# Only pauses longer than this are removed; shorter ones keep sentences apart.
+VAD_MIN_SILENCE_SECONDS = float(os.getenv("VAD_MIN_SILENCE_SECONDS", "0.8"))
+# Audio kept before and after every speech region, so word onsets are not clipped.
+VAD_PADDING_SECONDS = float(os.getenv("VAD_PADDING_SECONDS", "0.2"))
+
+# --- Media spool ---
+# Downloaded audio and transcription segments live here; a tmpfs (e.g. /dev/shm/quizly) saves disk I/O.
+MEDIA_SPOOL_DIR = os.getenv("MEDIA_SPOOL_DIR") or str(BASE_DIR / "quiz_app" / "media")
+# Quota of the spool; unleased leftovers are evicted (least recently used first) to stay below it.
+MEDIA_SPOOL_MAX_BYTES = int(os.getenv("MEDIA_SPOOL_MAX_BYTES", str(2 * 1024 ** 3)))
+# `manage.py sweep_media` also removes workspaces of other processes that are older than this.
+MEDIA_SPOOL_MAX_AGE_SECONDS = int(os.getenv("MEDIA_SPOOL_MAX_AGE_SECONDS", str(6 * 3600)))
+
+# --- Quiz generation jobs ---
+# Jobs move through three bounded thread pools: resolve/download, transcribe, generate.
+QUIZ_DOWNLOAD_WORKERS = int(os.getenv("QUIZ_DOWNLOAD_WORKERS", "4"))
+QUIZ_TRANSCRIBE_WORKERS = int(os.getenv("QUIZ_TRANSCRIBE_WORKERS", "2"))
+QUIZ_GENERATE_WORKERS = int(os.getenv("QUIZ_GENERATE_WORKERS", "4"))
+# Upper bounds for batch requests: URLs sent by the client and videos after playlist expansion.
+QUIZ_BATCH_MAX_URLS = int(os.getenv("QUIZ_BATCH_MAX_URLS", "50"))
+QUIZ_BATCH_MAX_ITEMS = int(os.getenv("QUIZ_BATCH_MAX_ITEMS", "100"))
+# Attempts of a job or batch write that finds the database locked (SQLite under concurrent writers)
+# before the job gives up; retried with a short backoff.
+QUIZ_JOB_DB_ATTEMPTS = int(os.getenv("QUIZ_JOB_DB_ATTEMPTS", "5"))
+# Run jobs inline in the request instead of on the worker pool (tests / debugging).
+QUIZ_JOBS_EAGER = os.getenv("QUIZ_JOBS_EAGER", "False").lower() == "true"
+
+# --- Async views ---
+# Serve quiz list/create/detail with the async views (for ASGI deployments).
+QUIZ_ASYNC_VIEWS = os.getenv("QUIZ_ASYNC_VIEWS", "False").lower() == "true"
+
+# --- Job progress (Server-Sent Events) ---
+# Recent events kept per job so late or reconnecting listeners can catch up.
+PROGRESS_HISTORY_SIZE = int(os.getenv("PROGRESS_HISTORY_SIZE", "50"))
+PROGRESS_MAX_JOBS = int(os.getenv("PROGRESS_MAX_JOBS", "1000"))
+# A comment frame is sent this often so proxies do not close idle streams.
+PROGRESS_HEARTBEAT_SECONDS = float(os.getenv("PROGRESS_HEARTBEAT_SECONDS", "15"))
+
+# --- Bulk persistence ---
+QUESTION_BULK_BATCH_SIZE = int(os.getenv("QUESTION_BULK_BATCH_SIZE", "500"))
+QUIZ_IMPORT_MAX_QUIZZES = int(os.getenv("QUIZ_IMPORT_MAX_QUIZZES", "5000"))
+
+# --- Gemini client ---
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+# Only needed to point the client at a proxy or a local fake server.
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL") or None
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "120"))
+GEMINI_MAX_CONNECTIONS = int(os.getenv("GEMINI_MAX_CONNECTIONS", "10"))
+GEMINI_KEEPALIVE_SECONDS = float(os.getenv("GEMINI_KEEPALIVE_SECONDS", "60"))
+GEMINI_MAX_ATTEMPTS = int(os.getenv("GEMINI_MAX_ATTEMPTS", "3"))
+GEMINI_RETRY_INITIAL_DELAY = float(os.getenv("GEMINI_RETRY_INITIAL_DELAY", "1"))
+GEMINI_RETRY_MAX_DELAY = float(os.getenv("GEMINI_RETRY_MAX_DELAY", "10"))
+# Send a duplicate request once a call is slower than this latency percentile (0 = no hedging).
+GEMINI_HEDGE_PERCENTILE = float(os.getenv("GEMINI_HEDGE_PERCENTILE", "0"))
+GEMINI_HEDGE_MIN_SAMPLES = int(os.getenv("GEMINI_HEDGE_MIN_SAMPLES", "20"))
+GEMINI_LATENCY_WINDOW = int(os.getenv("GEMINI_LATENCY_WINDOW", "200"))
+
+# --- Prompt budget ---
+# Number of transcript characters sent to Gemini.
+GEMINI_TRANSCRIPT_CHAR_LIMIT = int(os.getenv("GEMINI_TRANSCRIPT_CHAR_LIMIT", "12000"))
+# Only download and transcribe roughly as much audio as fits into the prompt.
+TRANSCRIBE_WITHIN_PROMPT_BUDGET = os.getenv("TRANSCRIBE_WITHIN_PROMPT_BUDGET", "True").lower() == "true"
+# Average spoken characters per second, used to turn the char limit into an audio duration.
+TRANSCRIPT_CHARS_PER_SECOND = float(os.getenv("TRANSCRIPT_CHARS_PER_SECOND", "14"))
+# Extra audio on top of the estimate, for slow speakers and pauses.
+TRANSCRIPT_BUDGET_MARGIN = float(os.getenv("TRANSCRIPT_BUDGET_MARGIN", "1.3"))
+
+# --- Transcript cache ---
+TRANSCRIPT_CACHE_ENABLED = os.getenv("TRANSCRIPT_CACHE_ENABLED", "True").lower() == "true"
+# Upper bound for the stored transcript text; least recently used entries are evicted first.
+TRANSCRIPT_CACHE_MAX_BYTES = int(os.getenv("TRANSCRIPT_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+# --- Metrics ---
+# Directory shared by all worker processes of a host; each one writes its metrics there,
+# so /api/metrics/ reports the sum over all of them. Empty: only the answering process.
+# Clear the directory whenever the server (re)starts.
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+# Bearer token of the Prometheus scraper; staff users logged in to the admin can read the metrics as well.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# --- Request profiling ---
+# Staff users get a profile of a request by sending this header (any value);
+# other clients only with PROFILER_TOKEN as the value (unset = staff only).
+PROFILER_HEADER = os.getenv("PROFILER_HEADER", "X-Profile")
+PROFILER_TOKEN = os.getenv("PROFILER_TOKEN", "")
+# Share of all requests that is profiled at random (0 = only on request).
+PROFILER_SAMPLE_RATE = float(os.getenv("PROFILER_SAMPLE_RATE", "0"))
+PROFILER_INTERVAL_SECONDS = float(os.getenv("PROFILER_INTERVAL_SECONDS", "0.005"))
+PROFILER_DIR = os.getenv("PROFILER_DIR", str(BASE_DIR / "profiles"))
+# Older profiles are deleted.
+PROFILER_MAX_PROFILES = int(os.getenv("PROFILER_MAX_PROFILES", "200"))
@@ -15,10 +15,15 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
+
+from core.views import metrics_view, profile_detail, profile_list
 
 urlpatterns = [
+    path('admin/profiles/', admin.site.admin_view(profile_list), name='profile-list'),
+    path('admin/profiles/<str:profile_id>/', admin.site.admin_view(profile_detail), name='profile-detail'),
     path('admin/', admin.site.urls),
+    re_path(r'^api/metrics/?$', metrics_view, name='metrics'),
     path('api/', include('auth_app.api.urls')),
     path('api/', include('quiz_app.api.urls')),
 ]
@@ -0,0 +1,61 @@
+import hmac
+
+from django.conf import settings
+from django.contrib import admin
+from django.http import Http404, HttpResponse
+from django.template.response import TemplateResponse
+
+from core import metrics, profiling
+
+
+def metrics_view(request):
+    """
+    Metrics of all worker processes in the Prometheus text format.
+    Readable with `Authorization: Bearer <METRICS_TOKEN>` or by staff users that are logged in to the admin.
+    """
+    token = settings.METRICS_TOKEN
+    header = request.headers.get("Authorization", "")
+    if not (token and hmac.compare_digest(header.encode(), f"Bearer {token}".encode())):
+        if not request.user.is_authenticated:
+            response = HttpResponse("Authentication required.\n", status=401, content_type="text/plain")
+            response["WWW-Authenticate"] = "Bearer"
+            return response
+        if not request.user.is_staff:
+            return HttpResponse("Forbidden.\n", status=403, content_type="text/plain")
+
+    return HttpResponse(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+
+
+def profile_list(request):
+    """
+    Admin page: the stored request profiles, newest first.
+    """
+    context = {**admin.site.each_context(request), "title": "Request profiles", "profiles": profiling.store.list(),
+               "header": settings.PROFILER_HEADER}
+    return TemplateResponse(request, "admin/profiles/list.html", context)
+
+
+def profile_detail(request, profile_id):
+    """
+    Admin page: the functions with the most samples of a profile; `?download` returns the collapsed stacks.
+    """
+    meta, collapsed = profiling.store.meta(profile_id), profiling.store.stacks(profile_id)
+    if meta is None or collapsed is None:
+        raise Http404("Profile not found")
+
+    if "download" in request.GET:
+        response = HttpResponse(collapsed, content_type="text/plain; charset=utf-8")
+        response["Content-Disposition"] = f'attachment; filename="{profile_id}.collapsed"'
+        return response
+
+    context = {
+        **admin.site.each_context(request),
+        "title": f"Profile {profile_id}",
+        "profile": meta,
+        "functions": [
+            {"name": name, "own": own, "total": total,
+             "own_percent": 100 * own / max(meta["samples"], 1), "total_percent": 100 * total / max(meta["samples"], 1)}
+            for name, own, total in profiling.summarize(collapsed)
+        ],
+    }
+    return TemplateResponse(request, "admin/profiles/detail.html", context)
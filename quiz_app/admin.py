@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from quiz_app.models import Quiz, Question
+from quiz_app.models import Quiz, Question, QuizGenerationBatch, QuizGenerationJob, TranscriptCacheEntry
 
 @admin.register(Quiz)
 class QuizAdmin(admin.ModelAdmin):
@@ -13,4 +13,25 @@ class QuizAdmin(admin.ModelAdmin):
 class QuestionAdmin(admin.ModelAdmin):
     list_display = ("id", "quiz", "question_title", "answer")
     search_fields = ("question_title",)
-    list_filter = ("quiz",)
\ No newline at end of file
+    list_filter = ("quiz",)
+
+@admin.register(QuizGenerationJob)
+class QuizGenerationJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "owner", "url", "status", "quiz", "batch", "created_at", "finished_at")
+    search_fields = ("url", "owner__username")
+    list_filter = ("status", "created_at")
+    ordering = ("-created_at",)
+
+@admin.register(QuizGenerationBatch)
+class QuizGenerationBatchAdmin(admin.ModelAdmin):
+    list_display = ("id", "owner", "status", "created_at", "finished_at")
+    search_fields = ("owner__username",)
+    list_filter = ("status", "created_at")
+    ordering = ("-created_at",)
+
+@admin.register(TranscriptCacheEntry)
+class TranscriptCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ("id", "extractor", "video_id", "model_name", "language", "size_bytes", "hits", "last_used_at")
+    search_fields = ("video_id",)
+    list_filter = ("extractor", "model_name", "language")
+    ordering = ("-last_used_at",)
@@ -0,0 +1,248 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Prefetch, aprefetch_related_objects
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from quiz_app.api.cache import aget_cached_detail, astore_detail
+from quiz_app.api.jobs import batch_channel, enqueue_job
+from quiz_app.api.pagination import QuizCursorPagination
+from quiz_app.api.progress import TERMINAL_EVENTS, broker, format_sse
+from quiz_app.api.quiz_list import QuizListFieldset
+from quiz_app.api.serializers import QuizDetailSerializer, QuizGenerationJobSerializer, QuizSerializer
+from quiz_app.models import Question, Quiz, QuizGenerationBatch, QuizGenerationJob
+
+PARSERS = [JSONParser(), FormParser(), MultiPartParser()]
+
+
+def _authenticate(request):
+    """
+    Run the configured DRF authenticators on a plain Django request.
+    Raises an APIException if the credentials are invalid; returns the (possibly anonymous) user.
+    """
+    drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    return drf_request.user
+
+
+async def authenticate(request):
+    """
+    Authenticate an async view's request like the DRF views do.
+    Returns (user, None) on success or (None, error response).
+    """
+    try:
+        user = await sync_to_async(_authenticate)(request)
+    except exceptions.APIException as e:
+        return None, JsonResponse({"detail": str(e.detail)}, status=e.status_code)
+    if not user or not user.is_authenticated:
+        return None, JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+    return user, None
+
+
+def _terminal_message(obj):
+    event = "done" if obj.status == "done" else "failed"
+    if isinstance(obj, QuizGenerationJob) and event == "done":
+        return {"id": None, "event": event, "data": {"status": obj.status, "quiz": obj.quiz_id}}
+    return {"id": None, "event": event, "data": {"status": obj.status, "error": obj.error}}
+
+
+def _snapshot_message(obj):
+    data = {"status": obj.status}
+    if isinstance(obj, QuizGenerationJob):
+        data["quiz"] = obj.quiz_id
+    return {"id": None, "event": "status", "data": data}
+
+
+async def _event_stream(request, model, pk, channel):
+    """
+    Server-Sent Events response for the progress `channel` of the `model` instance `pk`
+    (a job or a batch) owned by the requesting user.
+    """
+    user, error = await authenticate(request)
+    if error is not None:
+        return error
+
+    if not await model.objects.filter(pk=pk).aexists():
+        return JsonResponse({"detail": f"No {model.__name__} matches the given query."}, status=404)
+    if not await model.objects.filter(pk=pk, owner_id=user.pk).aexists():
+        return JsonResponse({"detail": "You do not have permission to perform this action."}, status=403)
+
+    try:
+        last_event_id = int(request.headers.get("Last-Event-ID") or 0)
+    except ValueError:
+        last_event_id = 0
+
+    async def stream():
+        with broker.subscribe(channel, after=last_event_id) as queue:
+            # Read the status only after subscribing, so no event can slip in between.
+            obj = await model.objects.aget(pk=pk)
+            yield format_sse(_snapshot_message(obj))
+            if obj.is_finished and queue.empty():
+                yield format_sse(_terminal_message(obj))
+                return
+
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=settings.PROGRESS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # Work running in another process publishes nowhere we can see; fall back to the DB.
+                    obj = await model.objects.aget(pk=pk)
+                    if obj.is_finished:
+                        yield format_sse(_terminal_message(obj))
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+
+                yield format_sse(message)
+                if message["event"] in TERMINAL_EVENTS:
+                    return
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def job_events(request, pk):
+    """
+    Stream the progress of a quiz generation job as Server-Sent Events.
+
+    The first frame is a `status` snapshot of the job; then `stage`, `download`,
+    `transcription` and `gemini` events follow until `done` or `failed` ends the stream.
+    Waiting listeners are plain coroutines, so idle connections hold no thread.
+    """
+    return await _event_stream(request, QuizGenerationJob, pk, pk)
+
+
+async def batch_events(request, pk):
+    """
+    Stream the results of a batch as Server-Sent Events: `expanded` with the job ids,
+    one `item` per finished job, then `done` (or `failed` if the URLs could not be expanded).
+    """
+    return await _event_stream(request, QuizGenerationBatch, pk, batch_channel(pk))
+
+
+def render_json(data, status: int = 200) -> HttpResponse:
+    """
+    Render `data` exactly like the DRF views do (JSONRenderer), without a DRF Response.
+    """
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type="application/json")
+
+
+def _method_not_allowed(allowed):
+    response = JsonResponse({"detail": "Method not allowed."}, status=405)
+    response["Allow"] = ", ".join(allowed)
+    return response
+
+
+def _questions():
+    return Prefetch("questions", queryset=Question.objects.order_by("quiz_id", "id"))
+
+
+def user_quizzes(user, fieldset):
+    """
+    Quizzes of `user`, newest first, loaded for `fieldset` (same as QuizListCreateView).
+    """
+    return fieldset.queryset(Quiz.objects.filter(owner=user).order_by("-created_at", "-id"))
+
+
+def _paginated_list(drf_request, user, fieldset):
+    paginator = QuizCursorPagination()
+    page = paginator.paginate_queryset(user_quizzes(user, fieldset), drf_request)
+    return paginator.get_paginated_response(fieldset.serializer(page).data).data
+
+
+@csrf_exempt
+async def quiz_list_create(request):
+    """
+    Async counterpart of QuizListCreateView: list the user's quizzes or queue a generation job.
+    """
+    if request.method not in ("GET", "POST"):
+        return _method_not_allowed(["GET", "POST"])
+
+    user, error = await authenticate(request)
+    if error is not None:
+        return error
+    drf_request = Request(request, parsers=PARSERS)
+
+    if request.method == "GET":
+        params = drf_request.query_params
+        try:
+            fieldset = QuizListFieldset(params)
+        except exceptions.ValidationError as e:
+            return render_json(e.detail, status=e.status_code)
+        if QuizCursorPagination.cursor_query_param in params or QuizCursorPagination.page_size_query_param in params:
+            # Cursor pagination is synchronous DRF code; run it on the ORM's thread.
+            return render_json(await sync_to_async(_paginated_list)(drf_request, user, fieldset))
+        quizzes = [quiz async for quiz in user_quizzes(user, fieldset)]
+        return render_json(fieldset.serializer(quizzes).data)
+
+    try:
+        serializer = QuizSerializer(data=drf_request.data)
+    except exceptions.APIException as e:
+        return render_json({"detail": str(e.detail)}, status=e.status_code)
+    if not serializer.is_valid():
+        return render_json(serializer.errors, status=400)
+
+    job = await QuizGenerationJob.objects.acreate(owner=user, url=serializer.validated_data["url"],
+                                                  **serializer.job_fields())
+    # Normally only a hand-off to the job pool; with QUIZ_JOBS_EAGER the whole pipeline runs here.
+    await sync_to_async(enqueue_job)(job)
+    await job.arefresh_from_db()
+
+    data = QuizGenerationJobSerializer(job, context={"request": drf_request}).data
+    response = render_json(data, status=202)
+    response["Location"] = data["status_url"]
+    return response
+
+
+@csrf_exempt
+async def quiz_detail(request, pk):
+    """
+    Async counterpart of QuizDetailView: retrieve, update or delete one of the user's quizzes.
+    """
+    if request.method not in ("GET", "PUT", "PATCH", "DELETE"):
+        return _method_not_allowed(["GET", "PUT", "PATCH", "DELETE"])
+
+    user, error = await authenticate(request)
+    if error is not None:
+        return error
+
+    quiz = await Quiz.objects.filter(pk=pk).afirst()
+    if quiz is None:
+        return JsonResponse({"detail": "No Quiz matches the given query."}, status=404)
+    if quiz.owner_id != user.pk:
+        return JsonResponse({"detail": "You do not have permission to perform this action."}, status=403)
+
+    if request.method == "DELETE":
+        await quiz.adelete()
+        return HttpResponse(status=204)
+
+    if request.method == "GET":
+        cached = await aget_cached_detail(quiz)
+        if cached is not None:
+            content_type, body = cached
+            return HttpResponse(body, content_type=content_type)
+
+        await aprefetch_related_objects([quiz], _questions())
+        response = render_json(QuizDetailSerializer(quiz).data)
+        await astore_detail(quiz, response)
+        return response
+
+    drf_request = Request(request, parsers=PARSERS)
+    try:
+        serializer = QuizDetailSerializer(quiz, data=drf_request.data, partial=request.method == "PATCH")
+    except exceptions.APIException as e:
+        return render_json({"detail": str(e.detail)}, status=e.status_code)
+    if not serializer.is_valid():
+        return render_json(serializer.errors, status=400)
+    await sync_to_async(serializer.save)()
+
+    await aprefetch_related_objects([quiz], _questions())
+    return render_json(QuizDetailSerializer(quiz).data)
@@ -0,0 +1,83 @@
+from django.conf import settings
+from yt_dlp.postprocessor import FFmpegPostProcessor
+from yt_dlp.utils import prepend_extension, replace_extension
+
+
+class SpeechAudioPP(FFmpegPostProcessor):
+    """
+    yt-dlp postprocessor that re-encodes a download to 16 kHz mono, the format Whisper
+    decodes to anyway: compact Opus, or 16-bit PCM WAV that needs no decoding at all.
+    """
+    CODECS = {
+        "opus": ("opus", ["-c:a", "libopus", "-b:a", "24k", "-application", "voip"]),
+        "wav": ("wav", ["-c:a", "pcm_s16le"]),
+    }
+
+    def __init__(self, downloader=None, codec: str = "opus", sample_rate: int = 16000):
+        super().__init__(downloader)
+        if codec not in self.CODECS:
+            raise ValueError(f"Unsupported ingest codec {codec!r}, use one of {', '.join(self.CODECS)}")
+        self.codec = codec
+        self.sample_rate = sample_rate
+
+    def run(self, info):
+        path = info["filepath"]
+        extension, codec_args = self.CODECS[self.codec]
+        new_path = replace_extension(path, extension, info.get("ext"))
+        if new_path == path:
+            new_path = prepend_extension(path, "16k")
+
+        self.to_screen(f"Converting to {self.sample_rate} Hz mono {self.codec}: {new_path}")
+        self.run_ffmpeg(path, new_path, ["-vn", "-ac", "1", "-ar", str(self.sample_rate), *codec_args])
+
+        info["filepath"], info["ext"] = new_path, extension
+        # yt-dlp deletes the returned files, i.e. the original download.
+        return [path], info
+
+
+def estimate_format_bytes(fmt: dict, duration: float = None):
+    """
+    Size of a yt-dlp format in bytes: the reported (approximate) size, else bitrate × duration.
+    """
+    size = fmt.get("filesize") or fmt.get("filesize_approx")
+    bitrate = fmt.get("abr") if fmt.get("vcodec") == "none" else fmt.get("tbr") or fmt.get("abr")
+    if not size and duration and bitrate:
+        size = bitrate * 1000 / 8 * duration
+    return int(size) if size else None
+
+
+def _is_audio_only(fmt: dict) -> bool:
+    return fmt.get("vcodec") == "none" and fmt.get("acodec") not in (None, "none")
+
+
+def media_savings(info: dict, max_seconds: float = None):
+    """
+    Compare the stream(s) yt-dlp selected for `info` with the largest audio-only stream,
+    which is what the former "bestaudio/best" selection downloaded.
+    Returns None if the sizes are unknown.
+    """
+    duration = info.get("duration")
+    selected = info.get("requested_formats") or [info]
+    selected_sizes = [estimate_format_bytes(fmt, duration) for fmt in selected]
+    if not selected_sizes or None in selected_sizes:
+        return None
+
+    audio_sizes = [estimate_format_bytes(fmt, duration) for fmt in info.get("formats") or [] if _is_audio_only(fmt)]
+    audio_sizes = [size for size in audio_sizes if size]
+    baseline = max(audio_sizes) if audio_sizes else sum(selected_sizes)
+
+    # Only the beginning of the audio is fetched when the prompt budget caps the transcript.
+    share = min(1.0, max_seconds / duration) if max_seconds and duration else 1.0
+    media_bytes = int(sum(selected_sizes) * share)
+    baseline_bytes = int(max(baseline, sum(selected_sizes)) * share)
+    return {
+        "format_id": info.get("format_id"),
+        "abr": info.get("abr"),
+        "bytes": media_bytes,
+        "baseline_bytes": baseline_bytes,
+        "bytes_saved": baseline_bytes - media_bytes,
+    }
+
+
+def speech_postprocessor() -> SpeechAudioPP:
+    return SpeechAudioPP(codec=settings.AUDIO_INGEST_CODEC, sample_rate=settings.AUDIO_SAMPLE_RATE)
@@ -1,8 +1,64 @@
+import copy
+import threading
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class UserCache:
+    """
+    Small thread-safe TTL cache of user objects keyed by user id, with hit/miss counters.
+    Ids are normalised to strings because the token claim and the model pk differ in type.
+    Entries are dropped on user save/delete (see quiz_app.signals); the TTL bounds
+    staleness for changes made by other processes or by queryset.update().
+    """
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id):
+        with self._lock:
+            user = self._cache.get(str(user_id))
+            if user is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        # Every request gets its own copy, so per-request changes never leak into the cache.
+        return copy.copy(user)
+
+    def set(self, user_id, user):
+        with self._lock:
+            self._cache[str(user_id)] = copy.copy(user)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._cache.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._cache)}
+
+
+user_cache = UserCache(maxsize=settings.AUTH_USER_CACHE_MAXSIZE, ttl=settings.AUTH_USER_CACHE_TTL)
+
 
 class CookieJWTAuthentication(JWTAuthentication):
     """
     Custom JWT authentication class that retrieves the token from cookies.
+    Users are looked up through a short-lived in-process cache instead of one query per request.
     """
     def authenticate(self, request):
 
@@ -13,4 +69,26 @@ class CookieJWTAuthentication(JWTAuthentication):
             user = self.get_user(validated_token)
             return (user, validated_token)
 
-        return super().authenticate(request)
\ No newline at end of file
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        """
+        Return the cached user of the token, or load (and validate) it with the default lookup.
+        Only active users end up in the cache.
+        """
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None or not settings.AUTH_USER_CACHE_TTL:
+            return super().get_user(validated_token)
+
+        user = user_cache.get(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user)
+            return user
+
+        if api_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password)
+        ):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
@@ -0,0 +1,92 @@
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+from quiz_app.api import metrics
+
+
+def quiz_detail_cache():
+    return caches[settings.QUIZ_DETAIL_CACHE_ALIAS]
+
+
+def _detail_key(quiz_id: int) -> str:
+    return f"quiz-detail:{quiz_id}"
+
+
+def _version(quiz) -> str:
+    return quiz.updated_at.isoformat()
+
+
+def _cached_detail(quiz, entry):
+    if entry is None or entry[0] != _version(quiz):
+        metrics.CACHE_REQUESTS.inc(cache="quiz_detail", result="miss")
+        return None
+    metrics.CACHE_REQUESTS.inc(cache="quiz_detail", result="hit")
+    _, content_type, body = entry
+    return content_type, body
+
+
+def _detail_entry(quiz, response):
+    return _version(quiz), response["Content-Type"], response.content
+
+
+def get_cached_detail(quiz):
+    """
+    Return (content_type, body) of the cached JSON rendering of `quiz`, or None.
+    An entry only counts if it was rendered from the same `updated_at`.
+    """
+    return _cached_detail(quiz, quiz_detail_cache().get(_detail_key(quiz.id)))
+
+
+async def aget_cached_detail(quiz):
+    """
+    Async get_cached_detail() for async views; a shared cache backend is not queried on the event loop.
+    """
+    return _cached_detail(quiz, await quiz_detail_cache().aget(_detail_key(quiz.id)))
+
+
+def store_detail(quiz, response):
+    """
+    Post-render callback: keep the rendered bytes of a quiz detail response.
+    """
+    if response.status_code == 200:
+        quiz_detail_cache().set(_detail_key(quiz.id), _detail_entry(quiz, response))
+
+
+async def astore_detail(quiz, response):
+    """
+    Async store_detail() for responses that are already rendered.
+    """
+    if response.status_code == 200:
+        await quiz_detail_cache().aset(_detail_key(quiz.id), _detail_entry(quiz, response))
+
+
+def invalidate_quiz_detail(quiz_id: int):
+    quiz_detail_cache().delete(_detail_key(quiz_id))
+
+
+class PreRenderedResponse(Response):
+    """
+    Response whose body was rendered earlier (e.g. taken from a cache).
+    `data` is only decoded from the body if somebody actually reads it.
+    """
+    def __init__(self, body: bytes, content_type: str, **kwargs):
+        super().__init__(data=None, content_type=content_type, **kwargs)
+        self._body = body
+
+    @property
+    def data(self):
+        if self._data is None and getattr(self, "_body", None) is not None:
+            self._data = json.loads(self._body)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
+    @property
+    def rendered_content(self):
+        self["Content-Type"] = self.content_type
+        return self._body
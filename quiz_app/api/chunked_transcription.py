@@ -0,0 +1,330 @@
+import logging
+import multiprocessing
+import os
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from quiz_app.api import engines, media_spool, vad
+
+logger = logging.getLogger(__name__)
+
+
+class _PoolEntry:
+    """
+    A worker pool plus the bookkeeping needed to shut it down again.
+    """
+    def __init__(self, pool: ProcessPoolExecutor):
+        self.pool = pool
+        self.users = 0
+        self.last_used = time.monotonic()
+
+
+# Engine key -> _PoolEntry, least recently used first.
+_pools = OrderedDict()
+_pools_lock = threading.Lock()
+_reaper = None
+
+# Engine and VAD options of the current transcription worker process (set by _init_worker).
+_worker_engine = None
+_worker_vad = None
+
+
+def _init_worker(engine_key: str, threads: int, vad_options: dict = None):
+    """
+    Process pool initializer: load the transcription engine once per worker process.
+    """
+    global _worker_engine, _worker_vad
+    import torch
+
+    torch.set_num_threads(max(1, threads))
+    _worker_engine = engines.load_engine(engine_key, threads=0)
+    _worker_vad = vad_options
+
+
+def _transcribe_segment(path: str, language: str) -> dict:
+    """
+    Transcribe one WAV segment; with VAD enabled only its speech is decoded.
+    Returns {"text", "audio_seconds", "speech_seconds"}.
+    """
+    if _worker_vad is None:
+        result = _worker_engine.transcribe(path, language=language)
+        return {"text": result["text"].strip(), "audio_seconds": None, "speech_seconds": None}
+
+    speech, _, stats = vad.trim_silence(vad.read_wav(path), **_worker_vad)
+    text = ""
+    if len(speech):
+        text = _worker_engine.transcribe(speech, language=language)["text"].strip()
+    return {"text": text, "audio_seconds": stats["audio_seconds"], "speech_seconds": stats["speech_seconds"]}
+
+
+def _detect_language(path: str) -> str:
+    return _worker_engine.detect_language(vad.read_wav(path))
+
+
+def _new_pool(model_name: str) -> ProcessPoolExecutor:
+    workers = settings.TRANSCRIPTION_WORKERS
+    threads = settings.TRANSCRIPTION_THREADS_PER_WORKER or max(1, (os.cpu_count() or 1) // workers)
+    # "spawn" keeps torch/OpenMP state and server threads of the parent out of the workers.
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(model_name, threads, vad.options_from_settings()),
+    )
+
+
+@contextmanager
+def use_pool(model_name: str):
+    """
+    Context manager yielding the process pool transcribing with the engine `model_name` (an engine
+    key such as "small" or "small-int8"), creating it on first use.
+
+    Every worker process holds a loaded model, so at most TRANSCRIPTION_MAX_POOLS pools are kept:
+    the least recently used idle pools beyond that are shut down, as are pools that have been idle
+    for WHISPER_MODEL_IDLE_TIMEOUT seconds. Pools in use are never shut down.
+    """
+    with _pools_lock:
+        entry = _pools.get(model_name)
+        if entry is None:
+            entry = _pools[model_name] = _PoolEntry(_new_pool(model_name))
+        _pools.move_to_end(model_name)
+        entry.users += 1
+        entry.last_used = time.monotonic()
+        stale = _trim_pools()
+    _shutdown_pools(stale)
+    _ensure_reaper()
+    try:
+        yield entry.pool
+    finally:
+        with _pools_lock:
+            entry.users -= 1
+            entry.last_used = time.monotonic()
+            if _pools.get(model_name) is entry:
+                _pools.move_to_end(model_name)
+            stale = _trim_pools()
+        _shutdown_pools(stale)
+
+
+def _trim_pools() -> list:
+    """
+    Take the least recently used idle pools beyond TRANSCRIPTION_MAX_POOLS out of `_pools`
+    (with `_pools_lock` held) and return them as (engine key, pool) pairs.
+    """
+    excess = len(_pools) - max(1, settings.TRANSCRIPTION_MAX_POOLS)
+    stale = []
+    for name, entry in list(_pools.items()):
+        if excess <= 0:
+            break
+        if entry.users == 0:
+            del _pools[name]
+            stale.append((name, entry.pool))
+            excess -= 1
+    return stale
+
+
+def _shutdown_pools(stale: list):
+    for name, pool in stale:
+        logger.info("Shutting down the transcription pool of %r", name)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _discard_pool(model_name: str, pool: ProcessPoolExecutor):
+    with _pools_lock:
+        entry = _pools.get(model_name)
+        if entry is not None and entry.pool is pool:
+            del _pools[model_name]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def evict_idle_pools(now: float = None) -> list:
+    """
+    Shut down every pool that has been idle for longer than WHISPER_MODEL_IDLE_TIMEOUT
+    and return their engine keys.
+    """
+    timeout = settings.WHISPER_MODEL_IDLE_TIMEOUT
+    if not timeout:
+        return []
+
+    now = time.monotonic() if now is None else now
+    with _pools_lock:
+        stale = [(name, entry.pool) for name, entry in _pools.items()
+                 if entry.users == 0 and now - entry.last_used >= timeout]
+        for name, _ in stale:
+            del _pools[name]
+    _shutdown_pools(stale)
+    return [name for name, _ in stale]
+
+
+def pool_keys() -> list:
+    with _pools_lock:
+        return list(_pools)
+
+
+def _ensure_reaper():
+    """
+    Start the background thread that shuts down idle pools (once per process).
+    """
+    global _reaper
+    if not settings.WHISPER_MODEL_IDLE_TIMEOUT:
+        return
+    with _pools_lock:
+        if _reaper is not None and _reaper.is_alive():
+            return
+        _reaper = threading.Thread(target=_reap_forever, name="transcription-pool-reaper", daemon=True)
+        _reaper.start()
+
+
+def _reap_forever():
+    global _reaper
+    while True:
+        timeout = settings.WHISPER_MODEL_IDLE_TIMEOUT
+        if not timeout:
+            return
+        time.sleep(max(timeout / 2, 1))
+        evict_idle_pools()
+        with _pools_lock:
+            if not _pools:
+                _reaper = None
+                return
+
+
+def warm_up_pool(model_name: str = None):
+    """
+    Start the worker processes (and load their models) ahead of the first request.
+    """
+    model_name = model_name or engines.default_engine().key
+    with use_pool(model_name) as pool:
+        for future in [pool.submit(time.sleep, 0) for _ in range(settings.TRANSCRIPTION_WORKERS)]:
+            future.result()
+
+
+def _ffmpeg_headers(headers: dict) -> list:
+    if not headers:
+        return []
+    return ["-headers", "".join(f"{name}: {value}\r\n" for name, value in headers.items())]
+
+
+def iter_segments(source: str, workdir: str, chunk_seconds: int, headers: dict = None, max_seconds: float = None):
+    """
+    Decode `source` (a local file or a direct media URL) to 16 kHz mono WAV segments of
+    `chunk_seconds` each and yield their paths as soon as ffmpeg has finished writing them,
+    so transcription can start while the rest is still being downloaded.
+    With `max_seconds` ffmpeg stops reading the source after that much audio.
+    Closing the generator early kills ffmpeg and with it the download.
+    """
+    segment_list = os.path.join(workdir, "segments.csv")
+    command = [
+        "ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error",
+        *_ffmpeg_headers(headers),
+        *(["-t", f"{max_seconds:.3f}"] if max_seconds else []),
+        "-i", source,
+        "-vn", "-ac", "1", "-ar", "16000", "-c:a", "pcm_s16le",
+        "-f", "segment", "-segment_time", str(chunk_seconds), "-reset_timestamps", "1",
+        "-segment_list", segment_list, "-segment_list_type", "csv",
+        os.path.join(workdir, "segment_%05d.wav"),
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+    seen = 0
+    try:
+        while True:
+            finished = process.poll() is not None
+            names = _read_segment_list(segment_list)
+            for name in names[seen:]:
+                yield os.path.join(workdir, name)
+            seen = len(names)
+            if finished:
+                break
+            time.sleep(0.2)
+    finally:
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+    if process.returncode != 0:
+        error = process.stderr.read().decode(errors="replace").strip()
+        raise RuntimeError(f"ffmpeg failed: {error or process.returncode}")
+
+
+def _read_segment_list(path: str) -> list:
+    """
+    Return the segment file names ffmpeg has completed so far (first CSV column).
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return []
+    return [line.split(",", 1)[0] for line in lines if line.strip()]
+
+
+def transcribe_stream(source: str, headers: dict = None, model_name: str = None, language: str = None,
+                      on_segment=None, max_seconds: float = None, max_chars: int = None, on_vad=None) -> str:
+    """
+    Transcribe `source` segment by segment on the process pool while it is still being decoded.
+    Segments are transcribed in parallel and their texts joined in order.
+    `on_segment(index)` is called whenever a new segment was handed to the pool,
+    `on_vad(audio_seconds, speech_seconds)` for every transcribed segment the VAD trimmed.
+    Decoding stops after `max_seconds` of audio or as soon as the in-order text reaches `max_chars`.
+    With language "auto" the language is detected once on the first segment and used for all of them.
+    """
+    model_name = model_name or engines.default_engine().key
+    language = language or settings.WHISPER_LANGUAGE
+    with use_pool(model_name) as pool:
+        workspace = media_spool.spool.allocate("segments")
+        segments = iter_segments(source, workspace.path, settings.TRANSCRIPTION_CHUNK_SECONDS, headers, max_seconds)
+        futures = []
+        texts = []
+
+        def collect(block: bool) -> bool:
+            """
+            Move finished segment texts (in order) into `texts`; True once the char budget is reached.
+            """
+            while len(texts) < len(futures) and (block or futures[len(texts)].done()):
+                result = futures[len(texts)].result()
+                texts.append(result["text"])
+                if on_vad and result["audio_seconds"] is not None:
+                    on_vad(result["audio_seconds"], result["speech_seconds"])
+                if max_chars and sum(len(t) + 1 for t in texts if t) >= max_chars:
+                    return True
+            return False
+
+        try:
+            for path in segments:
+                if language == engines.AUTO_LANGUAGE:
+                    language = pool.submit(_detect_language, path).result()
+                futures.append(pool.submit(_transcribe_segment, path, language))
+                if on_segment:
+                    on_segment(len(futures) - 1)
+                if collect(block=False):
+                    break
+            else:
+                collect(block=True)
+
+            return " ".join(text for text in texts if text)
+
+        except BrokenProcessPool:
+            _discard_pool(model_name, pool)
+            raise
+        finally:
+            segments.close()
+            for future in futures:
+                future.cancel()
+            workspace.release()
+
+
+def media_source_from_info(info: dict):
+    """
+    Return (direct media URL, HTTP headers) of the format yt-dlp selected,
+    or (None, None) if the format has to be merged from several streams.
+    """
+    if not info or info.get("requested_formats") or not info.get("url"):
+        return None, None
+    return info["url"], info.get("http_headers") or {}
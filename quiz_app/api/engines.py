@@ -0,0 +1,174 @@
+import logging
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Whisper detects the language from the first 30 seconds of audio.
+AUTO_LANGUAGE = "auto"
+
+
+class EngineConfig:
+    """
+    Which transcription engine to run: backend, model size, precision and language.
+
+    The engine `key` ("small", "small-int8", "otherbackend:base") names the loaded model in
+    the registry, the transcription worker pools and the transcript cache; plain model names
+    are fp32 Whisper models, so cache entries stored before the engines existed still match.
+    """
+    def __init__(self, model: str, precision: str = "fp32", backend: str = "whisper", language: str = None,
+                 threads: int = 0):
+        if precision not in ("fp32", "int8"):
+            raise ValueError(f"Unknown precision {precision!r}, use 'fp32' or 'int8'")
+        self.backend = backend
+        self.model = model
+        self.precision = precision
+        self.language = language or settings.WHISPER_LANGUAGE
+        self.threads = threads
+
+    @property
+    def key(self) -> str:
+        key = self.model if self.precision == "fp32" else f"{self.model}-{self.precision}"
+        return key if self.backend == "whisper" else f"{self.backend}:{key}"
+
+    @property
+    def detect_language(self) -> bool:
+        return self.language == AUTO_LANGUAGE
+
+    @classmethod
+    def from_key(cls, key: str, **kwargs) -> "EngineConfig":
+        backend, _, model = key.rpartition(":")
+        # Model names may contain dashes themselves ("large-v3").
+        precision = "int8" if model.endswith("-int8") else "fp32"
+        model = model.removesuffix("-int8")
+        return cls(model, precision=precision, backend=backend or "whisper", **kwargs)
+
+    def __eq__(self, other):
+        return isinstance(other, EngineConfig) and (self.key, self.language) == (other.key, other.language)
+
+    def __hash__(self):
+        return hash((self.key, self.language))
+
+    def __repr__(self):
+        return f"<EngineConfig {self.key} language={self.language}>"
+
+
+class TranscriptionEngine:
+    """
+    Interface of a transcription backend.
+
+    `transcribe(audio, language, **options)` takes a file path or 16 kHz float32 samples and
+    returns a dict with at least "text" and "language"; `language=None` asks the engine to
+    detect it. Backends are registered in BACKENDS under the prefix of their engine keys.
+    """
+    def __init__(self, config: EngineConfig):
+        self.config = config
+
+    def transcribe(self, audio, language: str = None, **options) -> dict:
+        raise NotImplementedError
+
+    def detect_language(self, audio) -> str:
+        raise NotImplementedError
+
+
+class WhisperEngine(TranscriptionEngine):
+    """
+    openai-whisper on the CPU, optionally with int8 dynamic quantization of the linear layers.
+    """
+    def __init__(self, config: EngineConfig):
+        super().__init__(config)
+        import whisper
+
+        self.model = whisper.load_model(config.model, device="cpu")
+        if config.precision == "int8":
+            self.model = quantize_int8(self.model)
+
+    def transcribe(self, audio, language: str = None, **options) -> dict:
+        if self.config.threads:
+            import torch
+
+            torch.set_num_threads(self.config.threads)
+        return self.model.transcribe(audio, language=language, fp16=False, **options)
+
+    def detect_language(self, audio) -> str:
+        import whisper
+
+        if isinstance(audio, str):
+            audio = whisper.load_audio(audio)
+        mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), n_mels=self.model.dims.n_mels)
+        _, probabilities = self.model.detect_language(mel)
+        return max(probabilities, key=probabilities.get)
+
+
+def quantize_int8(model):
+    """
+    torch dynamic int8 quantization of all linear layers (weights int8, activations quantized on the fly).
+    Whisper uses its own nn.Linear subclass, which torch refuses to quantize, so those layers are
+    turned into plain nn.Linear layers with the same parameters first.
+    """
+    import torch
+
+    for parent in list(model.modules()):
+        for name, child in list(parent.named_children()):
+            if isinstance(child, torch.nn.Linear) and type(child) is not torch.nn.Linear:
+                linear = torch.nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+                linear.weight, linear.bias = child.weight, child.bias
+                setattr(parent, name, linear)
+
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+BACKENDS = {"whisper": WhisperEngine}
+
+
+def load_engine(key: str, threads: int = None) -> TranscriptionEngine:
+    """
+    Load the engine named by `key` (see EngineConfig.key).
+    `threads` defaults to WHISPER_THREADS.
+    """
+    config = EngineConfig.from_key(key, threads=settings.WHISPER_THREADS if threads is None else threads)
+    if config.backend not in BACKENDS:
+        raise ValueError(f"Unknown transcription backend {config.backend!r}")
+    return BACKENDS[config.backend](config)
+
+
+def default_engine(language: str = None) -> EngineConfig:
+    return EngineConfig(settings.WHISPER_DEFAULT_MODEL, precision=settings.WHISPER_PRECISION,
+                        backend=settings.TRANSCRIPTION_BACKEND, language=language)
+
+
+def estimate_seconds(config: EngineConfig, audio_seconds: float) -> float:
+    """
+    Rough wall-clock seconds `config` needs for `audio_seconds` of audio on this machine,
+    from the per-model speeds in WHISPER_MODEL_SPEED (audio seconds per second on one worker).
+    Models without a measured speed are assumed to be as slow as the slowest measured one.
+    """
+    speed = settings.WHISPER_MODEL_SPEED.get(config.model)
+    if speed is None:
+        speed = min(settings.WHISPER_MODEL_SPEED.values(), default=1.0)
+    if config.precision == "int8":
+        speed *= settings.WHISPER_INT8_SPEEDUP
+    return audio_seconds / (speed * max(1, settings.TRANSCRIPTION_WORKERS))
+
+
+def select_engine(audio_seconds: float = None, model: str = None, language: str = None,
+                  latency_budget: float = None) -> EngineConfig:
+    """
+    Pick the engine of a job: the requested `model`, else the most accurate model of
+    TRANSCRIPTION_MODELS that transcribes `audio_seconds` within `latency_budget` seconds
+    (the fastest one if none does), else WHISPER_DEFAULT_MODEL.
+    """
+    if model:
+        return EngineConfig(model, precision=settings.WHISPER_PRECISION, backend=settings.TRANSCRIPTION_BACKEND,
+                            language=language)
+    if not latency_budget or not audio_seconds:
+        return default_engine(language)
+
+    # TRANSCRIPTION_MODELS is ordered from the fastest to the most accurate model.
+    candidates = [EngineConfig(name, precision=settings.WHISPER_PRECISION, backend=settings.TRANSCRIPTION_BACKEND,
+                               language=language)
+                  for name in settings.TRANSCRIPTION_MODELS]
+    fitting = [config for config in candidates if estimate_seconds(config, audio_seconds) <= latency_budget]
+    chosen = fitting[-1] if fitting else candidates[0]
+    logger.info("Selected %s for %.0fs of audio within a %.0fs budget", chosen.key, audio_seconds, latency_budget)
+    return chosen
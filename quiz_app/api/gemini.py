@@ -0,0 +1,174 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import httpx
+from django.conf import settings
+from google import genai
+from google.genai import errors, types
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+logger = logging.getLogger(__name__)
+
+_client = None
+_client_lock = threading.Lock()
+_hedge_executor = None
+
+
+def get_client() -> genai.Client:
+    """
+    Return the process-wide Gemini client. Its HTTP transport keeps a pool of
+    connections alive, so calls after the first one skip TCP and TLS setup.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = genai.Client(
+                api_key=settings.API_KEY,
+                http_options=types.HttpOptions(
+                    base_url=settings.GEMINI_BASE_URL or None,
+                    timeout=int(settings.GEMINI_TIMEOUT_SECONDS * 1000),
+                    client_args={
+                        "limits": httpx.Limits(
+                            max_connections=settings.GEMINI_MAX_CONNECTIONS,
+                            max_keepalive_connections=settings.GEMINI_MAX_CONNECTIONS,
+                            keepalive_expiry=settings.GEMINI_KEEPALIVE_SECONDS,
+                        ),
+                    },
+                ),
+            )
+        return _client
+
+
+def reset_client():
+    """
+    Drop the shared client (and the latency history), e.g. after changing settings in tests.
+    """
+    global _client
+    with _client_lock:
+        _client = None
+    latency_tracker.clear()
+
+
+class LatencyTracker:
+    """
+    Sliding window of recent successful Gemini latencies, used to decide when to hedge.
+    """
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float, min_samples: int = 1):
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < max(min_samples, 1):
+            return None
+        index = min(len(samples) - 1, int(round(p / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+
+latency_tracker = LatencyTracker(settings.GEMINI_LATENCY_WINDOW)
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """
+    Retry rate limits, server errors and transport problems, but never bad requests.
+    """
+    if isinstance(exc, errors.APIError):
+        return exc.code == 429 or (exc.code or 0) >= 500
+    return isinstance(exc, (httpx.TransportError, httpx.TimeoutException))
+
+
+def _generate_once(prompt: str) -> str:
+    started = time.monotonic()
+    response = get_client().models.generate_content(model=settings.GEMINI_MODEL, contents=prompt)
+    latency_tracker.record(time.monotonic() - started)
+    return response.text
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    global _hedge_executor
+    with _client_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(
+                max_workers=settings.GEMINI_MAX_CONNECTIONS, thread_name_prefix="gemini-hedge"
+            )
+        return _hedge_executor
+
+
+def _generate_hedged(prompt: str) -> str:
+    """
+    Send the request; if it is slower than the configured latency percentile,
+    send a duplicate and return whichever answer arrives first.
+    """
+    threshold = None
+    if settings.GEMINI_HEDGE_PERCENTILE:
+        threshold = latency_tracker.percentile(settings.GEMINI_HEDGE_PERCENTILE, settings.GEMINI_HEDGE_MIN_SAMPLES)
+    if threshold is None:
+        return _generate_once(prompt)
+
+    executor = _get_hedge_executor()
+    pending = {executor.submit(_generate_once, prompt)}
+    done, pending = wait(pending, timeout=threshold)
+    if not done:
+        logger.info("Gemini request slower than %.2fs, sending hedged duplicate", threshold)
+        pending.add(executor.submit(_generate_once, prompt))
+
+    error = None
+    while done or pending:
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            error = future.exception()
+        if not pending:
+            break
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+    raise error
+
+
+def _retrying() -> Retrying:
+    return Retrying(
+        stop=stop_after_attempt(settings.GEMINI_MAX_ATTEMPTS),
+        wait=wait_exponential_jitter(
+            initial=settings.GEMINI_RETRY_INITIAL_DELAY, max=settings.GEMINI_RETRY_MAX_DELAY
+        ),
+        retry=retry_if_exception(_is_retryable),
+        reraise=True,
+    )
+
+
+def generate_text(prompt: str) -> str:
+    """
+    Generate a completion for `prompt` with bounded, jittered retries and optional hedging.
+    """
+    return _retrying()(_generate_hedged, prompt)
+
+
+def generate_text_stream(prompt: str):
+    """
+    Yield the completion for `prompt` piece by piece as Gemini produces it.
+    Opening the stream is retried like generate_text(); once text has been
+    handed out, errors are raised to the caller instead of starting over.
+    Streams are not recorded in latency_tracker: they take as long as the client
+    reads, which would skew the percentile the hedged requests use.
+    """
+    def open_stream():
+        stream = get_client().models.generate_content_stream(model=settings.GEMINI_MODEL, contents=prompt)
+        return next(stream, None), stream
+
+    first, stream = _retrying()(open_stream)
+    if first is not None and first.text:
+        yield first.text
+    for chunk in stream:
+        if chunk.text:
+            yield chunk.text
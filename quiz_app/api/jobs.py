@@ -0,0 +1,282 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import OperationalError, close_old_connections, transaction
+from django.utils import timezone
+from tenacity import Retrying, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+
+from quiz_app.api import metrics, utils
+from quiz_app.api.progress import broker
+from quiz_app.models import QuizGenerationBatch, QuizGenerationJob
+
+logger = logging.getLogger(__name__)
+
+STAGE_WORKERS = {
+    "download": "QUIZ_DOWNLOAD_WORKERS",
+    "transcribe": "QUIZ_TRANSCRIBE_WORKERS",
+    "generate": "QUIZ_GENERATE_WORKERS",
+}
+
+_executors = {}
+_executor_lock = threading.Lock()
+
+
+def get_executor(stage: str = "download") -> ThreadPoolExecutor:
+    """
+    Return the process-wide worker pool of a pipeline stage ("download", "transcribe" or "generate").
+    Each stage has its own bound, so slow downloads never occupy transcription slots and vice versa.
+    """
+    with _executor_lock:
+        if stage not in _executors:
+            _executors[stage] = ThreadPoolExecutor(
+                max_workers=getattr(settings, STAGE_WORKERS[stage]),
+                thread_name_prefix=f"quiz-{stage}",
+            )
+        return _executors[stage]
+
+
+def enqueue_job(job: QuizGenerationJob):
+    """
+    Hand a job to the worker pools once the surrounding transaction has committed.
+    With QUIZ_JOBS_EAGER the job runs inline instead (used by the tests).
+    """
+    if settings.QUIZ_JOBS_EAGER:
+        run_job(job.id)
+        return
+
+    transaction.on_commit(lambda: _submit("download", _download_stage, job.id))
+
+
+def enqueue_batch(batch: QuizGenerationBatch):
+    """
+    Expand the batch's URLs and queue one job per video, after the surrounding transaction has committed.
+    """
+    if settings.QUIZ_JOBS_EAGER:
+        run_batch(batch.id)
+        return
+
+    transaction.on_commit(lambda: _submit_to("download", run_batch, batch.id))
+
+
+def _submit(stage: str, step, job_id: int, *args):
+    _submit_to(stage, _run_step, step, job_id, *args)
+
+
+def _submit_to(stage: str, func, *args):
+    metrics.JOB_QUEUE_DEPTH.inc(stage=stage)
+    get_executor(stage).submit(_run_queued, stage, func, *args)
+
+
+def _run_queued(stage: str, func, *args):
+    metrics.JOB_QUEUE_DEPTH.dec(stage=stage)
+    with metrics.JOBS_RUNNING.track(stage=stage):
+        _run_in_worker(func, *args)
+
+
+def _run_in_worker(func, *args):
+    """
+    Worker thread entrypoint: make sure the thread never reuses a stale DB connection.
+    """
+    close_old_connections()
+    try:
+        func(*args)
+    finally:
+        close_old_connections()
+
+
+def _retry_locked(func, *args, **kwargs):
+    """
+    Call `func`, retrying with a short backoff while the database is locked by another writer,
+    so a job whose work succeeded is not failed over its bookkeeping.
+    """
+    retrying = Retrying(
+        stop=stop_after_attempt(settings.QUIZ_JOB_DB_ATTEMPTS),
+        wait=wait_exponential_jitter(initial=0.05, max=1),
+        retry=retry_if_exception_type(OperationalError),
+        reraise=True,
+    )
+    return retrying(func, *args, **kwargs)
+
+
+def _save(job: QuizGenerationJob, *fields):
+    _retry_locked(job.save, update_fields=[*fields, "updated_at"])
+
+
+def _set_status(job: QuizGenerationJob, status: str, **fields):
+    job.status = status
+    for name, value in fields.items():
+        setattr(job, name, value)
+    _save(job, "status", *fields)
+
+    if job.is_finished:
+        metrics.JOBS_FINISHED.inc(status=status)
+
+    if status == QuizGenerationJob.Status.DONE:
+        broker.publish(job.id, "done", status=status, quiz=job.quiz_id)
+    elif status == QuizGenerationJob.Status.FAILED:
+        broker.publish(job.id, "failed", status=status, error=job.error)
+    else:
+        broker.publish(job.id, "stage", status=status)
+
+    if job.batch_id and job.is_finished:
+        _job_in_batch_finished(job)
+
+
+def _fail(job: QuizGenerationJob, error: str):
+    _set_status(job, QuizGenerationJob.Status.FAILED,
+                error=error or "Quiz-Generierung fehlgeschlagen", finished_at=timezone.now())
+
+
+def _callbacks(job: QuizGenerationJob) -> dict:
+    def on_progress(event, **data):
+        if event == "media":
+            job.media_bytes, job.media_bytes_saved = data["bytes"], data["bytes_saved"]
+            _save(job, "media_bytes", "media_bytes_saved")
+        elif event == "engine":
+            job.engine = data["engine"]
+            _save(job, "engine")
+        elif event == "vad":
+            job.silence_seconds_removed = data["removed_seconds"]
+            _save(job, "silence_seconds_removed")
+        broker.publish(job.id, event, **data)
+
+    return {"on_stage": lambda stage: _set_status(job, stage), "on_progress": on_progress}
+
+
+def _engine_options(job: QuizGenerationJob) -> dict:
+    """
+    Transcription options the job was created with (see engines.select_engine); unset ones are left out.
+    """
+    options = {"model": job.requested_model, "language": job.requested_language, "latency_budget": job.latency_budget}
+    return {name: value for name, value in options.items() if value}
+
+
+def run_job(job_id: int):
+    """
+    Run the download → transcribe → generate pipeline for one job and store the resulting Quiz.
+    """
+    job = QuizGenerationJob.objects.select_related("owner").get(pk=job_id)
+
+    try:
+        result = utils.generate_quiz_data_from_video(job.url, **_engine_options(job), **_callbacks(job))
+        if not result.get("success"):
+            _fail(job, result.get("error"))
+            return
+
+        quiz = utils.save_quiz_data(result.get("data") or {}, job.url, job.owner)
+        _set_status(job, QuizGenerationJob.Status.DONE, quiz=quiz, finished_at=timezone.now())
+
+    except Exception as e:
+        logger.exception("Quiz generation job %s crashed", job_id)
+        _fail(job, str(e))
+
+
+def _run_step(step, job_id: int, *args):
+    """
+    Run one pipeline stage of a job; any crash marks the job as failed.
+    """
+    job = QuizGenerationJob.objects.select_related("owner").get(pk=job_id)
+    try:
+        step(job, *args)
+    except Exception as e:
+        logger.exception("Quiz generation job %s crashed", job_id)
+        _fail(job, str(e))
+
+
+def _download_stage(job: QuizGenerationJob):
+    media = utils.prepare_media(job.url, **_engine_options(job), **_callbacks(job))
+    if not media.get("success"):
+        _fail(job, media.get("error"))
+        return
+    _submit("transcribe", _transcribe_stage, job.id, media)
+
+
+def _transcribe_stage(job: QuizGenerationJob, media: dict):
+    result = utils.transcribe_media(media, **_callbacks(job))
+    if not result.get("success"):
+        _fail(job, result.get("error"))
+        return
+    _submit("generate", _generate_stage, job.id, result["text"])
+
+
+def _generate_stage(job: QuizGenerationJob, transcript: str):
+    result = utils.generate_quiz_data_from_transcript(transcript, **_callbacks(job))
+    if not result.get("success"):
+        _fail(job, result.get("error"))
+        return
+
+    quiz = utils.save_quiz_data(result.get("data") or {}, job.url, job.owner)
+    _set_status(job, QuizGenerationJob.Status.DONE, quiz=quiz, finished_at=timezone.now())
+
+
+def batch_channel(batch_id: int) -> tuple:
+    """
+    Progress broker key of a batch (job ids are plain ints, so batches use a tuple).
+    """
+    return ("batch", batch_id)
+
+
+def run_batch(batch_id: int):
+    """
+    Expand a batch into videos, create one job per video and hand them all to the download pool.
+    """
+    batch = QuizGenerationBatch.objects.select_related("owner").get(pk=batch_id)
+
+    try:
+        result = utils.expand_video_urls(batch.urls, limit=settings.QUIZ_BATCH_MAX_ITEMS)
+        if not result.get("success"):
+            _finish_batch(batch, QuizGenerationBatch.Status.FAILED, error=result.get("error") or "")
+            return
+
+        jobs = QuizGenerationJob.objects.bulk_create([
+            QuizGenerationJob(owner=batch.owner, url=url, batch=batch) for url in result["urls"]
+        ])
+        batch.status = QuizGenerationBatch.Status.RUNNING
+        batch.error = "\n".join(f"{url}: {error}" for url, error in result["errors"].items())
+        batch.save(update_fields=["status", "error", "updated_at"])
+        broker.publish(batch_channel(batch.id), "expanded", jobs=[job.id for job in jobs])
+
+    except Exception as e:
+        logger.exception("Quiz generation batch %s crashed", batch_id)
+        _finish_batch(batch, QuizGenerationBatch.Status.FAILED, error=str(e))
+        return
+
+    for job in jobs:
+        enqueue_job(job)
+
+
+def _job_in_batch_finished(job: QuizGenerationJob):
+    """
+    Report a finished job on its batch channel and close the batch once no job is left.
+    """
+    broker.publish(batch_channel(job.batch_id), "item", job=job.id, status=job.status,
+                   quiz=job.quiz_id, error=job.error)
+
+    _retry_locked(_close_batch_if_complete, job.batch_id)
+
+
+def _close_batch_if_complete(batch_id: int):
+    if QuizGenerationJob.objects.filter(batch_id=batch_id, finished_at__isnull=True).exists():
+        return
+    batch = QuizGenerationBatch.objects.filter(pk=batch_id).first()
+    if batch is not None and not batch.is_finished:
+        _finish_batch(batch, QuizGenerationBatch.Status.DONE)
+
+
+def _finish_batch(batch: QuizGenerationBatch, status: str, error: str = None):
+    """
+    Close `batch` and publish its terminal event. The last jobs of a batch may finish on several
+    threads at once; only the one whose update closes the batch publishes.
+    """
+    now = timezone.now()
+    fields = {"status": status, "finished_at": now, "updated_at": now}
+    if error is not None:
+        fields["error"] = error
+    if not _retry_locked(QuizGenerationBatch.objects.filter(pk=batch.pk, finished_at__isnull=True).update, **fields):
+        return
+    for name, value in fields.items():
+        setattr(batch, name, value)
+    broker.publish(batch_channel(batch.id), "done" if status == QuizGenerationBatch.Status.DONE else "failed",
+                   status=status, error=batch.error)
@@ -0,0 +1,205 @@
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MediaSpoolFull(Exception):
+    """
+    Raised when a workspace cannot be allocated without exceeding the spool quota.
+    """
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _entry_size(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for directory, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(directory, name))
+            except OSError:
+                # Deleted while we were walking (e.g. a finished segment).
+                pass
+    return total
+
+
+def _entry_pid(name: str):
+    """
+    Owner process of a spool entry: workspaces are named "<pid>-<prefix>-<token>".
+    Entries that do not follow the scheme (e.g. files of older releases) have no owner.
+    """
+    head = name.split("-", 1)[0]
+    return int(head) if head.isdigit() else None
+
+
+class MediaLease:
+    """
+    A workspace directory in the spool. Deleted with all its files by release(),
+    which also runs when the lease is used as a context manager.
+    """
+    def __init__(self, spool: "MediaSpool", path: str):
+        self.spool = spool
+        self.path = path
+
+    def file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def release(self):
+        self.spool.release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def __repr__(self):
+        return f"<MediaLease {self.path}>"
+
+
+class MediaSpool:
+    """
+    Disk space for downloaded audio and transcription segments.
+
+    Every download gets its own workspace under MEDIA_SPOOL_DIR, leased until the
+    audio has been transcribed. Before a workspace is handed out, the total size of
+    the spool is held below MEDIA_SPOOL_MAX_BYTES by deleting the least recently used
+    entries that are not leased (leftovers of crashed workers). Workspaces carry the pid
+    of their process, so several worker processes can share one spool directory.
+    """
+    def __init__(self, root: str = None, max_bytes: int = None):
+        self._root = root
+        self._max_bytes = max_bytes
+        self._active = set()
+        self._lock = threading.Lock()
+
+    @property
+    def root(self) -> str:
+        return os.path.abspath(self._root or settings.MEDIA_SPOOL_DIR)
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes if self._max_bytes is not None else settings.MEDIA_SPOOL_MAX_BYTES
+
+    def allocate(self, prefix: str = "media", needed_bytes: int = 0) -> MediaLease:
+        """
+        Create a workspace for a file of about `needed_bytes`, evicting old entries to make room.
+        Raises MediaSpoolFull if the leased workspaces alone leave no room for it.
+        """
+        with self._lock:
+            self.make_room(needed_bytes)
+            path = os.path.join(self.root, f"{os.getpid()}-{prefix}-{uuid.uuid4().hex[:12]}")
+            os.makedirs(path)
+            self._active.add(path)
+        return MediaLease(self, path)
+
+    def release(self, lease: MediaLease):
+        with self._lock:
+            self._active.discard(lease.path)
+        shutil.rmtree(lease.path, ignore_errors=True)
+
+    def is_leased(self, path: str) -> bool:
+        """
+        True if the entry at `path` belongs to a running job, in this or another live process.
+        """
+        path = os.path.abspath(path)
+        pid = _entry_pid(os.path.basename(path))
+        if pid == os.getpid():
+            return path in self._active
+        return pid is not None and _pid_alive(pid)
+
+    def entries(self) -> list:
+        """
+        (path, size in bytes, last modification time) of every spool entry, least recently used first.
+        """
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+
+        entries = []
+        for name in names:
+            path = os.path.join(self.root, name)
+            try:
+                entries.append((path, _entry_size(path), os.path.getmtime(path)))
+            except OSError:
+                continue
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def usage(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def make_room(self, needed_bytes: int = 0) -> list:
+        """
+        Delete unleased entries, least recently used first, until `needed_bytes` more fit into the quota.
+        Returns the deleted paths.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        evicted = []
+        for path, size, _ in entries:
+            if total + needed_bytes <= self.max_bytes:
+                break
+            if self.is_leased(path):
+                continue
+            _remove(path)
+            total -= size
+            evicted.append(path)
+            logger.info("Evicted %s (%d bytes) from the media spool", path, size)
+
+        if total + needed_bytes > self.max_bytes:
+            raise MediaSpoolFull(
+                f"Media spool {self.root} is full: {total} of {self.max_bytes} bytes in use, {needed_bytes} needed"
+            )
+        return evicted
+
+    def sweep(self, max_age: float = None, now: float = None, dry_run: bool = False) -> list:
+        """
+        Delete orphaned entries: workspaces of processes that no longer run, files of older
+        releases, and workspaces of other processes that have not been touched for `max_age`
+        seconds (default MEDIA_SPOOL_MAX_AGE_SECONDS). Returns (path, size) of every removed entry.
+        """
+        max_age = settings.MEDIA_SPOOL_MAX_AGE_SECONDS if max_age is None else max_age
+        now = time.time() if now is None else now
+        swept = []
+        for path, size, mtime in self.entries():
+            if path in self._active:
+                continue
+            # The age limit also catches workspaces whose pid has been reused by an unrelated process.
+            if self.is_leased(path) and not (max_age and now - mtime > max_age):
+                continue
+            if not dry_run:
+                _remove(path)
+            swept.append((path, size))
+        return swept
+
+
+def _remove(path: str):
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+spool = MediaSpool()
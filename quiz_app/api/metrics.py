@@ -0,0 +1,51 @@
+import time
+from contextlib import contextmanager
+
+from core.metrics import Counter, Gauge, Histogram
+
+PIPELINE_STAGE_SECONDS = Histogram(
+    "quiz_pipeline_stage_seconds",
+    "Duration of the generation pipeline stages: extract (yt-dlp metadata), download, transcription "
+    "(including the streamed download of chunked transcriptions) and generation (Gemini), "
+    "by outcome (success or error).",
+    ["stage", "outcome"],
+)
+CACHE_REQUESTS = Counter(
+    "quiz_cache_requests_total", "Lookups in the quiz detail and transcript caches.", ["cache", "result"],
+)
+JOB_QUEUE_DEPTH = Gauge(
+    "quiz_job_queue_depth", "Job steps waiting for a worker of their stage.", ["stage"],
+)
+JOBS_RUNNING = Gauge(
+    "quiz_jobs_running", "Job steps a worker of their stage is running.", ["stage"],
+)
+JOBS_FINISHED = Counter(
+    "quiz_jobs_finished_total", "Quiz generation jobs that are done or failed.", ["status"],
+)
+
+
+class StageOutcome:
+
+    def __init__(self):
+        self.failed = False
+
+    def fail(self):
+        self.failed = True
+
+
+@contextmanager
+def time_stage(stage: str):
+    """
+    Record the duration of the block in PIPELINE_STAGE_SECONDS. The outcome is "error" if the block
+    raises or calls fail() on the yielded StageOutcome (for stages that report errors as results).
+    """
+    outcome = StageOutcome()
+    started = time.perf_counter()
+    try:
+        yield outcome
+    except BaseException:
+        outcome.fail()
+        raise
+    finally:
+        PIPELINE_STAGE_SECONDS.observe(time.perf_counter() - started, stage=stage,
+                                       outcome="error" if outcome.failed else "success")
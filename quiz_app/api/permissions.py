@@ -5,7 +5,8 @@ from rest_framework.permissions import BasePermission, SAFE_METHODS
 class IsOwner(BasePermission):
     """
     Custom permission to only allow the owner of an object to access it.
-    Assumes the model instance has an `owner` attribute.
+    Assumes the model instance has an `owner` foreign key; only the key is compared,
+    so the owner row is not loaded.
     """
     def has_object_permission(self, request, view, obj):
-        return obj.owner == request.user
\ No newline at end of file
+        return obj.owner_id == request.user.pk
\ No newline at end of file
@@ -0,0 +1,94 @@
+import asyncio
+import itertools
+import json
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+from django.conf import settings
+
+TERMINAL_EVENTS = {"done", "failed"}
+
+
+class ProgressBroker:
+    """
+    In-process fan-out of job progress events to asyncio listeners.
+
+    `publish()` may be called from any thread and never blocks on listeners;
+    every listener owns an asyncio.Queue on its event loop. The last `history`
+    events of the most recent `max_jobs` jobs are kept, so a client that
+    connects (or reconnects with Last-Event-ID) after an event still gets it.
+    """
+    def __init__(self, history: int = 50, max_jobs: int = 1000):
+        self._lock = threading.Lock()
+        self._history_size = history
+        self._max_jobs = max_jobs
+        self._history = OrderedDict()
+        self._listeners = {}
+        self._ids = itertools.count(1)
+
+    def publish(self, job_id: int, event: str, **data) -> dict:
+        with self._lock:
+            message = {"id": next(self._ids), "event": event, "data": data}
+            history = self._history.get(job_id)
+            if history is None:
+                history = self._history[job_id] = deque(maxlen=self._history_size)
+                while len(self._history) > self._max_jobs:
+                    self._history.popitem(last=False)
+            history.append(message)
+            listeners = list(self._listeners.get(job_id, ()))
+
+        for loop, queue in listeners:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, message)
+            except RuntimeError:
+                # The listener's event loop is already closed; it is unsubscribing.
+                pass
+        return message
+
+    @contextmanager
+    def subscribe(self, job_id: int, after: int = 0):
+        """
+        Yield an asyncio.Queue that receives all events of `job_id` with an id above `after`,
+        starting with the ones that are still in the history.
+        """
+        entry = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            backlog = [m for m in self._history.get(job_id, ()) if m["id"] > after]
+            self._listeners.setdefault(job_id, set()).add(entry)
+        for message in backlog:
+            entry[1].put_nowait(message)
+
+        try:
+            yield entry[1]
+        finally:
+            with self._lock:
+                listeners = self._listeners.get(job_id)
+                if listeners is not None:
+                    listeners.discard(entry)
+                    if not listeners:
+                        del self._listeners[job_id]
+
+    def listener_count(self, job_id: int = None) -> int:
+        with self._lock:
+            if job_id is not None:
+                return len(self._listeners.get(job_id, ()))
+            return sum(len(listeners) for listeners in self._listeners.values())
+
+    def clear(self):
+        with self._lock:
+            self._history.clear()
+
+
+broker = ProgressBroker(settings.PROGRESS_HISTORY_SIZE, settings.PROGRESS_MAX_JOBS)
+
+
+def format_sse(message: dict) -> str:
+    """
+    Encode a broker message as one Server-Sent Events frame.
+    Messages without an id (e.g. snapshots) do not move the client's Last-Event-ID.
+    """
+    frame = f"event: {message['event']}\ndata: {json.dumps(message['data'])}\n\n"
+    if message.get("id") is not None:
+        frame = f"id: {message['id']}\n" + frame
+    return frame
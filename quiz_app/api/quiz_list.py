@@ -0,0 +1,59 @@
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from rest_framework import serializers
+
+from quiz_app.api.serializers import QuizSerializer, QuizSummarySerializer
+from quiz_app.models import Question
+
+VIEWS = {"full": QuizSerializer, "summary": QuizSummarySerializer}
+# Always loaded: the cursor pagination reads the ordering fields of every quiz.
+REQUIRED_COLUMNS = ("id", "created_at")
+
+
+class QuizListFieldset:
+    """
+    What the quiz list returns, from its query parameters:
+    `?view=summary` for the dashboard (no questions, `questions_count` instead) and
+    `?fields=a,b,...` to keep only some fields of the view. Without them, the full quizzes as before.
+
+    The queryset only loads what the selected fields need.
+    """
+    def __init__(self, query_params):
+        view = query_params.get("view") or "full"
+        if view not in VIEWS:
+            raise serializers.ValidationError(
+                {"view": [f"Unbekannte Ansicht. Erlaubt sind: {', '.join(VIEWS)}."]})
+        self.serializer_class = VIEWS[view]
+
+        readable = [name for name, field in self.serializer_class().fields.items() if not field.write_only]
+        self.fields = readable
+        if "fields" in query_params:
+            names = (name.strip() for name in query_params["fields"].split(","))
+            self.fields = list(dict.fromkeys(name for name in names if name))
+            unknown = [name for name in self.fields if name not in readable]
+            if unknown or not self.fields:
+                raise serializers.ValidationError({"fields": [
+                    f"Unbekannte Felder: {', '.join(unknown)}. Erlaubt sind: {', '.join(readable)}." if unknown
+                    else f"Keine Felder angegeben. Erlaubt sind: {', '.join(readable)}."
+                ]})
+
+    def queryset(self, queryset):
+        """
+        `queryset` restricted to the columns, annotations and prefetches of the selected fields.
+        """
+        serializer_fields = self.serializer_class(fields=self.fields).fields
+        columns = {serializer_fields[name].source for name in self.fields
+                   if name not in ("questions", "questions_count")}
+        queryset = queryset.only(*REQUIRED_COLUMNS, *sorted(columns))
+        if "questions" in self.fields:
+            questions = Question.objects.order_by("quiz_id", "id")
+            queryset = queryset.prefetch_related(Prefetch("questions", queryset=questions))
+        if "questions_count" in self.fields:
+            # A correlated count answered from the (quiz, id) index; no Question rows are loaded.
+            counts = (Question.objects.filter(quiz=OuterRef("pk")).order_by()
+                      .values("quiz").annotate(count=Count("id")).values("count"))
+            queryset = queryset.annotate(questions_count=Coalesce(Subquery(counts), 0))
+        return queryset
+
+    def serializer(self, instance, **kwargs):
+        return self.serializer_class(instance, many=True, fields=self.fields, **kwargs)
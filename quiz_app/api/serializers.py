@@ -1,7 +1,9 @@
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
 from rest_framework import serializers
 
-from quiz_app.models import Quiz, Question
-from django.db import transaction
+from quiz_app.models import Quiz, Question, QuizGenerationBatch, QuizGenerationJob
 
 
 class QuestionSerializer(serializers.ModelSerializer):
@@ -13,62 +15,70 @@ class QuestionSerializer(serializers.ModelSerializer):
         fields = ["id", "question_title", "question_options", "answer"]
 
 
-class QuizSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """
+    Serializer mixin that keeps only the fields named in the `fields` keyword argument.
+    """
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class QuizSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Basic Serializer for Quiz including questions and URL handling.
+    Creating a quiz only validates the URL and the optional transcription options
+    (`model`, `language`, `latency_budget`); the quiz itself is produced by a QuizGenerationJob.
     """
     questions = QuestionSerializer(many=True, read_only=True)
     video_url = serializers.URLField(source="url", read_only=True)
     url = serializers.URLField(write_only=True, required=True)
+    model = serializers.CharField(write_only=True, required=False)
+    language = serializers.RegexField(r"^(auto|[a-z]{2,3})$", write_only=True, required=False)
+    latency_budget = serializers.FloatField(write_only=True, required=False, min_value=1)
 
     class Meta:
         model = Quiz
         fields = ["id", "title", "description", "created_at",
-                  "updated_at", "video_url", "url", "questions"]
+                  "updated_at", "video_url", "url", "model", "language", "latency_budget", "questions"]
 
-    def create(self, validated_data):
-        """
-        Create a Quiz along with its Questions by generating data from the provided video URL."""
-        from quiz_app.api.utils import generate_quiz_data_from_video
+    def validate_model(self, value):
+        if value not in settings.TRANSCRIPTION_MODELS:
+            raise serializers.ValidationError(
+                f"Unbekanntes Modell. Erlaubt sind: {', '.join(settings.TRANSCRIPTION_MODELS)}."
+            )
+        return value
 
-        request = self.context.get('request')
-        if not request or not request.user.is_authenticated:
-            raise serializers.ValidationError("Authentifizierung erforderlich")
+    def engine_options(self) -> dict:
+        """
+        The transcription options that were sent, as keyword arguments for engines.select_engine.
+        """
+        return {name: self.validated_data[name] for name in ("model", "language", "latency_budget")
+                if name in self.validated_data}
 
-        video_url = validated_data.pop("url", None)
-        if not video_url:
-            raise serializers.ValidationError("URL ist erforderlich")
+    def job_fields(self) -> dict:
+        options = self.engine_options()
+        return {
+            "requested_model": options.get("model", ""),
+            "requested_language": options.get("language", ""),
+            "latency_budget": options.get("latency_budget"),
+        }
 
-        result = generate_quiz_data_from_video(video_url)
-        if not result.get("success"):
-            raise serializers.ValidationError({"error": "Quiz-Generierung fehlgeschlagen", "details": result.get("error")})
 
-        quiz_data = result.get("data") or {}
+class QuizSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """
+    Serializer for the dashboard view of the quiz list: no questions, only their number.
+    `questions_count` must be annotated on the queryset.
+    """
+    video_url = serializers.URLField(source="url", read_only=True)
+    questions_count = serializers.IntegerField(read_only=True)
 
-        with transaction.atomic():
-            """
-            If all is well, create Quiz + Questions atomically.
-            """
-            quiz = Quiz.objects.create(
-                title=quiz_data.get("title", "Wird generiert..."),
-                description=quiz_data.get("description", ""),
-                url=video_url,
-                owner=request.user,
-            )
+    class Meta:
+        model = Quiz
+        fields = ["id", "title", "created_at", "updated_at", "video_url", "questions_count"]
 
-            for q in quiz_data.get("questions", []):
-                """
-                Create Question instances linked to the Quiz.
-                """
-                Question.objects.create(
-                    quiz=quiz,
-                    question_title=q.get("question_title", ""),
-                    question_options=q.get("question_options", []),
-                    answer=q.get("answer", ""),
-                )
-
-        return quiz
-    
 
 class QuizDetailSerializer(serializers.ModelSerializer):
     """
@@ -104,3 +114,138 @@ class QuizDetailSerializer(serializers.ModelSerializer):
         instance.description = validated_data.get("description", instance.description)
         instance.save()
         return instance
+
+
+class QuizGenerationJobSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the status of a quiz generation job.
+    """
+    status_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = QuizGenerationJob
+        fields = ["id", "status", "url", "quiz", "error", "media_bytes", "media_bytes_saved",
+                  "silence_seconds_removed", "requested_model", "requested_language", "latency_budget", "engine",
+                  "created_at", "updated_at", "finished_at", "status_url"]
+        read_only_fields = fields
+
+    def get_status_url(self, obj):
+        request = self.context.get("request")
+        path = reverse("quiz-job-detail", args=[obj.id])
+        return request.build_absolute_uri(path) if request else path
+
+
+class QuizBatchCreateSerializer(serializers.Serializer):
+    """
+    Serializer for starting a batch: one playlist URL (`url`) or a list of video or playlist URLs (`urls`).
+    """
+    url = serializers.URLField(required=False)
+    urls = serializers.ListField(child=serializers.URLField(), required=False, allow_empty=False)
+
+    def validate(self, attrs):
+        urls = list(attrs.get("urls") or [])
+        if attrs.get("url"):
+            urls.insert(0, attrs["url"])
+        if not urls:
+            raise serializers.ValidationError({"urls": "Bitte eine Playlist-URL oder eine Liste von URLs angeben."})
+        if len(urls) > settings.QUIZ_BATCH_MAX_URLS:
+            raise serializers.ValidationError({"urls": f"Maximal {settings.QUIZ_BATCH_MAX_URLS} URLs pro Batch erlaubt."})
+        return {"urls": list(dict.fromkeys(urls))}
+
+
+class QuizGenerationBatchSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the status of a batch and the results of its jobs.
+    """
+    jobs = serializers.SerializerMethodField()
+    counts = serializers.SerializerMethodField()
+    status_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = QuizGenerationBatch
+        fields = ["id", "status", "urls", "error", "created_at", "updated_at", "finished_at",
+                  "counts", "jobs", "status_url"]
+        read_only_fields = fields
+
+    def _jobs(self, obj):
+        return sorted(obj.jobs.all(), key=lambda job: job.id)
+
+    def get_jobs(self, obj):
+        return QuizGenerationJobSerializer(self._jobs(obj), many=True, context=self.context).data
+
+    def get_counts(self, obj):
+        counts = {"total": 0, "done": 0, "failed": 0, "pending": 0}
+        for job in self._jobs(obj):
+            counts["total"] += 1
+            counts[job.status if job.is_finished else "pending"] += 1
+        return counts
+
+    def get_status_url(self, obj):
+        request = self.context.get("request")
+        path = reverse("quiz-batch-detail", args=[obj.id])
+        return request.build_absolute_uri(path) if request else path
+
+
+class QuizImportQuestionSerializer(serializers.Serializer):
+    """
+    Serializer for one question of an imported quiz.
+    """
+    question_title = serializers.CharField(max_length=200)
+    question_options = serializers.ListField(child=serializers.CharField(), min_length=2)
+    answer = serializers.CharField(max_length=200)
+
+    def validate(self, attrs):
+        if attrs["answer"] not in attrs["question_options"]:
+            raise serializers.ValidationError({"answer": "Die Antwort muss eine der Optionen sein."})
+        return attrs
+
+
+class QuizImportSerializer(serializers.Serializer):
+    """
+    Serializer for one pre-built quiz in a bulk import.
+    """
+    title = serializers.CharField(max_length=200, allow_blank=True)
+    description = serializers.CharField(allow_blank=True, required=False, default="")
+    url = serializers.URLField(required=False, default="")
+    questions = QuizImportQuestionSerializer(many=True)
+
+
+class QuizBulkImportSerializer(serializers.Serializer):
+    """
+    Serializer for importing many pre-built quizzes of the requesting user in one transaction.
+    """
+    quizzes = QuizImportSerializer(many=True, allow_empty=False)
+
+    def validate_quizzes(self, value):
+        if len(value) > settings.QUIZ_IMPORT_MAX_QUIZZES:
+            raise serializers.ValidationError(
+                f"Maximal {settings.QUIZ_IMPORT_MAX_QUIZZES} Quizze pro Import erlaubt."
+            )
+        return value
+
+    def create(self, validated_data):
+        """
+        Insert all quizzes and then all questions with batched bulk_create calls.
+        """
+        owner = self.context["request"].user
+        items = validated_data["quizzes"]
+        batch_size = settings.QUESTION_BULK_BATCH_SIZE
+
+        with transaction.atomic():
+            quizzes = Quiz.objects.bulk_create(
+                [
+                    Quiz(title=item["title"], description=item["description"], url=item["url"], owner=owner)
+                    for item in items
+                ],
+                batch_size=batch_size,
+            )
+            Question.objects.bulk_create(
+                [
+                    Question(quiz=quiz, **question)
+                    for quiz, item in zip(quizzes, items)
+                    for question in item["questions"]
+                ],
+                batch_size=batch_size,
+            )
+
+        return quizzes
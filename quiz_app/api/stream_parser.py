@@ -0,0 +1,115 @@
+import json
+
+
+class QuizStreamParser:
+    """
+    Incremental parser for the quiz JSON that Gemini streams back.
+
+    Text can be fed in arbitrary pieces. `feed()` returns the events that became
+    complete with that piece:
+
+      ("field", name, value)   a top-level string such as "title" or "description"
+      ("question", dict)       one complete object of the "questions" array
+
+    Anything before the first "{" (e.g. a Markdown code fence) is ignored.
+    """
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self._finished = False
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        # One entry per open container: [type, current key, last string, in_questions]
+        self._stack = []
+        self._object_start = None
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def feed(self, text: str) -> list:
+        self._buffer += text
+        events = []
+
+        while self._pos < len(self._buffer) and not self._finished:
+            char = self._buffer[self._pos]
+
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._stack.append(["object", None, None, False])
+                self._pos += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._string_done(self._buffer[self._string_start:self._pos + 1])
+                self._pos += 1
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = self._pos
+            elif char == ":":
+                top = self._stack[-1]
+                top[1], top[2] = json.loads(top[2]), None
+            elif char == ",":
+                self._value_done(events)
+            elif char in "{[":
+                parent = self._stack[-1]
+                in_questions = parent[0] == "object" and parent[1] == "questions" and len(self._stack) == 1
+                if char == "{" and len(self._stack) == 2 and self._stack[-1][3]:
+                    self._object_start = self._pos
+                self._stack.append(["object" if char == "{" else "array", None, None, in_questions])
+            elif char in "}]":
+                self._value_done(events)
+                self._stack.pop()
+                if not self._stack:
+                    self._finished = True
+                elif char == "}" and len(self._stack) == 2 and self._stack[-1][3] and self._object_start is not None:
+                    events.append(("question", json.loads(self._buffer[self._object_start:self._pos + 1])))
+                    self._object_start = None
+            self._pos += 1
+
+        self._compact()
+        return events
+
+    def _string_done(self, raw: str):
+        self._stack[-1][2] = raw
+
+    def _value_done(self, events: list):
+        """
+        A value ended at the current level; top-level strings become field events.
+        """
+        top = self._stack[-1]
+        if len(self._stack) == 1 and top[1] is not None and top[2] is not None:
+            events.append(("field", top[1], json.loads(top[2])))
+        if top[0] == "object":
+            top[1] = None
+        top[2] = None
+
+    def _compact(self):
+        """
+        Drop text that is no longer needed so the buffer does not grow with the response.
+        """
+        keep_from = self._pos
+        if self._in_string:
+            keep_from = min(keep_from, self._string_start)
+        if self._object_start is not None:
+            keep_from = min(keep_from, self._object_start)
+        if keep_from <= 0:
+            return
+
+        self._buffer = self._buffer[keep_from:]
+        self._pos -= keep_from
+        if self._string_start is not None:
+            self._string_start -= keep_from
+        if self._object_start is not None:
+            self._object_start -= keep_from
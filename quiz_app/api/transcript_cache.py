@@ -0,0 +1,106 @@
+import logging
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from quiz_app.api import metrics
+from quiz_app.models import TranscriptCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+def video_key_from_info(info: dict):
+    """
+    Return the canonical (extractor, video_id) pair of a yt-dlp info dict,
+    or None if the extractor did not report a stable id.
+    """
+    if not info:
+        return None
+    extractor = info.get("extractor_key") or info.get("extractor")
+    video_id = info.get("id")
+    if not extractor or not video_id:
+        return None
+    return str(extractor).lower(), str(video_id)
+
+
+def get_cached_transcript(info: dict, model_name: str, language: str, max_seconds: float = None):
+    """
+    Look up the transcript of the video described by `info`.
+    Returns the text on a hit (and marks the entry as recently used), otherwise None.
+    A partial transcript only counts as a hit if it covers at least `max_seconds`
+    (`max_seconds=None` asks for the complete transcript).
+    """
+    key = video_key_from_info(info)
+    if not settings.TRANSCRIPT_CACHE_ENABLED or key is None:
+        return None
+
+    extractor, video_id = key
+    entry = (TranscriptCacheEntry.objects
+             .filter(extractor=extractor, video_id=video_id, model_name=model_name, language=language)
+             .only("id", "text", "max_seconds")
+             .first())
+    if entry is None or (entry.max_seconds is not None and (max_seconds is None or entry.max_seconds < max_seconds)):
+        metrics.CACHE_REQUESTS.inc(cache="transcript", result="miss")
+        return None
+
+    metrics.CACHE_REQUESTS.inc(cache="transcript", result="hit")
+    TranscriptCacheEntry.objects.filter(pk=entry.pk).update(hits=F("hits") + 1, last_used_at=timezone.now())
+    return entry.text
+
+
+def store_transcript(info: dict, model_name: str, language: str, text: str, max_seconds: float = None):
+    """
+    Store a transcript for the video described by `info` and evict the least
+    recently used entries if the cache grew beyond TRANSCRIPT_CACHE_MAX_BYTES.
+    `max_seconds` marks a transcript that only covers the beginning of the video.
+    """
+    key = video_key_from_info(info)
+    if not settings.TRANSCRIPT_CACHE_ENABLED or key is None or not text.strip():
+        return None
+
+    extractor, video_id = key
+    size = len(text.encode("utf-8"))
+    try:
+        with transaction.atomic():
+            entry, _ = TranscriptCacheEntry.objects.update_or_create(
+                extractor=extractor,
+                video_id=video_id,
+                model_name=model_name,
+                language=language,
+                defaults={
+                    "text": text,
+                    "max_seconds": max_seconds,
+                    "size_bytes": size,
+                    "last_used_at": timezone.now(),
+                },
+            )
+    except IntegrityError:
+        # Another worker stored the same video concurrently; its entry is just as good.
+        return None
+
+    evict_to_limit()
+    return entry
+
+
+def evict_to_limit(max_bytes: int = None) -> int:
+    """
+    Delete least recently used entries until the total cached text fits into `max_bytes`.
+    Returns the number of deleted entries.
+    """
+    max_bytes = settings.TRANSCRIPT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    total = TranscriptCacheEntry.objects.aggregate(total=Sum("size_bytes"))["total"] or 0
+    if total <= max_bytes:
+        return 0
+
+    to_delete = []
+    for pk, size in TranscriptCacheEntry.objects.order_by("last_used_at", "id").values_list("id", "size_bytes").iterator():
+        if total <= max_bytes:
+            break
+        to_delete.append(pk)
+        total -= size
+
+    TranscriptCacheEntry.objects.filter(pk__in=to_delete).delete()
+    logger.info("Evicted %d transcript cache entries", len(to_delete))
+    return len(to_delete)
@@ -1,8 +1,34 @@
+from django.conf import settings
 from django.urls import path
-from .views import QuizListCreateView, QuizDetailView
+from . import async_views
+from .views import (
+    QuizListCreateView, QuizDetailView, QuizGenerationJobDetailView, QuizBulkImportView,
+    QuizStreamCreateView, QuizBatchCreateView, QuizGenerationBatchDetailView,
+)
 
-urlpatterns = [
-   path("createQuiz/", QuizListCreateView.as_view(), name="quiz-list-create"),
-   path("quizzes/", QuizListCreateView.as_view(), name="quiz-list"),
-   path("quizzes/<int:pk>/", QuizDetailView.as_view(), name="my-quizzes"),
-]
\ No newline at end of file
+
+def quiz_urlpatterns(async_views_enabled: bool) -> list:
+    """
+    URL patterns of the quiz API; list, create and detail are served by the
+    async views when `async_views_enabled` (QUIZ_ASYNC_VIEWS) is set.
+    """
+    if async_views_enabled:
+        list_create, detail = async_views.quiz_list_create, async_views.quiz_detail
+    else:
+        list_create, detail = QuizListCreateView.as_view(), QuizDetailView.as_view()
+
+    return [
+       path("createQuiz/", list_create, name="quiz-list-create"),
+       path("createQuiz/stream/", QuizStreamCreateView.as_view(), name="quiz-create-stream"),
+       path("quizzes/", list_create, name="quiz-list"),
+       path("quizzes/import/", QuizBulkImportView.as_view(), name="quiz-bulk-import"),
+       path("quizzes/batch/", QuizBatchCreateView.as_view(), name="quiz-batch-create"),
+       path("quizzes/<int:pk>/", detail, name="my-quizzes"),
+       path("jobs/<int:pk>/", QuizGenerationJobDetailView.as_view(), name="quiz-job-detail"),
+       path("jobs/<int:pk>/events/", async_views.job_events, name="quiz-job-events"),
+       path("batches/<int:pk>/", QuizGenerationBatchDetailView.as_view(), name="quiz-batch-detail"),
+       path("batches/<int:pk>/events/", async_views.batch_events, name="quiz-batch-events"),
+    ]
+
+
+urlpatterns = quiz_urlpatterns(settings.QUIZ_ASYNC_VIEWS)
@@ -1,70 +1,278 @@
+import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 import yt_dlp
-import whisper
+from yt_dlp.utils import download_range_func
 from django.conf import settings
-from google import genai
+from django.db import transaction
 import json
 
 from core.settings import YDL_BASE_OPTS
-from quiz_app.models import Question
+from quiz_app.models import Quiz, Question
+from quiz_app.api import audio, chunked_transcription, engines, gemini, media_spool, metrics, transcript_cache, vad
+from quiz_app.api.serializers import QuestionSerializer, QuizSerializer
+from quiz_app.api.stream_parser import QuizStreamParser
+from quiz_app.api.whisper_registry import registry as whisper_registry
 
-def download_audio_from_url(url: str, quiz_id: int = None) -> dict:
+logger = logging.getLogger(__name__)
+
+def extract_video_info(url: str) -> dict:
+    """
+    Resolve a video URL with yt-dlp without downloading anything.
+    The returned info carries the canonical extractor and video id.
+    """
+    if not url:
+        return {"success": False, "error": "No URL provided."}
+
+    try:
+        with metrics.time_stage("extract"):
+            with yt_dlp.YoutubeDL({**settings.YDL_BASE_OPTS}) as ydl:
+                info = ydl.extract_info(url, download=False)
+        return {"success": True, "info": info}
+
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+def expand_video_urls(urls: list, limit: int) -> dict:
+    """
+    Expand playlist URLs into the URLs of their videos with yt-dlp (flat, nothing is downloaded).
+    Other URLs are kept as they are; duplicates are dropped and at most `limit` URLs are returned.
+
+    Return format:
+      {"success": True, "urls": [...], "errors": {url: "..."}}
+    or
+      {"success": False, "error": "..."}
+    """
+    opts = {**settings.YDL_BASE_OPTS, "noplaylist": False, "extract_flat": "in_playlist", "skip_download": True}
+    expanded, errors = [], {}
+
+    def expand(url):
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            info = ydl.extract_info(url, download=False, process=False)
+        if info.get("_type") in ("playlist", "multi_video"):
+            return [entry.get("url") or entry.get("webpage_url") for entry in info.get("entries") or [] if entry]
+        return [url]
+
+    def try_expand(url):
+        try:
+            return expand(url)
+        except Exception as e:
+            errors[url] = str(e)
+            return []
+
+    # Every URL costs a round trip to the site, so resolve them side by side.
+    with ThreadPoolExecutor(max_workers=max(1, min(len(urls), settings.QUIZ_DOWNLOAD_WORKERS))) as pool:
+        for video_urls in pool.map(try_expand, urls):
+            expanded.extend(video_url for video_url in video_urls if video_url)
+
+    unique = list(dict.fromkeys(expanded))[:limit]
+    if not unique:
+        return {"success": False, "error": next(iter(errors.values()), "No videos found.")}
+    return {"success": True, "urls": unique, "errors": errors}
+
+
+def transcription_budget_seconds(info: dict = None):
+    """
+    Estimate how many seconds of audio fill the transcript part of the Gemini prompt.
+    Returns None if the whole video is needed (budget mode off or the video is short enough).
+    """
+    if not settings.TRANSCRIBE_WITHIN_PROMPT_BUDGET:
+        return None
+
+    seconds = (settings.GEMINI_TRANSCRIPT_CHAR_LIMIT / settings.TRANSCRIPT_CHARS_PER_SECOND
+               * settings.TRANSCRIPT_BUDGET_MARGIN)
+    duration = (info or {}).get("duration")
+    if duration and duration <= seconds:
+        return None
+    return seconds
+
+
+def _download_progress_hook(on_progress):
+    """
+    Turn yt-dlp progress hook calls into `download` progress events, at most one per percent.
+    """
+    last = {"percent": None}
+
+    def hook(status):
+        if status.get("status") not in ("downloading", "finished"):
+            return
+        downloaded = status.get("downloaded_bytes") or 0
+        total = status.get("total_bytes") or status.get("total_bytes_estimate")
+        percent = 100 if status["status"] == "finished" else (int(downloaded * 100 / total) if total else None)
+        if percent is not None and percent == last["percent"]:
+            return
+        last["percent"] = percent
+        on_progress("download", percent=percent, downloaded_bytes=downloaded, total_bytes=total)
+
+    return hook
+
+
+def download_audio_from_url(url: str, quiz_id: int = None, info: dict = None, max_seconds: float = None,
+                            on_progress=None) -> dict:
     """
-    Load audio from a video URL using yt-dlp.
-    Callback to local storage path.
+    Load audio from a video URL using yt-dlp into a new media spool workspace.
+    Returns the file path and the workspace `lease`; the caller releases it once the audio is transcribed.
+    If `info` from extract_video_info is given, the URL is not extracted a second time.
+    With `max_seconds` only the beginning of the audio is downloaded.
+    The file is stored as 16 kHz mono audio in AUDIO_INGEST_CODEC.
+    `on_progress(event, **data)` receives `download` events from yt-dlp's progress hooks.
     """
     if not url:
         return {"success": False, "error": "No URL provided."}
 
-    output_dir = os.path.join(os.getcwd(), "quiz_app", "media")
-    os.makedirs(output_dir, exist_ok=True)
+    savings = audio.media_savings(info, max_seconds) if info else None
+    try:
+        lease = media_spool.spool.allocate("audio", needed_bytes=savings["bytes"] if savings else 0)
+    except media_spool.MediaSpoolFull as e:
+        return {"success": False, "error": str(e)}
 
-    filename = f"quiz_{quiz_id or 'temp'}_%(id)s.%(ext)s"
-    outtmpl = os.path.join(output_dir, filename)
+    outtmpl = lease.file(f"quiz_{quiz_id or 'temp'}_%(id)s.%(ext)s")
 
     ydl_opts = {
         **settings.YDL_BASE_OPTS,
         "outtmpl": outtmpl,
     }
+    if max_seconds:
+        ydl_opts["download_ranges"] = download_range_func(None, [(0, max_seconds)])
+    if on_progress:
+        ydl_opts["progress_hooks"] = [_download_progress_hook(on_progress)]
 
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=True)
-            filepath = os.path.normpath(ydl.prepare_filename(info))
+        with metrics.time_stage("download"), yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            ydl.add_post_processor(audio.speech_postprocessor(), when="post_process")
+            if info is not None:
+                info = ydl.process_ie_result(info, download=True)
+            else:
+                info = ydl.extract_info(url, download=True)
+            # After the 16 kHz conversion the file has a different extension than the download.
+            downloads = info.get("requested_downloads") or [{}]
+            filepath = os.path.normpath(downloads[0].get("filepath") or ydl.prepare_filename(info))
 
         return {
             "success": True,
             "filepath": filepath,
             "title": info.get("title"),
+            "lease": lease,
         }
 
     except Exception as e:
+        lease.release()
         return {"success": False, "error": str(e)}
 
 
-def run_whisper_transcription(audio_path: str) -> str:
+def trim_audio_file(audio_path: str, max_seconds: float = None, on_progress=None):
+    """
+    Decode an audio file to 16 kHz samples and cut out its silence (see vad.trim_silence).
+    Returns the speech samples, or None if VAD is disabled or the file could not be decoded.
+    """
+    options = vad.options_from_settings()
+    if options is None:
+        return None
+
+    try:
+        import whisper
+
+        samples = whisper.load_audio(audio_path)
+    except Exception as e:
+        logger.warning("Could not decode %s for voice activity detection: %s", audio_path, e)
+        return None
+
+    if max_seconds:
+        samples = samples[:int(max_seconds * vad.SAMPLE_RATE)]
+    speech, _, stats = vad.trim_silence(samples, **options)
+    if on_progress:
+        on_progress("vad", **stats)
+    return speech
+
+
+def run_whisper_transcription(audio_path: str, max_seconds: float = None, on_progress=None,
+                              engine: engines.EngineConfig = None) -> str:
     """
-    startet Whisper_Model(small or medium) to transcribe audio file.
+    Transcribe an audio file with the process-wide cached model of `engine` (default: the configured one).
+    With `max_seconds` Whisper stops decoding after that much audio.
+    With VAD_ENABLED only the speech is decoded; `on_progress` receives a `vad` event with the removed seconds.
+    The file is left in place; it belongs to the caller's media spool lease.
     """
     audio_path = os.path.abspath(audio_path)
+    engine = engine or engines.default_engine()
+    audio_input, clip_timestamps = audio_path, [0, max_seconds] if max_seconds else "0"
+
+    speech = trim_audio_file(audio_path, max_seconds=max_seconds, on_progress=on_progress)
+    if speech is not None:
+        if not len(speech):
+            return ""
+        audio_input, clip_timestamps = speech, "0"
 
     try:
-        model = whisper.load_model("small")
-        result = model.transcribe(audio_path, language="de")
-        os.remove(audio_path)
+        with whisper_registry.use(engine.key) as model:
+            # language=None lets Whisper detect it from the first 30 seconds.
+            result = model.transcribe(audio_input, language=None if engine.detect_language else engine.language,
+                                      clip_timestamps=clip_timestamps)
         return result["text"]
     except Exception as e:
         return ""
     
 
-def generate_quiz_with_gemini(transcript: str) -> dict:
+def run_chunked_transcription(url: str, info: dict, quiz_id: int = None, on_stage=None,
+                              max_seconds: float = None, on_progress=None, audio_path: str = None,
+                              engine: engines.EngineConfig = None) -> dict:
     """
-    Generate quiz data using Gemini API.
+    Transcribe a video in parallel chunks while its audio is still downloading.
+    The selected audio stream is fed straight into the segmenter; formats that yt-dlp
+    has to merge from several streams are downloaded first and then segmented.
+    An `audio_path` that was downloaded beforehand is segmented instead (its owner deletes it).
     """
-    if not transcript.strip():
-        return {"title": "Fehler", "description": "Kein Transkript vorhanden", "questions": []}
+    on_stage = on_stage or (lambda stage: None)
+    on_progress = on_progress or (lambda event, **data: None)
+    engine = engine or engines.default_engine()
+    source, headers = (audio_path, None) if audio_path else chunked_transcription.media_source_from_info(info)
+    lease = None
+
+    if source is None:
+        result = download_audio_from_url(url, quiz_id=quiz_id, info=info, max_seconds=max_seconds,
+                                         on_progress=on_progress)
+        if not result.get("success"):
+            return result
+        source, lease = result.get("filepath"), result.get("lease")
+
+    started = time.monotonic()
+    trimmed = {"audio_seconds": 0.0, "speech_seconds": 0.0}
+
+    def on_segment(index):
+        if index == 0:
+            on_stage("transcribing")
+        on_progress("transcription", segments=index + 1, elapsed=round(time.monotonic() - started, 2))
+
+    def on_vad(audio_seconds, speech_seconds):
+        trimmed["audio_seconds"] += audio_seconds
+        trimmed["speech_seconds"] += speech_seconds
+
+    try:
+        text = chunked_transcription.transcribe_stream(
+            source, headers=headers, model_name=engine.key, language=engine.language,
+            on_segment=on_segment, max_seconds=max_seconds,
+            max_chars=settings.GEMINI_TRANSCRIPT_CHAR_LIMIT if max_seconds else None, on_vad=on_vad,
+        )
+        if trimmed["audio_seconds"]:
+            on_progress("vad", audio_seconds=round(trimmed["audio_seconds"], 2),
+                        speech_seconds=round(trimmed["speech_seconds"], 2),
+                        removed_seconds=round(trimmed["audio_seconds"] - trimmed["speech_seconds"], 2))
+        return {"success": True, "text": text}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+    finally:
+        if lease is not None:
+            lease.release()
+
 
-    prompt = f"""
+def build_quiz_prompt(transcript: str) -> str:
+    """
+    Build the Gemini prompt for a quiz about `transcript`.
+    """
+    return f"""
     Create a quiz based on the following video transcript.
     
     Requirements:
@@ -85,30 +293,36 @@ def generate_quiz_with_gemini(transcript: str) -> dict:
     }}
 
     Transcript:
-    {transcript[:12000]}  # Limit length to avoid prompt being too large
+    {transcript[:settings.GEMINI_TRANSCRIPT_CHAR_LIMIT]}  # Limit length to avoid prompt being too large
     """
 
-    API_KEY = settings.API_KEY
-    client = genai.Client(api_key=API_KEY)
 
-    try:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash", contents=(prompt)
-        )
-        raw_output = response.text.strip()
+def generate_quiz_with_gemini(transcript: str) -> dict:
+    """
+    Generate quiz data using Gemini API.
+    """
+    if not transcript.strip():
+        return {"title": "Fehler", "description": "Kein Transkript vorhanden", "questions": []}
 
-        try:
-            return json.loads(raw_output)
-        except json.JSONDecodeError:
-            """
-            If the model mixes text with JSON → look for JSON part
-            """
-            start = raw_output.find("{")
-            end = raw_output.rfind("}") + 1
-            if start != -1 and end != -1:
-                return json.loads(raw_output[start:end])
-            else:
-                raise ValueError("Gemini output was not valid JSON.")
+    prompt = build_quiz_prompt(transcript)
+
+    try:
+        # Output that is no JSON counts as a failed generation as well.
+        with metrics.time_stage("generation"):
+            raw_output = gemini.generate_text(prompt).strip()
+
+            try:
+                return json.loads(raw_output)
+            except json.JSONDecodeError:
+                """
+                If the model mixes text with JSON → look for JSON part
+                """
+                start = raw_output.find("{")
+                end = raw_output.rfind("}") + 1
+                if start != -1 and end != -1:
+                    return json.loads(raw_output[start:end])
+                else:
+                    raise ValueError("Gemini output was not valid JSON.")
 
     except Exception as e:
         print(f"Gemini error: {e}")
@@ -128,9 +342,8 @@ def generate_quiz_from_video(quiz):
         quiz.save()
         return
 
-    audio_path = result["filepath"]
-
-    transcript = run_whisper_transcription(audio_path)
+    with result["lease"]:
+        transcript = run_whisper_transcription(result["filepath"])
 
     quiz_data = generate_quiz_with_gemini(transcript)
 
@@ -138,37 +351,56 @@ def generate_quiz_from_video(quiz):
     quiz.description = quiz_data["description"]
     quiz.save()
 
-    for q in quiz_data["questions"]:
-        Question.objects.create(
-            quiz=quiz,
-            question_title=q["question_title"],
-            question_options=q["question_options"],
-            answer=q["answer"],
-        )
+    Question.objects.bulk_create(
+        [
+            Question(
+                quiz=quiz,
+                question_title=q["question_title"],
+                question_options=q["question_options"],
+                answer=q["answer"],
+            )
+            for q in quiz_data["questions"]
+        ],
+        batch_size=settings.QUESTION_BULK_BATCH_SIZE,
+    )
 
     return quiz
 
 
-def generate_quiz_data_from_video(url: str, quiz_id: int = None) -> dict:
+def generate_quiz_data_from_video(url: str, quiz_id: int = None, on_stage=None, on_progress=None,
+                                  **engine_options) -> dict:
     """
     Helper function: Downloads audio, transcribes and generates quiz data (without modifying the DB).
+    `on_stage` is called with "downloading", "transcribing" and "generating" as the pipeline advances.
+    `on_progress(event, **data)` receives finer `download`, `transcription` and `gemini` events.
+    `engine_options` (model, language, latency_budget) choose the transcription engine, see engines.select_engine.
     
     Return format:
       {"success": True, "data": {"title":..., "description":..., "questions": [...]}}
     or
       {"success": False, "error": "..."} 
     """
-    result = download_audio_from_url(url, quiz_id=quiz_id)
+    on_stage = on_stage or (lambda stage: None)
+    on_progress = on_progress or (lambda event, **data: None)
+
+    result = obtain_transcript(url, quiz_id=quiz_id, on_stage=on_stage, on_progress=on_progress, **engine_options)
     if not result.get("success"):
-        return {"success": False, "error": result.get("error", "Download failed")}
+        return result
+    return generate_quiz_data_from_transcript(result["text"], on_stage=on_stage, on_progress=on_progress)
 
-    audio_path = result.get("filepath")
 
-    transcript = run_whisper_transcription(audio_path)
-    if not transcript or not transcript.strip():
-        return {"success": False, "error": "Empty or failed transcript"}
+def generate_quiz_data_from_transcript(transcript: str, on_stage=None, on_progress=None) -> dict:
+    """
+    Last step of the pipeline: let Gemini write the quiz and validate it (same return format as above).
+    """
+    on_stage = on_stage or (lambda stage: None)
+    on_progress = on_progress or (lambda event, **data: None)
 
+    on_stage("generating")
+    on_progress("gemini", state="started")
+    started = time.monotonic()
     quiz_data = generate_quiz_with_gemini(transcript)
+    on_progress("gemini", state="finished", elapsed=round(time.monotonic() - started, 2))
 
     if not isinstance(quiz_data, dict):
         return {"success": False, "error": "Invalid quiz format from Gemini"}
@@ -178,7 +410,217 @@ def generate_quiz_data_from_video(url: str, quiz_id: int = None) -> dict:
         return {"success": False, "error": "No questions generated"}
 
     for i, q in enumerate(questions):
-        if not all(k in q for k in ("question_title", "question_options", "answer")):
+        if not is_complete_question(q):
             return {"success": False, "error": f"Frage {i} unvollständig"}
 
-    return {"success": True, "data": quiz_data}
\ No newline at end of file
+    return {"success": True, "data": quiz_data}
+
+
+def is_complete_question(question) -> bool:
+    return isinstance(question, dict) and all(
+        k in question for k in ("question_title", "question_options", "answer")
+    )
+
+
+def obtain_transcript(url: str, quiz_id: int = None, on_stage=None, on_progress=None, **engine_options) -> dict:
+    """
+    Resolve the video, then return its transcript from the cache or by downloading and transcribing.
+
+    Return format:
+      {"success": True, "text": "..."}
+    or
+      {"success": False, "error": "..."}
+    """
+    media = prepare_media(url, quiz_id=quiz_id, on_stage=on_stage, on_progress=on_progress, **engine_options)
+    if not media.get("success"):
+        return media
+    return transcribe_media(media, quiz_id=quiz_id, on_stage=on_stage, on_progress=on_progress)
+
+
+def prepare_media(url: str, quiz_id: int = None, on_stage=None, on_progress=None, model: str = None,
+                  language: str = None, latency_budget: float = None) -> dict:
+    """
+    Network-bound first step of the pipeline: resolve the video, choose the transcription
+    engine (see engines.select_engine) and look up its transcript.
+    On a cache miss the audio is downloaded, unless the chunked transcription can stream it.
+
+    Return format:
+      {"success": True, "url", "info", "max_seconds", "engine", "text"}         transcript from the cache
+      {"success": True, "url", "info", "max_seconds", "engine", "audio_path", "lease"}   downloaded audio file
+      {"success": True, "url", "info", "max_seconds", "engine"}                 streamed while transcribing
+    or
+      {"success": False, "error": "..."}
+    """
+    on_stage = on_stage or (lambda stage: None)
+    on_progress = on_progress or (lambda event, **data: None)
+
+    on_stage("downloading")
+    info_result = extract_video_info(url)
+    if not info_result.get("success"):
+        return {"success": False, "error": info_result.get("error", "Download failed")}
+
+    info = info_result.get("info")
+    max_seconds = transcription_budget_seconds(info)
+    engine = engines.select_engine(max_seconds or info.get("duration"), model=model, language=language,
+                                   latency_budget=latency_budget)
+    on_progress("engine", engine=engine.key, language=engine.language)
+    media = {"success": True, "url": url, "info": info, "max_seconds": max_seconds, "engine": engine}
+
+    transcript = transcript_cache.get_cached_transcript(info, engine.key, engine.language, max_seconds=max_seconds)
+    if transcript is not None:
+        on_progress("transcription", segments=0, elapsed=0, cached=True)
+        return {**media, "text": transcript}
+
+    savings = audio.media_savings(info, max_seconds)
+    if savings is not None:
+        on_progress("media", **savings)
+
+    if settings.TRANSCRIPTION_WORKERS > 0 and chunked_transcription.media_source_from_info(info)[0] is not None:
+        return media
+
+    result = download_audio_from_url(url, quiz_id=quiz_id, info=info, max_seconds=max_seconds,
+                                     on_progress=on_progress)
+    if not result.get("success"):
+        return {"success": False, "error": result.get("error", "Download failed")}
+    return {**media, "audio_path": result.get("filepath"), "lease": result.get("lease")}
+
+
+def transcribe_media(media: dict, quiz_id: int = None, on_stage=None, on_progress=None) -> dict:
+    """
+    CPU-bound second step of the pipeline: transcribe what prepare_media() fetched
+    and store the transcript in the cache. The downloaded audio is deleted in any case.
+
+    Return format:
+      {"success": True, "text": "..."}
+    or
+      {"success": False, "error": "..."}
+    """
+    if media.get("text") is not None:
+        return {"success": True, "text": media["text"]}
+
+    # Streamed media has no lease: the segments live in a workspace of the chunked transcription.
+    with media.get("lease") or nullcontext():
+        return _transcribe_media(media, quiz_id=quiz_id, on_stage=on_stage, on_progress=on_progress)
+
+
+def _transcribe_media(media: dict, quiz_id: int = None, on_stage=None, on_progress=None) -> dict:
+    on_stage = on_stage or (lambda stage: None)
+    on_progress = on_progress or (lambda event, **data: None)
+    info, max_seconds = media["info"], media["max_seconds"]
+    engine = media.get("engine") or engines.default_engine()
+
+    with metrics.time_stage("transcription") as stage:
+        if settings.TRANSCRIPTION_WORKERS > 0:
+            result = run_chunked_transcription(media["url"], info, quiz_id=quiz_id, on_stage=on_stage,
+                                               max_seconds=max_seconds, on_progress=on_progress,
+                                               audio_path=media.get("audio_path"), engine=engine)
+            if not result.get("success"):
+                stage.fail()
+                return {"success": False, "error": result.get("error", "Transcription failed")}
+            transcript = result.get("text")
+        else:
+            on_stage("transcribing")
+            started = time.monotonic()
+            transcript = run_whisper_transcription(media["audio_path"], max_seconds=max_seconds,
+                                                   on_progress=on_progress, engine=engine)
+            # The whole file is decoded as one segment on this path.
+            on_progress("transcription", segments=1, elapsed=round(time.monotonic() - started, 2))
+        if not transcript or not transcript.strip():
+            stage.fail()
+
+    if not transcript or not transcript.strip():
+        return {"success": False, "error": "Empty or failed transcript"}
+
+    transcript_cache.store_transcript(info, engine.key, engine.language, transcript, max_seconds=max_seconds)
+    return {"success": True, "text": transcript}
+
+
+def save_quiz_data(quiz_data: dict, url: str, owner) -> Quiz:
+    """
+    Create a Quiz along with its Questions from validated generation data, atomically.
+    """
+    with transaction.atomic():
+        quiz = Quiz.objects.create(
+            title=quiz_data.get("title", "Wird generiert..."),
+            description=quiz_data.get("description", ""),
+            url=url,
+            owner=owner,
+        )
+
+        Question.objects.bulk_create(
+            [
+                Question(
+                    quiz=quiz,
+                    question_title=q.get("question_title", ""),
+                    question_options=q.get("question_options", []),
+                    answer=q.get("answer", ""),
+                )
+                for q in quiz_data.get("questions", [])
+            ],
+            batch_size=settings.QUESTION_BULK_BATCH_SIZE,
+        )
+
+    return quiz
+
+
+def stream_quiz_generation(url: str, owner, **engine_options):
+    """
+    Generate a quiz while Gemini is still writing it and yield progress events.
+
+    Every question is saved the moment its JSON object is complete, so clients
+    can show the first question long before the last one exists. Events:
+      {"event": "stage", "stage": "downloading" | "generating"}
+      {"event": "quiz", "quiz": {"id", "title", "description"}}
+      {"event": "question", "index": i, "question": {...}}
+      {"event": "done", "quiz": {...full quiz...}}
+      {"event": "error", "error": "..."}   (the partial quiz is deleted)
+    """
+    yield {"event": "stage", "stage": "downloading"}
+    result = obtain_transcript(url, **engine_options)
+    if not result.get("success"):
+        yield {"event": "error", "error": result.get("error", "Transcription failed")}
+        return
+
+    quiz = Quiz.objects.create(title="Wird generiert...", description="", url=url, owner=owner)
+    # Set once the quiz is complete. Anything else deletes the partial quiz, including a client that
+    # disconnects: the response then closes the generator, which raises GeneratorExit at a `yield`.
+    finished = False
+    try:
+        yield {"event": "stage", "stage": "generating"}
+        yield {"event": "quiz", "quiz": {"id": quiz.id, "title": quiz.title, "description": quiz.description}}
+
+        parser = QuizStreamParser()
+        count = 0
+        try:
+            for text in gemini.generate_text_stream(build_quiz_prompt(result["text"])):
+                for event in parser.feed(text):
+                    if event[0] == "field" and event[1] in ("title", "description"):
+                        setattr(quiz, event[1], str(event[2]))
+                        quiz.save(update_fields=[event[1], "updated_at"])
+                        yield {"event": "quiz", "quiz": {"id": quiz.id, "title": quiz.title,
+                                                         "description": quiz.description}}
+                    elif event[0] == "question":
+                        q = event[1]
+                        if not is_complete_question(q):
+                            raise ValueError(f"Frage {count} unvollständig")
+                        question = Question.objects.create(
+                            quiz=quiz,
+                            question_title=q["question_title"],
+                            question_options=q["question_options"],
+                            answer=q["answer"],
+                        )
+                        yield {"event": "question", "index": count, "question": QuestionSerializer(question).data}
+                        count += 1
+            if not count:
+                raise ValueError("No questions generated")
+        except Exception as e:
+            logger.warning("Gemini streaming error: %s", e)
+            yield {"event": "error", "error": str(e)}
+            return
+
+        quiz = Quiz.objects.prefetch_related("questions").get(pk=quiz.pk)
+        finished = True
+        yield {"event": "done", "quiz": QuizSerializer(quiz).data}
+    finally:
+        if not finished:
+            Quiz.objects.filter(pk=quiz.pk).delete()
@@ -0,0 +1,128 @@
+import wave
+from bisect import bisect_right
+
+import numpy as np
+from django.conf import settings
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.03
+# A frame is speech if it is louder than the noise floor (10th percentile) plus NOISE_MARGIN_DB,
+# but the threshold never exceeds the loud parts (95th percentile) minus SPEECH_RANGE_DB,
+# so quiet talkers in a recording without pauses are kept, and never drops below MIN_THRESHOLD_DB.
+NOISE_MARGIN_DB = 10.0
+SPEECH_RANGE_DB = 30.0
+MIN_THRESHOLD_DB = -60.0
+# Speech shorter than this (clicks, a cough in a pause) does not count.
+MIN_SPEECH_SECONDS = 0.25
+
+
+class SpeechMap:
+    """
+    Maps times in the trimmed audio back to the original audio.
+    `regions` are the kept (start, end) ranges of the original, in seconds.
+    """
+    def __init__(self, regions: list):
+        self.regions = regions
+        self._starts = []
+        offset = 0.0
+        for start, end in regions:
+            self._starts.append(offset)
+            offset += end - start
+        self.speech_seconds = offset
+
+    def to_original(self, seconds: float) -> float:
+        if not self.regions:
+            return seconds
+        index = max(bisect_right(self._starts, seconds) - 1, 0)
+        start, end = self.regions[index]
+        return min(start + seconds - self._starts[index], end)
+
+
+def frame_levels(samples: np.ndarray, frame: int) -> np.ndarray:
+    """
+    RMS level in dBFS of every `frame` samples (float samples in [-1, 1]).
+    """
+    count = len(samples) // frame
+    if not count:
+        return np.empty(0)
+    frames = samples[:count * frame].astype(np.float32).reshape(count, frame)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def detect_speech(samples: np.ndarray, sample_rate: int = SAMPLE_RATE, min_silence: float = 0.8,
+                  padding: float = 0.2) -> list:
+    """
+    Energy-based voice activity detection.
+    Returns the (start, end) sample ranges that contain speech, each widened by `padding`
+    seconds; pauses shorter than `min_silence` seconds are kept as part of the speech.
+    """
+    frame = int(sample_rate * FRAME_SECONDS)
+    levels = frame_levels(samples, frame)
+    if not len(levels):
+        return [(0, len(samples))] if len(samples) else []
+
+    floor, loud = np.percentile(levels, 10), np.percentile(levels, 95)
+    threshold = max(MIN_THRESHOLD_DB, min(floor + NOISE_MARGIN_DB, loud - SPEECH_RANGE_DB))
+    voiced = levels > threshold
+
+    regions = []
+    # Rising and falling edges of the voiced frames.
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], voiced.astype(np.int8), [0]))))
+    for start, end in zip(edges[::2], edges[1::2]):
+        if regions and (start - regions[-1][1]) * FRAME_SECONDS < min_silence:
+            regions[-1][1] = end
+        else:
+            regions.append([start, end])
+
+    pad = int(padding * sample_rate)
+    ranges = []
+    for start, end in regions:
+        if (end - start) * FRAME_SECONDS < MIN_SPEECH_SECONDS:
+            continue
+        start, end = max(start * frame - pad, 0), min(end * frame + pad, len(samples))
+        if ranges and start <= ranges[-1][1]:
+            ranges[-1] = (ranges[-1][0], end)
+        else:
+            ranges.append((start, end))
+    return ranges
+
+
+def trim_silence(samples: np.ndarray, sample_rate: int = SAMPLE_RATE, min_silence: float = 0.8,
+                 padding: float = 0.2):
+    """
+    Cut the non-speech parts out of `samples`.
+    Returns (speech samples, SpeechMap, stats) with stats
+    {"audio_seconds", "speech_seconds", "removed_seconds"}.
+    """
+    ranges = detect_speech(samples, sample_rate, min_silence=min_silence, padding=padding)
+    speech = np.concatenate([samples[start:end] for start, end in ranges]) if ranges else samples[:0]
+    speech_map = SpeechMap([(start / sample_rate, end / sample_rate) for start, end in ranges])
+
+    audio_seconds = len(samples) / sample_rate
+    stats = {
+        "audio_seconds": round(audio_seconds, 2),
+        "speech_seconds": round(speech_map.speech_seconds, 2),
+        "removed_seconds": round(audio_seconds - speech_map.speech_seconds, 2),
+    }
+    return speech, speech_map, stats
+
+
+def options_from_settings():
+    """
+    Keyword arguments for trim_silence() from the settings, or None if VAD is disabled.
+    """
+    if not settings.VAD_ENABLED:
+        return None
+    return {"min_silence": settings.VAD_MIN_SILENCE_SECONDS, "padding": settings.VAD_PADDING_SECONDS}
+
+
+def read_wav(path: str) -> np.ndarray:
+    """
+    Read a 16 kHz 16-bit mono WAV file (the transcription segments) as float32 samples.
+    """
+    with wave.open(path, "rb") as f:
+        if f.getsampwidth() != 2 or f.getnchannels() != 1 or f.getframerate() != SAMPLE_RATE:
+            raise ValueError(f"{path} is not 16 kHz 16-bit mono PCM")
+        data = f.readframes(f.getnframes())
+    return np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
@@ -1,34 +1,92 @@
-from rest_framework import generics
+import json
+
+from django.http import StreamingHttpResponse
+from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
-from quiz_app.api.serializers import QuizSerializer, QuizDetailSerializer
-from quiz_app.models import Quiz
+from quiz_app.api.cache import PreRenderedResponse, get_cached_detail, store_detail
+from quiz_app.api.jobs import enqueue_batch, enqueue_job
+from quiz_app.api.utils import stream_quiz_generation
+from quiz_app.api.pagination import QuizCursorPagination
+from quiz_app.api.quiz_list import QuizListFieldset
+from quiz_app.api.serializers import (
+    QuizSerializer, QuizDetailSerializer, QuizGenerationJobSerializer, QuizBulkImportSerializer,
+    QuizBatchCreateSerializer, QuizGenerationBatchSerializer,
+)
+from quiz_app.models import Quiz, QuizGenerationBatch, QuizGenerationJob
 from quiz_app.api.permissions import IsOwner
 
 
 class QuizListCreateView(generics.ListCreateAPIView):
     """
-    View to list and create quizzes for the authenticated user.
+    View to list quizzes of the authenticated user and to start new quiz generation jobs.
     """
     permission_classes = [IsAuthenticated]
     serializer_class = QuizSerializer
+    pagination_class = QuizCursorPagination
 
     def get_queryset(self):
         """
-        returns only the quizzes of the currently logged-in user.
+        returns only the quizzes of the currently logged-in user, newest first.
+        """
+        return Quiz.objects.filter(owner=self.request.user).order_by("-created_at", "-id")
+
+    def list(self, request, *args, **kwargs):
+        """
+        List the quizzes in the view and with the fields of the query parameters (see QuizListFieldset).
+        By default all fields, with all questions loaded in one additional query.
         """
-        return Quiz.objects.filter(owner=self.request.user)
+        fieldset = QuizListFieldset(request.query_params)
+        queryset = fieldset.queryset(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fieldset.serializer(page, context=self.get_serializer_context()).data)
+        return Response(fieldset.serializer(queryset, context=self.get_serializer_context()).data)
 
-    def perform_create(self, serializer):
+    def create(self, request, *args, **kwargs):
         """
-        Set the quiz owner to the currently logged-in user.
+        Queue a generation job for the given video URL and answer with 202 Accepted right away.
+        The job can be polled at the returned `status_url`.
         """
-        quiz = serializer.save(owner=self.request.user)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        job = QuizGenerationJob.objects.create(
+            owner=request.user,
+            url=serializer.validated_data["url"],
+            **serializer.job_fields(),
+        )
+        enqueue_job(job)
+        job.refresh_from_db()
+
+        data = QuizGenerationJobSerializer(job, context=self.get_serializer_context()).data
+        return Response(data, status=status.HTTP_202_ACCEPTED, headers={"Location": data["status_url"]})
+
+
+
+class QuizStreamCreateView(generics.GenericAPIView):
+    """
+    View to generate a quiz synchronously and stream its questions as they are produced.
+    The response is newline-delimited JSON, one event per line (see stream_quiz_generation).
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = QuizSerializer
 
-        return quiz
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
+        events = stream_quiz_generation(serializer.validated_data["url"], request.user, **serializer.engine_options())
+        response = StreamingHttpResponse(
+            (json.dumps(event) + "\n" for event in events),
+            content_type="application/x-ndjson",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
 
 
 class QuizDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -38,3 +96,78 @@ class QuizDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Quiz.objects.all()
     serializer_class = QuizDetailSerializer
     permission_classes = [IsAuthenticated, IsOwner]
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Serve the JSON rendering of the quiz from the detail cache when it is still current.
+        Ownership is checked by get_object() on every request, cached or not.
+        """
+        instance = self.get_object()
+        renderer = request.accepted_renderer
+        if not isinstance(renderer, JSONRenderer) or request.accepted_media_type != renderer.media_type:
+            return Response(self.get_serializer(instance).data)
+
+        cached = get_cached_detail(instance)
+        if cached is not None:
+            content_type, body = cached
+            return PreRenderedResponse(body, content_type)
+
+        response = Response(self.get_serializer(instance).data)
+        response.add_post_render_callback(lambda rendered: store_detail(instance, rendered))
+        return response
+
+
+class QuizGenerationJobDetailView(generics.RetrieveAPIView):
+    """
+    View to poll the status of a quiz generation job.
+    """
+    queryset = QuizGenerationJob.objects.all()
+    serializer_class = QuizGenerationJobSerializer
+    permission_classes = [IsAuthenticated, IsOwner]
+
+
+class QuizBatchCreateView(generics.GenericAPIView):
+    """
+    View to generate quizzes for a whole playlist or a list of URLs.
+    Answers with 202 Accepted; the batch lists every job with its result as soon as it is finished.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = QuizBatchCreateSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        batch = QuizGenerationBatch.objects.create(owner=request.user, urls=serializer.validated_data["urls"])
+        enqueue_batch(batch)
+        batch.refresh_from_db()
+
+        data = QuizGenerationBatchSerializer(batch, context=self.get_serializer_context()).data
+        return Response(data, status=status.HTTP_202_ACCEPTED, headers={"Location": data["status_url"]})
+
+
+class QuizGenerationBatchDetailView(generics.RetrieveAPIView):
+    """
+    View to poll a batch and the per-video results of its jobs.
+    """
+    queryset = QuizGenerationBatch.objects.prefetch_related("jobs")
+    serializer_class = QuizGenerationBatchSerializer
+    permission_classes = [IsAuthenticated, IsOwner]
+
+
+class QuizBulkImportView(generics.GenericAPIView):
+    """
+    View to import many pre-built quizzes (title, description, questions) in one request.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = QuizBulkImportSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        quizzes = serializer.save()
+
+        return Response(
+            {"created": len(quizzes), "ids": [quiz.id for quiz in quizzes]},
+            status=status.HTTP_201_CREATED,
+        )
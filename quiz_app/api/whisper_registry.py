@@ -0,0 +1,183 @@
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _load_whisper_model(name: str):
+    """
+    Load the transcription engine `name` (an engine key such as "small" or "small-int8",
+    see engines.EngineConfig). Whisper downloads the weights on first use; torch is
+    imported lazily so that Django startup does not pay for it.
+    """
+    from quiz_app.api.engines import load_engine
+
+    return load_engine(name)
+
+
+class _LoadedModel:
+    """
+    A loaded Whisper model plus the bookkeeping the registry needs for it.
+    """
+    def __init__(self, name: str, model):
+        self.name = name
+        self.model = model
+        # Whisper installs kv-cache hooks on the model for every decode,
+        # so one model instance must not transcribe two files at once.
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+
+
+class WhisperModelRegistry:
+    """
+    Process-wide cache of Whisper models.
+
+    Every model is loaded at most once per worker process and shared by all
+    threads. Models that have not been used for `WHISPER_MODEL_IDLE_TIMEOUT`
+    seconds are evicted by a background reaper thread to give the memory back.
+    """
+    def __init__(self, loader=None, idle_timeout: float = None):
+        self._loader = loader or _load_whisper_model
+        self._idle_timeout = idle_timeout
+        self._models = {}
+        self._load_locks = {}
+        self._lock = threading.Lock()
+        self._reaper = None
+
+    @property
+    def idle_timeout(self) -> float:
+        if self._idle_timeout is not None:
+            return self._idle_timeout
+        return settings.WHISPER_MODEL_IDLE_TIMEOUT
+
+    def get(self, name: str) -> _LoadedModel:
+        """
+        Return the loaded model `name`, loading it on first access.
+        Concurrent callers asking for the same model wait for a single load.
+        """
+        with self._lock:
+            entry = self._models.get(name)
+            if entry is not None:
+                entry.last_used = time.monotonic()
+                return entry
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                entry = self._models.get(name)
+            if entry is not None:
+                entry.last_used = time.monotonic()
+                return entry
+
+            started = time.monotonic()
+            model = self._loader(name)
+            logger.info("Loaded Whisper model %r in %.1fs", name, time.monotonic() - started)
+
+            entry = _LoadedModel(name, model)
+            with self._lock:
+                self._models[name] = entry
+            self._ensure_reaper()
+            return entry
+
+    @contextmanager
+    def use(self, name: str):
+        """
+        Context manager yielding the model `name` for exclusive use by the caller.
+        """
+        entry = self.get(name)
+        with entry.lock:
+            entry.last_used = time.monotonic()
+            try:
+                yield entry.model
+            finally:
+                entry.last_used = time.monotonic()
+
+    def warm_up(self, names=None):
+        """
+        Load the given models (default: `WHISPER_PRELOAD_MODELS`) ahead of the first request.
+        """
+        for name in names if names is not None else settings.WHISPER_PRELOAD_MODELS:
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.warning("Whisper warm-up for %r failed: %s", name, e)
+
+    def evict_idle(self, now: float = None) -> list:
+        """
+        Drop every model that has been idle for longer than the idle timeout.
+        Models that are currently transcribing are never evicted.
+        """
+        timeout = self.idle_timeout
+        if not timeout:
+            return []
+
+        now = time.monotonic() if now is None else now
+        evicted = []
+        with self._lock:
+            for name, entry in list(self._models.items()):
+                if now - entry.last_used < timeout or entry.lock.locked():
+                    continue
+                del self._models[name]
+                evicted.append(name)
+
+        for name in evicted:
+            logger.info("Evicted idle Whisper model %r", name)
+        return evicted
+
+    def evict(self, name: str) -> bool:
+        with self._lock:
+            return self._models.pop(name, None) is not None
+
+    def loaded_models(self) -> list:
+        with self._lock:
+            return sorted(self._models)
+
+    def _ensure_reaper(self):
+        """
+        Start the background thread that evicts idle models (once per registry).
+        """
+        if not self.idle_timeout:
+            return
+        with self._lock:
+            if self._reaper is not None and self._reaper.is_alive():
+                return
+            self._reaper = threading.Thread(target=self._reap_forever, name="whisper-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap_forever(self):
+        while True:
+            timeout = self.idle_timeout
+            if not timeout:
+                return
+            time.sleep(max(timeout / 2, 1))
+            self.evict_idle()
+            with self._lock:
+                if not self._models:
+                    self._reaper = None
+                    return
+
+
+def should_warm_up() -> bool:
+    """
+    Only warm up in processes that will serve requests, not in
+    `migrate`, `test` and other one-off management commands.
+    """
+    if not settings.WHISPER_WARMUP_ON_STARTUP:
+        return False
+
+    program = os.path.basename(sys.argv[0]) if sys.argv else ""
+    if program in ("manage.py", "django-admin"):
+        if len(sys.argv) < 2 or sys.argv[1] != "runserver":
+            return False
+        # The autoreloader parent process never serves requests.
+        return os.environ.get("RUN_MAIN") == "true" or "--noreload" in sys.argv
+    return True
+
+
+registry = WhisperModelRegistry()
@@ -1,6 +1,22 @@
+import threading
+
 from django.apps import AppConfig
 
 
 class QuizAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'quiz_app'
+
+    def ready(self):
+        """
+        Pre-load the configured Whisper models (or start the transcription process pool)
+        in the background so the first quiz of a fresh worker does not pay for loading the weights.
+        """
+        from django.conf import settings
+        from quiz_app import signals  # noqa: F401
+        from quiz_app.api.chunked_transcription import warm_up_pool
+        from quiz_app.api.whisper_registry import registry, should_warm_up
+
+        if should_warm_up():
+            target = warm_up_pool if settings.TRANSCRIPTION_WORKERS > 0 else registry.warm_up
+            threading.Thread(target=target, name="whisper-warmup", daemon=True).start()
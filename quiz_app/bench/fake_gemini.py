@@ -0,0 +1,121 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def candidate_body(text: str) -> dict:
+    return {
+        "candidates": [
+            {"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP"}
+        ]
+    }
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Hedged or abandoned requests may still be answered after the client went away.
+        pass
+
+
+class FakeGeminiServer:
+    """
+    Minimal local stand-in for the Gemini REST API (`models/<model>:generateContent`
+    and `:streamGenerateContent`).
+
+    Answers are taken from `responses` in order; each entry is a dict with the
+    optional keys `status` (default 200), `text`, `body` and `delay` (seconds).
+    Streaming requests may instead give `chunks` (list of texts) and
+    `chunk_delay` (seconds between server-sent events).
+    Once the list is exhausted, `default_text` is returned after `default_delay` seconds.
+    """
+    def __init__(self, responses=None, default_text="{}", default_delay=0):
+        self.responses = list(responses or [])
+        self.default_text = default_text
+        self.default_delay = default_delay
+        self.requests = []
+        self.connections = set()
+        self._lock = threading.Lock()
+        self._server = _QuietHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _next_response(self, path, body, client_address):
+        with self._lock:
+            self.requests.append({"path": path, "body": body})
+            self.connections.add(client_address)
+            if self.responses:
+                return self.responses.pop(0)
+            return {"text": self.default_text, "delay": self.default_delay}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                spec = server._next_response(self.path, body, self.client_address)
+
+                time.sleep(spec.get("delay", 0))
+                status = spec.get("status", 200)
+                if ":streamGenerateContent" in self.path and status == 200:
+                    self._stream(spec.get("chunks") or [spec.get("text", server.default_text)],
+                                 spec.get("chunk_delay", 0))
+                    return
+
+                if "body" in spec:
+                    payload = spec["body"]
+                elif status == 200:
+                    payload = candidate_body(spec.get("text", server.default_text))
+                else:
+                    payload = {"error": {"code": status, "message": "fake error", "status": "UNAVAILABLE"}}
+
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, chunks, chunk_delay):
+                """
+                Answer as server-sent events, one event per chunk, flushed one by one.
+                """
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                for i, text in enumerate(chunks):
+                    if i:
+                        time.sleep(chunk_delay)
+                    self.wfile.write(f"data: {json.dumps(candidate_body(text))}\r\n\r\n".encode())
+                    self.wfile.flush()
+                self.close_connection = True
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
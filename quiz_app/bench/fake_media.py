@@ -0,0 +1,136 @@
+import os
+import re
+import threading
+import wave
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import yt_dlp
+from yt_dlp.extractor.common import InfoExtractor
+
+SAMPLE_RATE = 16000
+
+
+def sample_speech(seconds: float, seed: int = 0) -> np.ndarray:
+    """
+    Speech-like float32 audio: voiced "utterances" of 1-4 s (a harmonic stack with a drifting
+    pitch, modulated at syllable rate) separated by 0.3-1.5 s pauses over a faint noise floor.
+    It has the loudness profile of a talk, so download sizes and the VAD behave as for speech.
+    """
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SAMPLE_RATE)
+    samples = (10 ** (-60 / 20) * rng.standard_normal(total)).astype(np.float32)
+
+    position = int(rng.uniform(0.2, 0.8) * SAMPLE_RATE)
+    while position < total:
+        length = min(int(rng.uniform(1, 4) * SAMPLE_RATE), total - position)
+        t = np.arange(length) / SAMPLE_RATE
+        f0 = rng.uniform(110, 220) * (1 + 0.05 * np.sin(2 * np.pi * rng.uniform(0.2, 0.6) * t))
+        phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+        voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+        envelope = 0.5 * (1 - np.cos(2 * np.pi * rng.uniform(3, 5) * t))
+        samples[position:position + length] += (0.1 * voiced * envelope).astype(np.float32)
+        position += length + int(rng.uniform(0.3, 1.5) * SAMPLE_RATE)
+
+    return np.clip(samples, -1, 1)
+
+
+def write_sample(path: str, seconds: float, seed: int = 0) -> str:
+    """
+    Write `seconds` of sample_speech() as a 16 kHz 16-bit mono WAV file.
+    """
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes((sample_speech(seconds, seed) * 32767).astype(np.int16).tobytes())
+    return path
+
+
+def wav_duration(path: str) -> float:
+    with wave.open(path, "rb") as f:
+        return f.getnframes() / f.getframerate()
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+
+class LocalMediaServer:
+    """
+    Serves the files of `directory` over HTTP on 127.0.0.1, like a video site's media CDN.
+    Every file `<name>.wav` is a video with the URL `bench://<name>` (see LocalMediaIE).
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), partial(_QuietHandler, directory=directory))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def youtube_dl_class(self):
+        """
+        A yt_dlp.YoutubeDL subclass that resolves `bench://` URLs to this server's files
+        before any of the regular extractors are asked.
+        """
+        server = self
+
+        class LocalMediaIE(InfoExtractor):
+            IE_NAME = "localmedia"
+            _VALID_URL = r"bench://(?P<id>[\w.-]+)"
+
+            def _real_extract(self, url):
+                video_id = self._match_id(url)
+                path = os.path.join(server.directory, f"{video_id}.wav")
+                if not re.fullmatch(r"[\w-]+", video_id) or not os.path.isfile(path):
+                    raise yt_dlp.utils.ExtractorError(f"No sample named {video_id}", expected=True)
+
+                with wave.open(path, "rb") as f:
+                    rate, channels, frames = f.getframerate(), f.getnchannels(), f.getnframes()
+                return {
+                    "id": video_id,
+                    "title": f"Benchmark sample {video_id}",
+                    "duration": frames / rate,
+                    "formats": [{
+                        "format_id": "wav",
+                        "url": f"{server.base_url}{video_id}.wav",
+                        "ext": "wav",
+                        "acodec": "pcm_s16le",
+                        "vcodec": "none",
+                        "asr": rate,
+                        "audio_channels": channels,
+                        "abr": rate * channels * 16 / 1000,
+                        "filesize": os.path.getsize(path),
+                    }],
+                }
+
+        class LocalYoutubeDL(yt_dlp.YoutubeDL):
+
+            def __init__(self, params=None, auto_init=True):
+                super().__init__(params, auto_init=False)
+                self.add_info_extractor(LocalMediaIE())
+                if auto_init:
+                    self.add_default_info_extractors()
+
+        return LocalYoutubeDL
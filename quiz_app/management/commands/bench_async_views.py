@@ -0,0 +1,137 @@
+import asyncio
+import statistics
+import sys
+import time
+import types
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from django.urls import include, path
+from rest_framework_simplejwt.tokens import AccessToken
+
+from quiz_app.api.urls import quiz_urlpatterns
+from quiz_app.models import Quiz, Question
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Requests per second of the sync and the async quiz views, both served through "
+        "core.asgi's handler with many concurrent in-process clients."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint and variant.")
+        parser.add_argument("--concurrency", type=int, default=100, help="Clients sending requests at the same time.")
+        parser.add_argument("--quizzes", type=int, default=20, help="Quizzes (10 questions each) of the benchmark user.")
+        parser.add_argument("--slow-client", type=float, default=0.0,
+                            help="Seconds each client needs to read a response body.")
+
+    def handle(self, *args, **options):
+        user = User.objects.create_user(username=f"bench-async-{uuid.uuid4().hex[:8]}", password=uuid.uuid4().hex)
+        try:
+            quizzes = Quiz.objects.bulk_create([
+                Quiz(title=f"Quiz {i}", description="Benchmark", url="https://www.youtube.com/watch?v=bench", owner=user)
+                for i in range(options["quizzes"])
+            ])
+            Question.objects.bulk_create([
+                Question(quiz=quiz, question_title=f"Frage {j}", question_options=["A", "B", "C", "D"], answer="A")
+                for quiz in quizzes for j in range(10)
+            ])
+            token = str(AccessToken.for_user(user))
+            endpoints = {"list": "/api/quizzes/", "detail": f"/api/quizzes/{quizzes[0].pk}/"}
+
+            results = {}
+            for variant, async_views in (("sync", False), ("async", True)):
+                with override_settings(ROOT_URLCONF=self.urlconf(variant, async_views)):
+                    application = get_asgi_application()
+                    for name, url in endpoints.items():
+                        results[variant, name] = asyncio.run(self.measure(application, url, token, options))
+        finally:
+            # Quizzes and questions are deleted along with the user.
+            user.delete()
+
+        for name in endpoints:
+            for variant in ("sync", "async"):
+                rps, p50, p95 = results[variant, name]
+                self.stdout.write(
+                    f"{name:>6} {variant:>5}: {rps:8.1f} req/s, p50 {p50 * 1000:7.1f} ms, p95 {p95 * 1000:7.1f} ms"
+                )
+            self.stdout.write(f"{name:>6} speed-up: {results['async', name][0] / results['sync', name][0]:.2f}x")
+
+    def urlconf(self, variant, async_views):
+        """
+        Register a throw-away URLconf module that routes the quiz API to one variant of the views.
+        """
+        module = types.ModuleType(f"bench_async_views_{variant}_urls")
+        module.urlpatterns = [path("api/", include(quiz_urlpatterns(async_views)))]
+        sys.modules[module.__name__] = module
+        return module.__name__
+
+    async def measure(self, application, url, token, options):
+        total, slow_client = options["requests"], options["slow_client"]
+        semaphore = asyncio.Semaphore(options["concurrency"])
+        latencies = []
+
+        async def one():
+            async with semaphore:
+                started = time.perf_counter()
+                status = await self.request(application, url, token, slow_client)
+                latencies.append(time.perf_counter() - started)
+                if status != 200:
+                    raise RuntimeError(f"{url} answered with HTTP {status}")
+
+        await one()  # warm-up
+        latencies.clear()
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return total / elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1]
+
+    async def request(self, application, url, token, slow_client):
+        """
+        Send one GET request straight into the ASGI application and wait for the complete response.
+        """
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": url,
+            "raw_path": url.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"localhost"), (b"authorization", f"Bearer {token}".encode())],
+            "client": ("127.0.0.1", 50000),
+            "server": ("localhost", 80),
+        }
+        finished = asyncio.Event()
+        status = None
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body" and not message.get("more_body"):
+                if slow_client:
+                    await asyncio.sleep(slow_client)
+                finished.set()
+
+        await application(scope, receive, send)
+        return status
@@ -0,0 +1,149 @@
+import os
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+
+from core.database import sqlite_database
+from quiz_app.models import Quiz, Question
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Many readers next to a few writers on one database: quiz list reads against quiz inserts "
+        "(one quiz with 10 questions per transaction). By default Django's plain SQLite settings are "
+        "compared with the tuned profile of core/database.py, each on a fresh temporary database file; "
+        "--database runs the load against a configured database (e.g. the Postgres profile) instead."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=8, help="Threads listing quizzes.")
+        parser.add_argument("--writers", type=int, default=2, help="Threads creating quizzes.")
+        parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each run.")
+        parser.add_argument("--database", help="Alias of a configured database to benchmark instead of SQLite.")
+
+    def handle(self, *args, **options):
+        if options["database"]:
+            if options["database"] not in connections.settings:
+                raise CommandError(f"Unknown database alias {options['database']!r}")
+            results = {options["database"]: self.measure(options["database"], options)}
+        else:
+            results = {}
+            with tempfile.TemporaryDirectory(prefix="bench-db-") as tmp:
+                for profile in ("baseline", "tuned"):
+                    name = os.path.join(tmp, f"{profile}.sqlite3")
+                    database = sqlite_database(name) if profile == "tuned" else {
+                        "ENGINE": "django.db.backends.sqlite3", "NAME": name,
+                    }
+                    results[profile] = self.measure_temporary(f"bench_{profile}", database, options)
+
+        for profile, result in results.items():
+            self.stdout.write(
+                f"{profile:>10}: {result['reads_per_second']:8.1f} reads/s (p95 {result['read_p95'] * 1000:7.1f} ms), "
+                f"{result['writes_per_second']:7.1f} writes/s (p95 {result['write_p95'] * 1000:7.1f} ms), "
+                f"{result['locked_errors']} \"database is locked\" errors"
+            )
+
+    def measure_temporary(self, alias, database, options) -> dict:
+        """
+        Register `database` as `alias`, migrate it, run the load and forget the alias again.
+        """
+        connections.settings[alias] = connections.configure_settings(
+            {"default": connections.settings["default"], alias: database})[alias]
+        try:
+            call_command("migrate", database=alias, verbosity=0, interactive=False)
+            return self.measure(alias, options)
+        finally:
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+
+    def measure(self, alias, options) -> dict:
+        owner = User.objects.db_manager(alias).create_user(
+            username=f"bench-db-{uuid.uuid4().hex[:8]}", password=uuid.uuid4().hex)
+        try:
+            # Something to read from the first request on.
+            self.write(alias, owner, 0)
+            return self.run(alias, owner, options)
+        finally:
+            # Quizzes and questions are deleted along with the user.
+            owner.delete(using=alias)
+
+    def run(self, alias, owner, options) -> dict:
+        stop = threading.Event()
+        lock = threading.Lock()
+        latencies = {"read": [], "write": []}
+        errors = {"locked": 0, "other": 0}
+
+        def worker(kind, number):
+            try:
+                while not stop.is_set():
+                    started = time.perf_counter()
+                    try:
+                        if kind == "read":
+                            self.read(alias, owner)
+                        else:
+                            self.write(alias, owner, number)
+                    except OperationalError as e:
+                        with lock:
+                            errors["locked" if "locked" in str(e) else "other"] += 1
+                        continue
+                    with lock:
+                        latencies[kind].append(time.perf_counter() - started)
+            finally:
+                connections[alias].close()
+
+        threads = [threading.Thread(target=worker, args=("read", i)) for i in range(options["readers"])]
+        threads += [threading.Thread(target=worker, args=("write", i)) for i in range(options["writers"])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(options["seconds"])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        return {
+            "reads_per_second": len(latencies["read"]) / elapsed,
+            "writes_per_second": len(latencies["write"]) / elapsed,
+            "read_p95": self.p95(latencies["read"]),
+            "write_p95": self.p95(latencies["write"]),
+            "locked_errors": errors["locked"],
+            "other_errors": errors["other"],
+        }
+
+    def read(self, alias, owner):
+        """
+        What the quiz list endpoint reads: the newest quizzes of a user with their questions.
+        """
+        quizzes = list(Quiz.objects.using(alias).filter(owner=owner).order_by("-created_at")
+                       .prefetch_related("questions")[:20])
+        return sum(len(quiz.questions.all()) for quiz in quizzes)
+
+    def write(self, alias, owner, number):
+        """
+        What a finished generation job writes: one quiz with 10 questions in one transaction.
+        """
+        with transaction.atomic(using=alias):
+            quiz = Quiz.objects.using(alias).create(
+                title=f"Quiz {number}", description="Benchmark", url="https://www.youtube.com/watch?v=bench", owner=owner)
+            Question.objects.using(alias).bulk_create([
+                Question(quiz=quiz, question_title=f"Frage {i}", question_options=["A", "B", "C", "D"], answer="A")
+                for i in range(10)
+            ])
+
+    def p95(self, latencies) -> float:
+        if not latencies:
+            return 0.0
+        if len(latencies) == 1:
+            return latencies[0]
+        return statistics.quantiles(latencies, n=20)[-1]
@@ -0,0 +1,286 @@
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+import yt_dlp
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from quiz_app.api import chunked_transcription, engines, gemini, utils
+from quiz_app.api.whisper_registry import registry as whisper_registry
+from quiz_app.bench.fake_gemini import FakeGeminiServer
+from quiz_app.bench.fake_media import LocalMediaServer, wav_duration, write_sample
+
+STAGES = ("download", "transcription", "generation")
+
+# What the fake Gemini server answers: a complete quiz of 10 questions.
+FAKE_QUIZ = {
+    "title": "Benchmark Quiz",
+    "description": "Generated by the local Gemini stand-in",
+    "questions": [
+        {"question_title": f"Frage {i}", "question_options": ["A", "B", "C", "D"], "answer": "A"}
+        for i in range(10)
+    ],
+}
+
+
+def _proc_stat(pid) -> list:
+    """
+    Fields of /proc/<pid>/stat from the state on (field 3), or None if the process is gone.
+    """
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()
+    except (OSError, IndexError):
+        return None
+
+
+def child_processes() -> dict:
+    """
+    {pid: (cpu seconds, rss bytes)} of the live child processes (transcription workers, ffmpeg).
+    Empty where /proc is not available.
+    """
+    if not os.path.isdir("/proc"):
+        return {}
+    parent, ticks, page = str(os.getpid()), os.sysconf("SC_CLK_TCK"), os.sysconf("SC_PAGE_SIZE")
+    children = {}
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        fields = _proc_stat(pid)
+        if fields and fields[1] == parent:
+            children[int(pid)] = ((int(fields[11]) + int(fields[12])) / ticks, int(fields[21]) * page)
+    return children
+
+
+def own_rss() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Lifetime peak in KiB (Linux) instead of the current size.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class StageMeter:
+    """
+    Wall time, CPU time and peak RSS of a pipeline stage, including its child processes.
+    RSS is sampled every `interval` seconds on a background thread.
+    """
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+
+    def measure(self, fn):
+        """
+        Call `fn()` and return (its result, {"wall_seconds", "cpu_seconds", "peak_rss_bytes"}).
+        """
+        peak = {"rss": 0}
+        done = threading.Event()
+
+        def sample():
+            while True:
+                children = child_processes()
+                peak["rss"] = max(peak["rss"], own_rss() + sum(rss for _, rss in children.values()))
+                if done.wait(self.interval):
+                    return
+
+        times, children = os.times(), child_processes()
+        started = time.perf_counter()
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        try:
+            result = fn()
+        finally:
+            done.set()
+            sampler.join()
+        wall = time.perf_counter() - started
+        end_times, end_children = os.times(), child_processes()
+
+        cpu = (end_times.user + end_times.system) - (times.user + times.system)
+        # Children that exited (and were waited for) during the stage are in the children_* times,
+        # with all of their CPU time, including what they used before the stage started.
+        cpu += (end_times.children_user + end_times.children_system) - (times.children_user + times.children_system)
+        cpu += sum(seconds - children.get(pid, (0, 0))[0] for pid, (seconds, _) in end_children.items())
+        cpu -= sum(seconds for pid, (seconds, _) in children.items() if pid not in end_children)
+
+        return result, {
+            "wall_seconds": round(wall, 3),
+            "cpu_seconds": round(cpu, 3),
+            "peak_rss_bytes": max(peak["rss"], own_rss()),
+        }
+
+
+class Command(BaseCommand):
+    help = (
+        "End-to-end benchmark of the quiz generation pipeline (download, transcription, Gemini) "
+        "against local stand-ins: sample audio served by a fake yt-dlp extractor and a fake Gemini server. "
+        "Reports wall time, CPU time and peak RSS per stage and writes them as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lengths", default="30,120,600",
+                            help="Comma-separated lengths in seconds of the generated speech-like samples.")
+        parser.add_argument("--fixtures", help="Directory of 16-bit WAV recordings to use instead of generated samples.")
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per sample; the summary shows the median.")
+        parser.add_argument("--model", help="Transcription model (default: WHISPER_DEFAULT_MODEL).")
+        parser.add_argument("--language", help="Transcription language or 'auto' (default: WHISPER_LANGUAGE).")
+        parser.add_argument("--gemini-latency", type=float, default=0.0,
+                            help="Seconds the fake Gemini server takes to answer.")
+        parser.add_argument("--no-warm-up", action="store_true", help="Measure the first run with cold models.")
+        parser.add_argument("--output", default="bench_pipeline.json", help="JSON report ('-' for stdout only).")
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory(prefix="bench-pipeline-") as tmp:
+            samples = self.samples(options, tmp)
+            with LocalMediaServer(options["fixtures"] or tmp) as media_server, \
+                    FakeGeminiServer(default_text=json.dumps(FAKE_QUIZ),
+                                     default_delay=options["gemini_latency"]) as gemini_server, \
+                    override_settings(GEMINI_BASE_URL=gemini_server.base_url, API_KEY=settings.API_KEY or "bench",
+                                      TRANSCRIPT_CACHE_ENABLED=False), \
+                    patch.object(yt_dlp, "YoutubeDL", media_server.youtube_dl_class()):
+                gemini.reset_client()
+                try:
+                    report = self.run(samples, options)
+                finally:
+                    gemini.reset_client()
+
+        self.print_summary(report)
+        if options["output"] != "-":
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Report written to {options['output']}")
+        else:
+            self.stdout.write(json.dumps(report, indent=2))
+
+    def samples(self, options, tmp) -> list:
+        """
+        [(name, audio seconds)] of the WAV files the fake extractor serves as bench://<name>.
+        """
+        if options["fixtures"]:
+            names = sorted(name[:-4] for name in os.listdir(options["fixtures"]) if name.endswith(".wav"))
+            if not names:
+                raise CommandError(f"No .wav files in {options['fixtures']}")
+            return [(name, wav_duration(os.path.join(options["fixtures"], f"{name}.wav"))) for name in names]
+
+        try:
+            lengths = [float(length) for length in options["lengths"].split(",") if length.strip()]
+        except ValueError:
+            raise CommandError("--lengths must be comma-separated numbers of seconds")
+        samples = []
+        for seed, seconds in enumerate(lengths):
+            name = f"speech-{seconds:g}s".replace(".", "_")
+            write_sample(os.path.join(tmp, f"{name}.wav"), seconds, seed=seed)
+            samples.append((name, seconds))
+        return samples
+
+    def run(self, samples, options) -> dict:
+        meter = StageMeter()
+        engine_options = {"model": options["model"], "language": options["language"]}
+
+        if not options["no_warm_up"]:
+            engine = engines.select_engine(model=options["model"], language=options["language"])
+            if settings.TRANSCRIPTION_WORKERS > 0:
+                chunked_transcription.warm_up_pool(engine.key)
+            else:
+                whisper_registry.warm_up([engine.key])
+
+        runs = []
+        for name, seconds in samples:
+            for attempt in range(options["repeat"]):
+                run = self.run_once(f"bench://{name}", meter, engine_options)
+                runs.append({"sample": name, "audio_seconds": round(seconds, 2), "attempt": attempt, **run})
+                self.stderr.write(f"{name} #{attempt + 1}: {run['stages'].get('total', {}).get('wall_seconds')} s"
+                                  + ("" if run["success"] else f" ({run['error']})"))
+
+        return {"environment": self.environment(options), "runs": runs, "summary": self.summarize(runs)}
+
+    def run_once(self, url, meter, engine_options) -> dict:
+        """
+        One pass through the pipeline, stage by stage, as generate_quiz_data_from_video() runs it.
+        With TRANSCRIPTION_WORKERS > 0 the audio is streamed into the transcription,
+        so its download time is part of the transcription stage.
+        """
+        events = {}
+        stages = {}
+
+        def on_progress(event, **data):
+            events[event] = data
+
+        media, stages["download"] = meter.measure(
+            lambda: utils.prepare_media(url, on_progress=on_progress, **engine_options))
+        if not media.get("success"):
+            return self.finish(stages, events, error=media.get("error"))
+
+        transcript, stages["transcription"] = meter.measure(
+            lambda: utils.transcribe_media(media, on_progress=on_progress))
+        text = transcript.get("text") or ""
+        # Recordings without words still get a quiz, so the generation stage is always measured.
+        placeholder = not text.strip()
+        if placeholder:
+            text = "Dies ist ein Platzhalter-Transkript. " * (settings.GEMINI_TRANSCRIPT_CHAR_LIMIT // 37)
+
+        quiz, stages["generation"] = meter.measure(
+            lambda: utils.generate_quiz_data_from_transcript(text, on_progress=on_progress))
+        return self.finish(stages, events, error=None if quiz.get("success") else quiz.get("error"),
+                           transcription_error=transcript.get("error"), transcript_chars=len(text),
+                           placeholder_transcript=placeholder)
+
+    def finish(self, stages, events, error=None, **extra) -> dict:
+        stages["total"] = {
+            "wall_seconds": round(sum(stage["wall_seconds"] for stage in stages.values()), 3),
+            "cpu_seconds": round(sum(stage["cpu_seconds"] for stage in stages.values()), 3),
+            "peak_rss_bytes": max(stage["peak_rss_bytes"] for stage in stages.values()),
+        }
+        return {"success": error is None, "error": error, "stages": stages, "events": events, **extra}
+
+    def summarize(self, runs) -> dict:
+        """
+        Median of every stage metric per sample.
+        """
+        summary = {}
+        for name in dict.fromkeys(run["sample"] for run in runs):
+            sample_runs = [run for run in runs if run["sample"] == name]
+            summary[name] = {
+                stage: {
+                    metric: statistics.median(run["stages"][stage][metric] for run in sample_runs)
+                    for metric in ("wall_seconds", "cpu_seconds", "peak_rss_bytes")
+                }
+                for stage in (*STAGES, "total") if all(stage in run["stages"] for run in sample_runs)
+            }
+        return summary
+
+    def environment(self, options) -> dict:
+        try:
+            commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                    cwd=settings.BASE_DIR, timeout=5).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            commit = None
+        engine = engines.select_engine(model=options["model"], language=options["language"])
+        return {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commit": commit,
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "engine": engine.key,
+            "language": engine.language,
+            "transcription_workers": settings.TRANSCRIPTION_WORKERS,
+            "vad_enabled": settings.VAD_ENABLED,
+            "audio_ingest_codec": settings.AUDIO_INGEST_CODEC,
+            "gemini_latency": options["gemini_latency"],
+            "repeat": options["repeat"],
+        }
+
+    def print_summary(self, report):
+        self.stdout.write(f"{'sample':>14} {'stage':>13} {'wall s':>9} {'cpu s':>9} {'peak RSS MiB':>13}")
+        for name, stages in report["summary"].items():
+            for stage, metrics in stages.items():
+                self.stdout.write(
+                    f"{name:>14} {stage:>13} {metrics['wall_seconds']:9.2f} {metrics['cpu_seconds']:9.2f} "
+                    f"{metrics['peak_rss_bytes'] / 2 ** 20:13.1f}"
+                )
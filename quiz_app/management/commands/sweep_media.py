@@ -0,0 +1,39 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from quiz_app.api.media_spool import spool
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete orphaned files from the media spool: workspaces of worker processes that no longer run "
+        "and workspaces older than MEDIA_SPOOL_MAX_AGE_SECONDS. Run it from cron, or with --interval."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--max-age", type=int, default=None,
+                            help="Seconds after which any workspace counts as orphaned "
+                                 "(default: MEDIA_SPOOL_MAX_AGE_SECONDS).")
+        parser.add_argument("--interval", type=int, default=0,
+                            help="Sweep again every INTERVAL seconds instead of exiting.")
+        parser.add_argument("--dry-run", action="store_true", help="Only list what would be deleted.")
+
+    def handle(self, *args, **options):
+        while True:
+            self.sweep(options["max_age"], options["dry_run"])
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
+
+    def sweep(self, max_age, dry_run):
+        swept = spool.sweep(max_age=max_age, dry_run=dry_run)
+        for path, size in swept:
+            self.stdout.write(f"{'would delete' if dry_run else 'deleted'} {path} ({size} bytes)")
+
+        freed = sum(size for _, size in swept)
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(swept)} orphaned entries, {freed} bytes {'reclaimable' if dry_run else 'freed'}; "
+            f"{spool.usage()} of {settings.MEDIA_SPOOL_MAX_BYTES} bytes in use in {spool.root}"
+        ))
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0004_quizgenerationjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranscriptCacheEntry',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('extractor', models.CharField(max_length=100)),
+                ('video_id', models.CharField(max_length=200)),
+                ('model_name', models.CharField(max_length=50)),
+                ('language', models.CharField(max_length=20)),
+                ('text', models.TextField()),
+                ('size_bytes', models.PositiveIntegerField(default=0)),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('extractor', 'video_id', 'model_name', 'language'), name='unique_transcript_per_video_model_language')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0005_transcriptcacheentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transcriptcacheentry',
+            name='max_seconds',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0006_transcriptcacheentry_max_seconds'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizGenerationBatch',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('urls', models.JSONField()),
+                ('status', models.CharField(choices=[('expanding', 'Expanding'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='expanding', max_length=20)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='quiz_batches', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='quizgenerationjob',
+            name='batch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='jobs', to='quiz_app.quizgenerationbatch'),
+        ),
+    ]
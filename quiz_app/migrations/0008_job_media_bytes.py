@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0007_quiz_generation_batch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizgenerationjob',
+            name='media_bytes',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='quizgenerationjob',
+            name='media_bytes_saved',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0008_job_media_bytes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizgenerationjob',
+            name='silence_seconds_removed',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0009_job_silence_seconds_removed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizgenerationjob',
+            name='engine',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='quizgenerationjob',
+            name='latency_budget',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='quizgenerationjob',
+            name='requested_language',
+            field=models.CharField(blank=True, max_length=10),
+        ),
+        migrations.AddField(
+            model_name='quizgenerationjob',
+            name='requested_model',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+    ]
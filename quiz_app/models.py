@@ -11,7 +11,18 @@ class Quiz(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     url = models.URLField()
-    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="quizzes")
+    # Indexed by quiz_owner_created_idx, which starts with the owner.
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="quizzes",
+                              db_index=False)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            # The quiz list of a user, newest first (also serves the cursor pagination).
+            models.Index(fields=["owner", "-created_at", "-id"], name="quiz_owner_created_idx"),
+            # The admin list and its date filter, across all users.
+            models.Index(fields=["-created_at", "-id"], name="quiz_created_idx"),
+        ]
 
 class Question(models.Model):
     """
@@ -20,7 +31,106 @@ class Question(models.Model):
     id = models.AutoField(primary_key=True)
     question_title = models.CharField(max_length=200)
     question_options = models.JSONField()
-    quiz = models.ForeignKey(Quiz, related_name="questions", on_delete=models.CASCADE)
+    # Indexed by question_quiz_id_idx, which starts with the quiz.
+    quiz = models.ForeignKey(Quiz, related_name="questions", on_delete=models.CASCADE, db_index=False)
     answer = models.CharField(max_length=200)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
\ No newline at end of file
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Questions are always read per quiz, in the order they were generated.
+        ordering = ["quiz_id", "id"]
+        indexes = [
+            models.Index(fields=["quiz", "id"], name="question_quiz_id_idx"),
+        ]
+
+
+class QuizGenerationJob(models.Model):
+    """
+    Model representing a background job that generates a Quiz from a video URL.
+    """
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        DOWNLOADING = "downloading", "Downloading"
+        TRANSCRIBING = "transcribing", "Transcribing"
+        GENERATING = "generating", "Generating"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    id = models.AutoField(primary_key=True)
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="quiz_jobs")
+    url = models.URLField()
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    error = models.TextField(blank=True)
+    quiz = models.ForeignKey(Quiz, null=True, blank=True, on_delete=models.SET_NULL, related_name="jobs")
+    batch = models.ForeignKey("QuizGenerationBatch", null=True, blank=True, on_delete=models.CASCADE,
+                              related_name="jobs")
+    # Estimated size of the selected media stream and the bytes saved against the largest audio stream.
+    media_bytes = models.BigIntegerField(null=True, blank=True)
+    media_bytes_saved = models.BigIntegerField(null=True, blank=True)
+    # Seconds of silence the voice activity detection cut out before transcription.
+    silence_seconds_removed = models.FloatField(null=True, blank=True)
+    # Transcription options of the request (blank/null = settings) and the engine key the pipeline chose.
+    requested_model = models.CharField(max_length=50, blank=True)
+    requested_language = models.CharField(max_length=10, blank=True)
+    latency_budget = models.FloatField(null=True, blank=True)
+    engine = models.CharField(max_length=50, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.DONE, self.Status.FAILED)
+
+
+class QuizGenerationBatch(models.Model):
+    """
+    Model representing a batch of generation jobs created from a playlist or a list of URLs.
+    """
+    class Status(models.TextChoices):
+        EXPANDING = "expanding", "Expanding"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    id = models.AutoField(primary_key=True)
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="quiz_batches")
+    urls = models.JSONField()
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.EXPANDING)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.DONE, self.Status.FAILED)
+
+
+
+class TranscriptCacheEntry(models.Model):
+    """
+    Model representing a cached Whisper transcript of a video, keyed by the
+    yt-dlp extractor and video id so that different URLs of the same video share it.
+    """
+    id = models.AutoField(primary_key=True)
+    extractor = models.CharField(max_length=100)
+    video_id = models.CharField(max_length=200)
+    model_name = models.CharField(max_length=50)
+    language = models.CharField(max_length=20)
+    text = models.TextField()
+    # Set when only the first `max_seconds` of audio were transcribed (prompt budget mode).
+    max_seconds = models.FloatField(null=True, blank=True)
+    size_bytes = models.PositiveIntegerField(default=0)
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["extractor", "video_id", "model_name", "language"],
+                name="unique_transcript_per_video_model_language",
+            ),
+        ]
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from quiz_app.api.authentication import user_cache
+from quiz_app.api.cache import invalidate_quiz_detail
+from quiz_app.models import Quiz, Question
+
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+def invalidate_quiz(sender, instance, **kwargs):
+    """
+    Drop the cached detail response when a quiz changes or is deleted.
+    """
+    invalidate_quiz_detail(instance.id)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_question_quiz(sender, instance, origin=None, **kwargs):
+    """
+    Drop the cached detail response of the quiz a changed question belongs to.
+    The delete only reaches the cache of this process, so the quiz's `updated_at`
+    (the version of the cached entries) is bumped as well for the other workers.
+    Questions deleted along with their quiz need neither.
+    """
+    if isinstance(origin, Quiz) or getattr(origin, "model", None) is Quiz:
+        return
+    Quiz.objects.filter(pk=instance.quiz_id).update(updated_at=timezone.now())
+    invalidate_quiz_detail(instance.quiz_id)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    Drop a user from the authentication cache when it is saved (e.g. deactivated,
+    new password) or deleted.
+    """
+    user_cache.invalidate(instance.pk)
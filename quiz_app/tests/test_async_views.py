@@ -0,0 +1,131 @@
+"""
+Runs the view tests of the sync API once more against the async views.
+"""
+import asyncio
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import include, path, reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from quiz_app.api.cache import quiz_detail_cache
+from quiz_app.api.urls import quiz_urlpatterns
+from quiz_app.models import Quiz, Question
+from quiz_app.tests import test_quiz, test_quiz_detail_cache, test_quiz_list
+
+User = get_user_model()
+
+urlpatterns = [
+    path("api/", include("auth_app.api.urls")),
+    path("api/", include(quiz_urlpatterns(async_views_enabled=True))),
+]
+
+
+class DataAPIClient(APIClient):
+    """
+    The async views return plain HttpResponses; expose the decoded JSON as `.data` like DRF does.
+    """
+    def request(self, **kwargs):
+        response = super().request(**kwargs)
+        if not hasattr(response, "data"):
+            content_type = response.get("Content-Type", "")
+            response.data = response.json() if content_type.startswith("application/json") else None
+        return response
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncQuizViewsPositiveTest(test_quiz.QuizViewsPositiveTest):
+    client_class = DataAPIClient
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncQuizViewsNegativeTest(test_quiz.QuizViewsNegativeTest):
+    client_class = DataAPIClient
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncQuizListQueryTest(test_quiz_list.QuizListQueryTest):
+    client_class = DataAPIClient
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncQuizDetailCacheTest(test_quiz_detail_cache.QuizDetailCacheTest):
+    client_class = DataAPIClient
+
+
+class CookieClientCsrfTest(TestCase):
+    """
+    Cookie-JWT clients do not send a CSRF token; like DRF's views, the quiz views must not ask for one.
+    """
+    def setUp(self):
+        self.client = APIClient(enforce_csrf_checks=True)
+        self.user = User.objects.create_user(username="testuser", email="test@example.com", password="testpassword123")
+        self.client.cookies["access_token"] = str(AccessToken.for_user(self.user))
+        self.quiz = Quiz.objects.create(title="Quiz", description="", owner=self.user,
+                                        url="https://www.youtube.com/watch?v=abc")
+
+    def test_patch_and_delete(self):
+        url = reverse("my-quizzes", args=[self.quiz.pk])
+
+        self.assertEqual(self.client.patch(url, {"title": "Neu"}, format="json").status_code, 200)
+        self.assertEqual(self.client.delete(url).status_code, 204)
+
+    @override_settings(QUIZ_JOBS_EAGER=True)
+    @patch("quiz_app.api.utils.generate_quiz_data_from_video", return_value={"success": False, "error": "x"})
+    def test_create(self, mock_generate):
+        response = self.client.post(reverse("quiz-list-create"), {"url": "https://www.youtube.com/watch?v=abc"},
+                                    format="json")
+        self.assertEqual(response.status_code, 202)
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncCookieClientCsrfTest(CookieClientCsrfTest):
+    pass
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncClientConcurrencyTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", email="test@example.com", password="testpassword123")
+        self.quiz = quiz = Quiz.objects.create(title="Quiz", description="", owner=self.user,
+                                               url="https://www.youtube.com/watch?v=abc")
+        Question.objects.create(quiz=quiz, question_title="Q1", question_options=["A", "B", "C", "D"], answer="A")
+        self.headers = {"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+
+    async def test_concurrent_requests_on_one_event_loop(self):
+        responses = await asyncio.gather(*[
+            self.async_client.get(reverse("quiz-list"), headers=self.headers) for _ in range(10)
+        ])
+
+        self.assertEqual({response.status_code for response in responses}, {200})
+        self.assertEqual(responses[0].json()[0]["questions"][0]["question_title"], "Q1")
+
+    async def test_detail_cache_is_not_called_on_the_event_loop(self):
+        cache = quiz_detail_cache()
+        await cache.aclear()
+        calls = []
+
+        def record(method):
+            def call(*args, **kwargs):
+                try:
+                    asyncio.get_running_loop()
+                    calls.append((method.__name__, "event loop"))
+                except RuntimeError:
+                    calls.append((method.__name__, "thread"))
+                return method(*args, **kwargs)
+            return call
+
+        with patch.object(cache, "get", record(cache.get)), patch.object(cache, "set", record(cache.set)):
+            for _ in range(2):
+                response = await self.async_client.get(reverse("my-quizzes", args=[self.quiz.pk]),
+                                                       headers=self.headers)
+                self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(calls, [("get", "thread"), ("set", "thread"), ("get", "thread")])
+
+    async def test_wrong_method_is_rejected(self):
+        response = await self.async_client.put(reverse("quiz-list"), headers=self.headers)
+        self.assertEqual(response.status_code, 405)
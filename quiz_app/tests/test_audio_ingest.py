@@ -0,0 +1,103 @@
+from unittest.mock import patch
+
+import yt_dlp
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from quiz_app.api import audio
+from quiz_app.api.jobs import run_job
+from quiz_app.models import QuizGenerationJob
+
+User = get_user_model()
+
+
+def fmt(format_id, abr=None, vcodec="none", acodec="opus", ext="webm", **extra):
+    return {"format_id": format_id, "url": f"https://media.example/{format_id}", "ext": ext,
+            "abr": abr, "vcodec": vcodec, "acodec": acodec, "protocol": "https", **extra}
+
+
+VIDEO = {
+    "id": "abc",
+    "title": "Vortrag",
+    "extractor": "youtube",
+    "extractor_key": "Youtube",
+    "webpage_url": "https://www.youtube.com/watch?v=abc",
+    "duration": 600,
+    "formats": [
+        fmt("249", abr=48),
+        fmt("250", abr=64),
+        fmt("251", abr=128),
+        fmt("139", abr=24, acodec="mp4a.40.5", ext="m4a"),
+        fmt("18", abr=96, vcodec="avc1", acodec="mp4a.40.2", ext="mp4", tbr=500, height=360),
+    ],
+}
+
+
+class FormatSelectionTest(SimpleTestCase):
+
+    def select(self, info):
+        with yt_dlp.YoutubeDL({**settings.YDL_BASE_OPTS, "simulate": True}) as ydl:
+            return ydl.process_ie_result(dict(info), download=False)
+
+    def test_smallest_audio_stream_above_the_speech_minimum(self):
+        self.assertEqual(self.select(VIDEO)["format_id"], "249")
+
+    def test_falls_back_to_the_smallest_video(self):
+        info = {**VIDEO, "formats": [
+            fmt("22", abr=192, vcodec="avc1", acodec="mp4a", ext="mp4", tbr=2000, height=720),
+            fmt("18", abr=96, vcodec="avc1", acodec="mp4a", ext="mp4", tbr=500, height=360),
+        ]}
+        self.assertEqual(self.select(info)["format_id"], "18")
+
+    def test_savings_against_the_largest_audio_stream(self):
+        savings = audio.media_savings(self.select(VIDEO))
+
+        self.assertEqual(savings["format_id"], "249")
+        self.assertEqual(savings["bytes"], 48 * 1000 // 8 * 600)
+        self.assertEqual(savings["baseline_bytes"], 128 * 1000 // 8 * 600)
+        self.assertEqual(savings["bytes_saved"], 80 * 1000 // 8 * 600)
+
+    def test_savings_are_scaled_to_the_downloaded_range(self):
+        savings = audio.media_savings(self.select(VIDEO), max_seconds=300)
+        self.assertEqual(savings["bytes"], 48 * 1000 // 8 * 300)
+
+    def test_unknown_sizes(self):
+        self.assertIsNone(audio.media_savings({"formats": [], "format_id": "x"}))
+
+
+class SpeechAudioPPTest(SimpleTestCase):
+
+    @patch.object(audio.SpeechAudioPP, "run_ffmpeg")
+    def test_converts_to_16khz_mono(self, mock_ffmpeg):
+        files_to_delete, info = audio.SpeechAudioPP(codec="opus").run({"filepath": "/tmp/a.webm", "ext": "webm"})
+
+        path, new_path, args = mock_ffmpeg.call_args.args
+        self.assertEqual((path, new_path), ("/tmp/a.webm", "/tmp/a.opus"))
+        self.assertEqual(args[:5], ["-vn", "-ac", "1", "-ar", "16000"])
+        self.assertEqual(files_to_delete, ["/tmp/a.webm"])
+        self.assertEqual((info["filepath"], info["ext"]), ("/tmp/a.opus", "opus"))
+
+    @patch.object(audio.SpeechAudioPP, "run_ffmpeg")
+    def test_same_extension_gets_a_new_name(self, mock_ffmpeg):
+        _, info = audio.SpeechAudioPP(codec="wav").run({"filepath": "/tmp/a.wav", "ext": "wav"})
+        self.assertEqual(info["filepath"], "/tmp/a.16k.wav")
+        self.assertIn("pcm_s16le", mock_ffmpeg.call_args.args[2])
+
+
+class JobMediaBytesTest(TestCase):
+
+    @patch("quiz_app.api.utils.generate_quiz_data_from_video")
+    def test_job_records_bytes_saved(self, mock_generate):
+        def fake_pipeline(url, on_stage, on_progress):
+            on_progress("media", format_id="249", abr=48, bytes=1000, baseline_bytes=4000, bytes_saved=3000)
+            return {"success": False, "error": "Empty or failed transcript"}
+
+        mock_generate.side_effect = fake_pipeline
+        user = User.objects.create_user(username="testuser", password="testpassword123")
+        job = QuizGenerationJob.objects.create(owner=user, url="https://www.youtube.com/watch?v=abc")
+
+        run_job(job.id)
+        job.refresh_from_db()
+
+        self.assertEqual((job.media_bytes, job.media_bytes_saved), (1000, 3000))
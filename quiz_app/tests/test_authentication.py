@@ -0,0 +1,51 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from quiz_app.api.authentication import user_cache
+
+User = get_user_model()
+
+
+class CookieJWTUserCacheTest(APITestCase):
+
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user(username="testuser", email="test@example.com", password="testpassword123")
+        self.client.cookies["access_token"] = str(AccessToken.for_user(self.user))
+        self.list_url = reverse("quiz-list")
+
+    def test_user_is_loaded_once(self):
+        with self.assertNumQueries(2):
+            self.client.get(self.list_url)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(user_cache.stats(), {"hits": 1, "misses": 1, "size": 1})
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(self.list_url)
+
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_invalidates_cache(self):
+        self.client.get(self.list_url)
+        self.user.set_password("newpassword123")
+        self.user.save()
+
+        with self.assertNumQueries(2):
+            self.client.get(self.list_url)
+        self.assertEqual(user_cache.stats()["misses"], 2)
+
+    def test_cached_user_is_a_copy(self):
+        self.client.get(self.list_url)
+        first = user_cache.get(self.user.pk)
+        first.username = "changed"
+        self.assertEqual(user_cache.get(self.user.pk).username, "testuser")
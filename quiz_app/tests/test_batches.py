@@ -0,0 +1,194 @@
+import threading
+import time
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quiz_app.api import jobs, utils
+from quiz_app.models import Quiz, QuizGenerationBatch, QuizGenerationJob
+
+User = get_user_model()
+
+QUIZ_DATA = {
+    "title": "Quiz",
+    "description": "Beschreibung",
+    "questions": [{"question_title": "Q1", "question_options": ["A", "B", "C", "D"], "answer": "A"}],
+}
+
+
+class ExpandVideoUrlsTest(SimpleTestCase):
+
+    @patch("quiz_app.api.utils.yt_dlp.YoutubeDL")
+    def test_playlists_are_expanded_and_duplicates_dropped(self, mock_ydl):
+        results = {
+            "https://www.youtube.com/playlist?list=PL1": {
+                "_type": "playlist",
+                "entries": [{"url": "https://www.youtube.com/watch?v=a"}, {"url": "https://www.youtube.com/watch?v=b"}],
+            },
+            "https://www.youtube.com/watch?v=b": {"id": "b"},
+        }
+
+        def extract_info(url, download, process):
+            if url not in results:
+                raise ValueError("Unsupported URL")
+            return results[url]
+
+        mock_ydl.return_value.__enter__.return_value.extract_info.side_effect = extract_info
+
+        result = utils.expand_video_urls(
+            ["https://www.youtube.com/playlist?list=PL1", "https://www.youtube.com/watch?v=b", "https://example.com/x"],
+            limit=10,
+        )
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["urls"], ["https://www.youtube.com/watch?v=a", "https://www.youtube.com/watch?v=b"])
+        self.assertEqual(result["errors"], {"https://example.com/x": "Unsupported URL"})
+        self.assertFalse(mock_ydl.call_args.args[0]["noplaylist"])
+
+    @patch("quiz_app.api.utils.yt_dlp.YoutubeDL")
+    def test_limit(self, mock_ydl):
+        mock_ydl.return_value.__enter__.return_value.extract_info.return_value = {
+            "_type": "playlist", "entries": [{"url": f"https://www.youtube.com/watch?v={i}"} for i in range(10)],
+        }
+        result = utils.expand_video_urls(["https://www.youtube.com/playlist?list=PL1"], limit=3)
+        self.assertEqual(len(result["urls"]), 3)
+
+
+@override_settings(QUIZ_JOBS_EAGER=True)
+class QuizBatchViewTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", email="test@example.com", password="testpassword123")
+        self.other_user = User.objects.create_user(username="otheruser", email="other@example.com", password="otherpassword")
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("quiz-batch-create")
+
+    @patch("quiz_app.api.utils.generate_quiz_data_from_video")
+    @patch("quiz_app.api.utils.expand_video_urls")
+    def test_batch_reports_every_item(self, mock_expand, mock_generate):
+        urls = [f"https://www.youtube.com/watch?v={i}" for i in range(3)]
+        mock_expand.return_value = {"success": True, "urls": urls, "errors": {}}
+        mock_generate.side_effect = lambda url, **kwargs: (
+            {"success": False, "error": "Empty or failed transcript"} if url.endswith("1")
+            else {"success": True, "data": QUIZ_DATA}
+        )
+
+        response = self.client.post(self.url, {"url": "https://www.youtube.com/playlist?list=PL1"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response["Location"], response.data["status_url"])
+        detail = self.client.get(response.data["status_url"]).data
+        self.assertEqual(detail["status"], "done")
+        self.assertEqual(detail["counts"], {"total": 3, "done": 2, "failed": 1, "pending": 0})
+        self.assertEqual([job["url"] for job in detail["jobs"]], urls)
+        self.assertEqual(detail["jobs"][1]["error"], "Empty or failed transcript")
+        self.assertEqual(Quiz.objects.filter(owner=self.user).count(), 2)
+
+    @patch("quiz_app.api.utils.expand_video_urls", return_value={"success": False, "error": "No videos found."})
+    def test_batch_without_videos_fails(self, mock_expand):
+        response = self.client.post(self.url, {"urls": ["https://example.com/a"]}, format="json")
+
+        self.assertEqual(response.data["status"], "failed")
+        self.assertEqual(response.data["error"], "No videos found.")
+
+    def test_validation(self):
+        self.assertEqual(self.client.post(self.url, {}, format="json").status_code, status.HTTP_400_BAD_REQUEST)
+        with override_settings(QUIZ_BATCH_MAX_URLS=2):
+            response = self.client.post(self.url, {"urls": [f"https://a.de/{i}" for i in range(3)]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_is_owner_only(self):
+        batch = QuizGenerationBatch.objects.create(owner=self.user, urls=["https://a.de/1"])
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.get(reverse("quiz-batch-detail", args=[batch.pk]))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_batch_finishing_on_two_threads_is_published_once(self):
+        batch = QuizGenerationBatch.objects.create(owner=self.user, urls=["https://a.de/1", "https://a.de/2"])
+        QuizGenerationJob.objects.bulk_create([
+            QuizGenerationJob(owner=self.user, url=url, batch=batch, status=QuizGenerationJob.Status.DONE,
+                              finished_at=batch.created_at)
+            for url in batch.urls
+        ])
+        # Both threads saw no unfinished job and loaded the batch before either closed it.
+        first, second = (QuizGenerationBatch.objects.get(pk=batch.pk) for _ in range(2))
+
+        with patch.object(jobs.broker, "publish") as mock_publish:
+            jobs._finish_batch(first, QuizGenerationBatch.Status.DONE)
+            jobs._finish_batch(second, QuizGenerationBatch.Status.DONE)
+
+        self.assertEqual([call.args[1] for call in mock_publish.call_args_list], ["done"])
+        batch.refresh_from_db()
+        self.assertEqual(batch.status, QuizGenerationBatch.Status.DONE)
+        self.assertIsNotNone(batch.finished_at)
+
+
+@override_settings(QUIZ_DOWNLOAD_WORKERS=4, QUIZ_TRANSCRIBE_WORKERS=1, QUIZ_GENERATE_WORKERS=4)
+class StagedPipelineTest(TransactionTestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpassword123")
+        patcher = patch.dict(jobs._executors, clear=True)
+        patcher.start()
+        self.addCleanup(self.shutdown_executors)
+        self.addCleanup(patcher.stop)
+
+    def shutdown_executors(self):
+        for executor in jobs._executors.values():
+            executor.shutdown(wait=True)
+
+    def test_downloads_overlap_while_transcription_is_bounded(self):
+        active = {"download": 0, "transcribe": 0}
+        peak = {"download": 0, "transcribe": 0}
+        lock = threading.Lock()
+        # The in-memory test database reports concurrent writers as "table is locked" at once:
+        # workers touch the database one at a time and only the (fake) stage work overlaps.
+        database = threading.Lock()
+        run_in_worker = jobs._run_in_worker
+
+        def serialized(func, *args):
+            with database:
+                run_in_worker(func, *args)
+
+        def stage(name, seconds, result):
+            def run(*args, **kwargs):
+                database.release()
+                try:
+                    with lock:
+                        active[name] += 1
+                        peak[name] = max(peak[name], active[name])
+                    time.sleep(seconds)
+                    with lock:
+                        active[name] -= 1
+                finally:
+                    database.acquire()
+                return result
+            return run
+
+        def finished():
+            with database:
+                return QuizGenerationBatch.objects.get(pk=batch.pk).is_finished
+
+        batch = QuizGenerationBatch.objects.create(owner=self.user, urls=["https://www.youtube.com/playlist?list=PL1"])
+        urls = [f"https://www.youtube.com/watch?v={i}" for i in range(4)]
+        with patch.object(jobs, "_run_in_worker", side_effect=serialized), \
+             patch.object(utils, "expand_video_urls", return_value={"success": True, "urls": urls, "errors": {}}), \
+             patch.object(utils, "prepare_media", side_effect=stage("download", 0.3, {"success": True})), \
+             patch.object(utils, "transcribe_media", side_effect=stage("transcribe", 0.05, {"success": True, "text": "x"})), \
+             patch.object(utils, "generate_quiz_data_from_transcript", return_value={"success": True, "data": QUIZ_DATA}):
+            started = time.monotonic()
+            serialized(jobs.run_batch, batch.pk)
+            while not finished() and time.monotonic() - started < 10:
+                time.sleep(0.02)
+            elapsed = time.monotonic() - started
+            self.shutdown_executors()
+
+        self.assertEqual(QuizGenerationBatch.objects.get(pk=batch.pk).status, "done")
+        self.assertEqual(QuizGenerationJob.objects.filter(batch=batch, status="done").count(), 4)
+        self.assertEqual(peak, {"download": 4, "transcribe": 1})
+        # Four 0.3 s downloads side by side, not one after another.
+        self.assertLess(elapsed, 1.0)
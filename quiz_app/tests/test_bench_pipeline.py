@@ -0,0 +1,106 @@
+import io
+import json
+import os
+import tempfile
+import urllib.request
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from quiz_app.api import utils, vad
+from quiz_app.bench.fake_media import LocalMediaServer, write_sample
+from quiz_app.management.commands.bench_pipeline import StageMeter
+
+
+class FakeMediaTest(SimpleTestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = tmp.name
+        write_sample(os.path.join(self.directory, "talk.wav"), 20)
+
+    def test_sample_has_speech_and_pauses(self):
+        _, speech_map, stats = vad.trim_silence(vad.read_wav(os.path.join(self.directory, "talk.wav")))
+
+        self.assertEqual(stats["audio_seconds"], 20.0)
+        self.assertGreater(len(speech_map.regions), 1)
+        self.assertGreater(stats["removed_seconds"], 0)
+        self.assertGreater(stats["speech_seconds"], 10)
+
+    def test_extractor_serves_local_files(self):
+        with LocalMediaServer(self.directory) as server, \
+                patch("quiz_app.api.utils.yt_dlp.YoutubeDL", server.youtube_dl_class()):
+            result = utils.extract_video_info("bench://talk")
+            missing = utils.extract_video_info("bench://other")
+
+            info = result["info"]
+            with urllib.request.urlopen(info["url"]) as response:
+                data = response.read()
+
+        self.assertTrue(result["success"])
+        self.assertEqual((info["extractor_key"], info["id"], info["duration"]), ("LocalMedia", "talk", 20.0))
+        self.assertEqual(len(data), os.path.getsize(os.path.join(self.directory, "talk.wav")))
+        self.assertFalse(missing["success"])
+
+
+class StageMeterTest(SimpleTestCase):
+
+    def test_measures_wall_and_cpu_time(self):
+        def busy():
+            total = 0
+            for i in range(2 * 10 ** 6):
+                total += i
+            return total
+
+        result, metrics = StageMeter().measure(busy)
+
+        self.assertEqual(result, sum(range(2 * 10 ** 6)))
+        self.assertGreater(metrics["wall_seconds"], 0)
+        self.assertGreater(metrics["cpu_seconds"], 0)
+        self.assertGreater(metrics["peak_rss_bytes"], 10 * 2 ** 20)
+
+
+@override_settings(TRANSCRIPTION_WORKERS=2, TRANSCRIPT_CACHE_ENABLED=True)
+class BenchPipelineCommandTest(TestCase):
+
+    @patch("quiz_app.api.utils.transcribe_media")
+    def test_report(self, mock_transcribe):
+        mock_transcribe.return_value = {"success": True, "text": "Hallo Welt"}
+        out = io.StringIO()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "report.json")
+            call_command("bench_pipeline", "--lengths", "5,12", "--repeat", "2", "--no-warm-up",
+                         "--output", output, stdout=out, stderr=io.StringIO())
+            with open(output) as f:
+                report = json.load(f)
+
+        self.assertEqual([(run["sample"], run["audio_seconds"]) for run in report["runs"]],
+                         [("speech-5s", 5.0), ("speech-5s", 5.0), ("speech-12s", 12.0), ("speech-12s", 12.0)])
+        run = report["runs"][0]
+        self.assertTrue(run["success"], run["error"])
+        self.assertEqual(set(run["stages"]), {"download", "transcription", "generation", "total"})
+        self.assertEqual(set(run["stages"]["total"]), {"wall_seconds", "cpu_seconds", "peak_rss_bytes"})
+        self.assertEqual(run["events"]["engine"]["engine"], report["environment"]["engine"])
+        self.assertFalse(run["placeholder_transcript"])
+        self.assertEqual(set(report["summary"]), {"speech-5s", "speech-12s"})
+        self.assertIn("speech-12s", out.getvalue())
+
+        # Every run transcribed its own media: the transcript cache is off during the benchmark.
+        self.assertEqual(mock_transcribe.call_count, 4)
+        self.assertEqual(mock_transcribe.call_args.args[0]["info"]["duration"], 12.0)
+
+    @patch("quiz_app.api.utils.transcribe_media", return_value={"success": False, "error": "Empty or failed transcript"})
+    def test_generation_is_measured_without_a_transcript(self, mock_transcribe):
+        out = io.StringIO()
+        call_command("bench_pipeline", "--lengths", "3", "--repeat", "1", "--no-warm-up", "--output", "-",
+                     stdout=out, stderr=io.StringIO())
+        report = json.loads(out.getvalue()[out.getvalue().index("{"):])
+
+        run = report["runs"][0]
+        self.assertTrue(run["success"])
+        self.assertTrue(run["placeholder_transcript"])
+        self.assertEqual(run["transcription_error"], "Empty or failed transcript")
+        self.assertIn("generation", run["stages"])
@@ -0,0 +1,192 @@
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from quiz_app.api import chunked_transcription, utils
+from quiz_app.tests.test_media_spool import use_temporary_spool
+
+
+def fake_transcribe_segment(path, language):
+    """
+    Finish later segments first to prove the texts are joined in segment order.
+    """
+    index = int(os.path.basename(path).split("_")[1].split(".")[0])
+    time.sleep(0.01 * (3 - index))
+    return {"text": f"text{index}", "audio_seconds": None, "speech_seconds": None}
+
+
+class ChunkedTranscriptionTest(SimpleTestCase):
+
+    def setUp(self):
+        self.spool = use_temporary_spool(self)
+        self.pool = ThreadPoolExecutor(max_workers=3)
+        self.addCleanup(self.pool.shutdown)
+        pools = patch.dict(chunked_transcription._pools, clear=True)
+        pools.start()
+        self.addCleanup(pools.stop)
+
+    def test_read_segment_list(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, "segments.csv")
+            self.assertEqual(chunked_transcription._read_segment_list(path), [])
+
+            with open(path, "w") as f:
+                f.write("segment_00000.wav,0.000000,120.000000\nsegment_00001.wav,120.000000,240.000000\n")
+            self.assertEqual(
+                chunked_transcription._read_segment_list(path),
+                ["segment_00000.wav", "segment_00001.wav"],
+            )
+
+    def test_segments_are_joined_in_order(self):
+        def fake_segments(source, workdir, chunk_seconds, headers=None, max_seconds=None):
+            for i in range(3):
+                yield os.path.join(workdir, f"segment_{i:05d}.wav")
+
+        seen = []
+        with patch.object(chunked_transcription, "_new_pool", return_value=self.pool), \
+                patch.object(chunked_transcription, "iter_segments", side_effect=fake_segments), \
+                patch.object(chunked_transcription, "_transcribe_segment", side_effect=fake_transcribe_segment):
+            text = chunked_transcription.transcribe_stream("https://media.example/a.m4a", on_segment=seen.append)
+
+        self.assertEqual(text, "text0 text1 text2")
+        self.assertEqual(seen, [0, 1, 2])
+
+    def test_decoding_stops_once_char_budget_is_reached(self):
+        produced = []
+
+        def fake_segments(source, workdir, chunk_seconds, headers=None, max_seconds=None):
+            try:
+                for i in range(10):
+                    produced.append(i)
+                    yield os.path.join(workdir, f"segment_{i:05d}.wav")
+                    time.sleep(0.05)
+            finally:
+                produced.append("closed")
+
+        with patch.object(chunked_transcription, "_new_pool", return_value=self.pool), \
+                patch.object(chunked_transcription, "iter_segments", side_effect=fake_segments), \
+                patch.object(chunked_transcription, "_transcribe_segment",
+                             return_value={"text": "x" * 40, "audio_seconds": None, "speech_seconds": None}):
+            text = chunked_transcription.transcribe_stream("a.m4a", max_seconds=600, max_chars=100)
+
+        self.assertEqual(text, " ".join(["x" * 40] * 3))
+        self.assertEqual(produced[-1], "closed")
+        self.assertLess(len(produced), 10)
+
+    def test_media_source_from_info(self):
+        info = {"url": "https://media.example/a.m4a", "http_headers": {"User-Agent": "x"}}
+        self.assertEqual(
+            chunked_transcription.media_source_from_info(info),
+            ("https://media.example/a.m4a", {"User-Agent": "x"}),
+        )
+        merged = {**info, "requested_formats": [{}, {}]}
+        self.assertEqual(chunked_transcription.media_source_from_info(merged), (None, None))
+
+    def test_merged_formats_are_downloaded_first_and_removed(self):
+        lease = self.spool.allocate("test")
+        audio_path = lease.file("a.opus")
+        open(audio_path, "wb").close()
+
+        with patch.object(utils, "download_audio_from_url",
+                          return_value={"success": True, "filepath": audio_path, "lease": lease}), \
+                patch.object(chunked_transcription, "transcribe_stream", return_value="Hallo") as mock_stream:
+            result = utils.run_chunked_transcription("https://youtu.be/x", {"requested_formats": [{}, {}]})
+
+        self.assertEqual(result, {"success": True, "text": "Hallo"})
+        self.assertEqual(mock_stream.call_args.args[0], audio_path)
+        self.assertFalse(os.path.exists(audio_path))
+
+
+@override_settings(TRANSCRIPTION_MAX_POOLS=2, WHISPER_MODEL_IDLE_TIMEOUT=60)
+class PoolLimitTest(SimpleTestCase):
+    """
+    Every engine gets its own worker pool; they must not pile up.
+    """
+    def setUp(self):
+        pools = patch.dict(chunked_transcription._pools, clear=True)
+        pools.start()
+        self.addCleanup(pools.stop)
+        self.created = {}
+        patcher = patch.object(chunked_transcription, "_new_pool", side_effect=self.new_pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        reaper = patch.object(chunked_transcription, "_ensure_reaper")
+        reaper.start()
+        self.addCleanup(reaper.stop)
+
+    def new_pool(self, model_name):
+        self.created[model_name] = pool = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(pool.shutdown)
+        return pool
+
+    def use(self, *names):
+        for name in names:
+            with chunked_transcription.use_pool(name):
+                pass
+
+    def test_pools_are_reused(self):
+        with chunked_transcription.use_pool("small") as first:
+            pass
+        with chunked_transcription.use_pool("small") as second:
+            pass
+        self.assertIs(first, second)
+
+    def test_least_recently_used_idle_pool_is_shut_down(self):
+        self.use("small", "tiny", "small", "base")
+
+        self.assertEqual(chunked_transcription.pool_keys(), ["small", "base"])
+        self.assertTrue(self.created["tiny"]._shutdown)
+        self.assertFalse(self.created["small"]._shutdown)
+
+    def test_pools_in_use_are_kept(self):
+        with chunked_transcription.use_pool("small"), chunked_transcription.use_pool("tiny"):
+            self.use("base")
+            self.assertEqual(chunked_transcription.pool_keys(), ["small", "tiny"])
+            with chunked_transcription.use_pool("medium"):
+                self.assertEqual(chunked_transcription.pool_keys(), ["small", "tiny", "medium"])
+            # Over the limit while all of them are busy: the first one released goes.
+            self.assertEqual(chunked_transcription.pool_keys(), ["small", "tiny"])
+            self.assertTrue(self.created["medium"]._shutdown)
+        self.assertEqual(chunked_transcription.pool_keys(), ["tiny", "small"])
+
+    def test_idle_pools_are_shut_down(self):
+        self.use("small")
+        with chunked_transcription.use_pool("tiny"):
+            evicted = chunked_transcription.evict_idle_pools(now=time.monotonic() + 120)
+
+        self.assertEqual(evicted, ["small"])
+        self.assertEqual(chunked_transcription.pool_keys(), ["tiny"])
+        self.assertTrue(self.created["small"]._shutdown)
+
+
+@override_settings(TRANSCRIBE_WITHIN_PROMPT_BUDGET=True, GEMINI_TRANSCRIPT_CHAR_LIMIT=12000,
+                   TRANSCRIPT_CHARS_PER_SECOND=15, TRANSCRIPT_BUDGET_MARGIN=1.25)
+class PromptBudgetTest(SimpleTestCase):
+
+    def setUp(self):
+        use_temporary_spool(self)
+
+    def test_budget_for_long_video(self):
+        self.assertEqual(utils.transcription_budget_seconds({"duration": 3600}), 1000)
+
+    def test_short_video_is_transcribed_completely(self):
+        self.assertIsNone(utils.transcription_budget_seconds({"duration": 600}))
+
+    @override_settings(TRANSCRIBE_WITHIN_PROMPT_BUDGET=False)
+    def test_budget_mode_off(self):
+        self.assertIsNone(utils.transcription_budget_seconds({"duration": 3600}))
+
+    @patch("quiz_app.api.utils.yt_dlp.YoutubeDL")
+    def test_download_requests_only_the_budgeted_range(self, mock_ydl):
+        ydl = mock_ydl.return_value.__enter__.return_value
+        ydl.prepare_filename.return_value = "quiz_temp_x.m4a"
+
+        result = utils.download_audio_from_url("https://youtu.be/x", info={"id": "x"}, max_seconds=1000)
+        result["lease"].release()
+
+        ranges = mock_ydl.call_args.args[0]["download_ranges"]
+        self.assertEqual(list(ranges({}, None)), [{"start_time": 0, "end_time": 1000}])
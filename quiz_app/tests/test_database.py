@@ -0,0 +1,95 @@
+import io
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connections
+from django.db.utils import load_backend
+from django.test import SimpleTestCase, TransactionTestCase
+
+from core.database import database_settings, sqlite_database, sqlite_pragmas
+
+
+class DatabaseSettingsTest(SimpleTestCase):
+
+    def test_sqlite_profile_is_the_default(self):
+        database = database_settings(Path("/srv/app"), env={})["default"]
+
+        self.assertEqual(database["ENGINE"], "django.db.backends.sqlite3")
+        self.assertEqual(database["NAME"], "/srv/app/db.sqlite3")
+        self.assertEqual(database["CONN_MAX_AGE"], 60)
+        self.assertTrue(database["CONN_HEALTH_CHECKS"])
+        self.assertEqual(database["OPTIONS"]["transaction_mode"], "IMMEDIATE")
+        self.assertEqual(database["OPTIONS"]["timeout"], 20.0)
+        self.assertIn("PRAGMA journal_mode=WAL", database["OPTIONS"]["init_command"])
+        self.assertIn("PRAGMA busy_timeout=20000", database["OPTIONS"]["init_command"])
+
+    def test_environment_overrides_pragmas(self):
+        pragmas = sqlite_pragmas({"SQLITE_SYNCHRONOUS": "FULL", "SQLITE_BUSY_TIMEOUT_SECONDS": "2.5",
+                                  "SQLITE_CACHE_SIZE": "-2000"})
+        database = database_settings(Path("/srv/app"), env={"DB_NAME": "/data/quiz.db", "DB_CONN_MAX_AGE": "0"})
+
+        self.assertIn("PRAGMA synchronous=FULL", pragmas)
+        self.assertIn("PRAGMA busy_timeout=2500", pragmas)
+        self.assertIn("PRAGMA cache_size=-2000", pragmas)
+        self.assertEqual(database["default"]["NAME"], "/data/quiz.db")
+        self.assertEqual(database["default"]["CONN_MAX_AGE"], 0)
+
+    def test_postgres_profile_pools_connections(self):
+        env = {"DB_ENGINE": "postgres", "DB_NAME": "quiz", "DB_HOST": "db", "DB_POOL_MAX_SIZE": "20"}
+        database = database_settings(Path("/srv/app"), env=env)["default"]
+        unpooled = database_settings(Path("/srv/app"), env={**env, "DB_POOL": "False"})["default"]
+
+        self.assertEqual(database["ENGINE"], "django.db.backends.postgresql")
+        self.assertEqual(database["HOST"], "db")
+        self.assertEqual(database["CONN_MAX_AGE"], 0)
+        self.assertEqual(database["OPTIONS"]["pool"]["max_size"], 20)
+        self.assertNotIn("pool", unpooled["OPTIONS"])
+        self.assertEqual(unpooled["CONN_MAX_AGE"], 60)
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            database_settings(Path("/srv/app"), env={"DB_ENGINE": "oracle"})
+
+
+class SqlitePragmaTest(SimpleTestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "quiz.sqlite3")
+
+    def test_pragmas_are_applied_on_connect(self):
+        database = connections.configure_settings(
+            {"default": connections.settings["default"], "pragma_test": sqlite_database(self.path, env={})})
+        backend = load_backend(database["pragma_test"]["ENGINE"])
+        connection = backend.DatabaseWrapper(database["pragma_test"], "pragma_test")
+        self.addCleanup(connection.close)
+
+        with connection.cursor() as cursor:
+            values = {}
+            for pragma in ("journal_mode", "synchronous", "busy_timeout", "cache_size"):
+                cursor.execute(f"PRAGMA {pragma}")
+                values[pragma] = cursor.fetchone()[0]
+
+        self.assertEqual(values, {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 20000,
+                                  "cache_size": -65536})
+        # WAL is a property of the file, other connections see it as well.
+        with sqlite3.connect(self.path) as other:
+            self.assertEqual(other.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+
+class BenchDbContentionTest(TransactionTestCase):
+
+    def test_command_compares_baseline_and_tuned_sqlite(self):
+        out = io.StringIO()
+        # The command registers its temporary databases itself.
+        with patch.object(type(self), "databases", {*self.databases, "bench_baseline", "bench_tuned"}):
+            call_command("bench_db_contention", readers=2, writers=1, seconds=0.3, stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual([line.split(":")[0].strip() for line in lines], ["baseline", "tuned"])
+        self.assertIn('0 "database is locked" errors', lines[1])
@@ -0,0 +1,208 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import torch
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quiz_app.api import chunked_transcription, engines, utils
+from quiz_app.api.engines import EngineConfig
+from quiz_app.api.whisper_registry import WhisperModelRegistry
+from quiz_app.models import QuizGenerationJob
+from quiz_app.tests.test_media_spool import use_temporary_spool
+
+User = get_user_model()
+
+SPEEDS = {"tiny": 8.0, "base": 4.0, "small": 1.5, "medium": 0.5}
+
+
+class EngineConfigTest(SimpleTestCase):
+
+    def test_keys(self):
+        self.assertEqual(EngineConfig("small").key, "small")
+        self.assertEqual(EngineConfig("small", precision="int8").key, "small-int8")
+        self.assertEqual(EngineConfig("base", backend="other").key, "other:base")
+
+    def test_from_key(self):
+        for key in ("small", "small-int8", "large-v3", "large-v3-int8", "other:base-int8"):
+            self.assertEqual(EngineConfig.from_key(key).key, key)
+
+        config = EngineConfig.from_key("large-v3-int8")
+        self.assertEqual((config.model, config.precision, config.backend), ("large-v3", "int8", "whisper"))
+
+    def test_unknown_precision(self):
+        with self.assertRaises(ValueError):
+            EngineConfig("small", precision="fp16")
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            engines.load_engine("other:small")
+
+    def test_registry_loads_registered_backends(self):
+        class FakeEngine(engines.TranscriptionEngine):
+            def transcribe(self, audio, language=None, **options):
+                return {"text": f"{self.config.model} {language}", "language": language}
+
+        registry = WhisperModelRegistry(idle_timeout=0)
+        with patch.dict(engines.BACKENDS, {"fake": FakeEngine}):
+            with registry.use("fake:tiny-int8") as engine:
+                self.assertEqual(engine.config.precision, "int8")
+                self.assertEqual(engine.transcribe("a.wav", language="de")["text"], "tiny de")
+
+
+@override_settings(TRANSCRIPTION_MODELS=["tiny", "base", "small", "medium"], WHISPER_MODEL_SPEED=SPEEDS,
+                   WHISPER_INT8_SPEEDUP=2.0, WHISPER_PRECISION="fp32", TRANSCRIPTION_WORKERS=2,
+                   WHISPER_DEFAULT_MODEL="small", TRANSCRIPTION_BACKEND="whisper", WHISPER_LANGUAGE="de")
+class SelectEngineTest(SimpleTestCase):
+
+    def test_default_without_budget(self):
+        self.assertEqual(engines.select_engine(600).key, "small")
+
+    def test_requested_model_wins(self):
+        self.assertEqual(engines.select_engine(600, model="medium", latency_budget=1).key, "medium")
+
+    def test_most_accurate_model_within_the_budget(self):
+        # 600 s of audio on two workers: tiny 37.5 s, base 75 s, small 200 s, medium 600 s.
+        self.assertEqual(engines.select_engine(600, latency_budget=100).key, "base")
+        self.assertEqual(engines.select_engine(600, latency_budget=600).key, "medium")
+
+    def test_fastest_model_if_nothing_fits(self):
+        self.assertEqual(engines.select_engine(600, latency_budget=5).key, "tiny")
+
+    @override_settings(TRANSCRIPTION_MODELS=["tiny", "base", "small", "medium", "large-v3"])
+    def test_models_without_a_speed_count_as_the_slowest(self):
+        self.assertEqual(engines.estimate_seconds(engines.EngineConfig("large-v3"), 600), 600)
+        self.assertEqual(engines.select_engine(600, latency_budget=600).key, "large-v3")
+        self.assertEqual(engines.select_engine(600, latency_budget=300).key, "small")
+
+    @override_settings(WHISPER_PRECISION="int8")
+    def test_quantized_models_fit_more(self):
+        self.assertEqual(engines.select_engine(600, latency_budget=100).key, "small-int8")
+
+    def test_language(self):
+        self.assertEqual(engines.select_engine(600).language, "de")
+        self.assertTrue(engines.select_engine(600, language="auto").detect_language)
+
+
+class QuantizeTest(SimpleTestCase):
+
+    def test_whisper_linear_layers_are_quantized(self):
+        from whisper.model import Linear
+
+        torch.manual_seed(0)
+        model = torch.nn.Sequential(Linear(64, 64), torch.nn.GELU(), Linear(64, 8)).eval()
+        x = torch.randn(4, 64)
+        with torch.no_grad():
+            expected = model(x)
+            quantized = engines.quantize_int8(model)
+            actual = quantized(x)
+
+        self.assertIsInstance(quantized[0], torch.ao.nn.quantized.dynamic.Linear)
+        self.assertIsInstance(quantized[2], torch.ao.nn.quantized.dynamic.Linear)
+        self.assertLess((actual - expected).abs().max().item(), 0.05)
+
+
+class LanguageDetectionTest(SimpleTestCase):
+
+    def setUp(self):
+        use_temporary_spool(self)
+        self.pool = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(self.pool.shutdown)
+        pools = patch.dict(chunked_transcription._pools, clear=True)
+        pools.start()
+        self.addCleanup(pools.stop)
+
+    def test_language_is_detected_once_on_the_first_segment(self):
+        def fake_segments(source, workdir, chunk_seconds, headers=None, max_seconds=None):
+            for i in range(3):
+                yield os.path.join(workdir, f"segment_{i:05d}.wav")
+
+        languages = []
+
+        def fake_transcribe(path, language):
+            languages.append(language)
+            return {"text": "hello", "audio_seconds": None, "speech_seconds": None}
+
+        with patch.object(chunked_transcription, "_new_pool", return_value=self.pool), \
+                patch.object(chunked_transcription, "iter_segments", side_effect=fake_segments), \
+                patch.object(chunked_transcription, "_detect_language", return_value="en") as mock_detect, \
+                patch.object(chunked_transcription, "_transcribe_segment", side_effect=fake_transcribe):
+            chunked_transcription.transcribe_stream("a.m4a", model_name="tiny", language="auto")
+
+        mock_detect.assert_called_once()
+        self.assertTrue(mock_detect.call_args.args[0].endswith("segment_00000.wav"))
+        self.assertEqual(languages, ["en", "en", "en"])
+
+    @override_settings(VAD_ENABLED=False)
+    def test_whole_file_transcription_lets_whisper_detect(self):
+        model = MagicMock()
+        model.transcribe.return_value = {"text": "hello"}
+        registry = WhisperModelRegistry(loader=MagicMock(return_value=model), idle_timeout=0)
+
+        with patch.object(utils, "whisper_registry", registry):
+            utils.run_whisper_transcription("a.opus", engine=EngineConfig("base", precision="int8", language="auto"))
+
+        self.assertIsNone(model.transcribe.call_args.kwargs["language"])
+        self.assertEqual(registry.loaded_models(), ["base-int8"])
+
+
+@override_settings(TRANSCRIPTION_MODELS=["tiny", "base", "small"], WHISPER_MODEL_SPEED=SPEEDS,
+                   WHISPER_PRECISION="fp32", TRANSCRIPTION_WORKERS=1, WHISPER_LANGUAGE="de")
+class PipelineEngineTest(TestCase):
+
+    @patch("quiz_app.api.transcript_cache.get_cached_transcript", return_value="Hallo")
+    @patch("quiz_app.api.utils.extract_video_info", return_value={"success": True, "info": {"id": "x", "duration": 600}})
+    def test_prepare_media_selects_the_engine_before_the_cache_lookup(self, mock_info, mock_cache):
+        events = []
+        media = utils.prepare_media("https://youtu.be/x", latency_budget=200,
+                                    on_progress=lambda event, **data: events.append((event, data)))
+
+        self.assertEqual(media["engine"].key, "base")
+        self.assertEqual(mock_cache.call_args.args[1:], ("base", "de"))
+        self.assertIn(("engine", {"engine": "base", "language": "de"}), events)
+
+
+@override_settings(QUIZ_JOBS_EAGER=True, TRANSCRIPTION_MODELS=["tiny", "base", "small"])
+class CreateQuizEngineOptionsTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpassword123")
+        self.client.force_authenticate(user=self.user)
+
+    @patch("quiz_app.api.utils.generate_quiz_data_from_video")
+    def test_options_reach_the_pipeline(self, mock_generate):
+        def fake_pipeline(url, on_stage, on_progress, **options):
+            on_progress("engine", engine="base-int8", language="auto")
+            return {"success": False, "error": "Empty or failed transcript"}
+
+        mock_generate.side_effect = fake_pipeline
+        response = self.client.post(reverse("quiz-list-create"), {
+            "url": "https://www.youtube.com/watch?v=abc", "model": "base", "language": "auto", "latency_budget": 60,
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(mock_generate.call_args.kwargs["model"], "base")
+        self.assertEqual(mock_generate.call_args.kwargs["language"], "auto")
+        self.assertEqual(mock_generate.call_args.kwargs["latency_budget"], 60)
+        self.assertEqual(response.data["requested_model"], "base")
+        self.assertEqual(response.data["engine"], "base-int8")
+
+    @patch("quiz_app.api.utils.generate_quiz_data_from_video")
+    def test_unset_options_are_not_passed(self, mock_generate):
+        mock_generate.return_value = {"success": False, "error": "x"}
+        self.client.post(reverse("quiz-list-create"), {"url": "https://www.youtube.com/watch?v=abc"})
+
+        self.assertEqual(set(mock_generate.call_args.kwargs), {"on_stage", "on_progress"})
+
+    def test_unknown_model_is_rejected(self):
+        response = self.client.post(reverse("quiz-list-create"), {
+            "url": "https://www.youtube.com/watch?v=abc", "model": "huge",
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("model", response.data)
+        self.assertFalse(QuizGenerationJob.objects.exists())
@@ -0,0 +1,96 @@
+import json
+import time
+
+from django.test import SimpleTestCase, override_settings
+from google.genai import errors
+
+from quiz_app.api import gemini, utils
+from quiz_app.bench.fake_gemini import FakeGeminiServer
+
+QUIZ_JSON = json.dumps({
+    "title": "Quiz",
+    "description": "Beschreibung",
+    "questions": [{"question_title": "Q1", "question_options": ["A", "B", "C", "D"], "answer": "A"}],
+})
+
+
+class GeminiClientTest(SimpleTestCase):
+
+    def start_server(self, responses=None, **settings):
+        server = FakeGeminiServer(responses, default_text="ok").start()
+        self.addCleanup(server.stop)
+
+        overrides = override_settings(
+            API_KEY="test-key", GEMINI_BASE_URL=server.base_url,
+            GEMINI_RETRY_INITIAL_DELAY=0.01, GEMINI_RETRY_MAX_DELAY=0.02, **settings,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        gemini.reset_client()
+        self.addCleanup(gemini.reset_client)
+        return server
+
+    def test_client_is_shared_and_reuses_connections(self):
+        server = self.start_server()
+
+        self.assertIs(gemini.get_client(), gemini.get_client())
+        for _ in range(3):
+            self.assertEqual(gemini.generate_text("Hallo"), "ok")
+
+        self.assertEqual(len(server.requests), 3)
+        self.assertEqual(len(server.connections), 1)
+        self.assertTrue(server.requests[0]["path"].endswith("models/gemini-2.5-flash:generateContent"))
+
+    def test_server_errors_are_retried(self):
+        server = self.start_server([{"status": 503}, {"status": 429}], GEMINI_MAX_ATTEMPTS=3)
+
+        self.assertEqual(gemini.generate_text("Hallo"), "ok")
+        self.assertEqual(len(server.requests), 3)
+
+    def test_retry_budget_is_bounded(self):
+        server = self.start_server([{"status": 503}] * 5, GEMINI_MAX_ATTEMPTS=2)
+
+        with self.assertRaises(errors.ServerError):
+            gemini.generate_text("Hallo")
+        self.assertEqual(len(server.requests), 2)
+
+    def test_client_errors_are_not_retried(self):
+        server = self.start_server([{"status": 400}], GEMINI_MAX_ATTEMPTS=3)
+
+        with self.assertRaises(errors.ClientError):
+            gemini.generate_text("Hallo")
+        self.assertEqual(len(server.requests), 1)
+
+    def test_slow_request_is_hedged(self):
+        server = self.start_server(
+            [{"delay": 2, "text": "slow"}, {"text": "fast"}],
+            GEMINI_HEDGE_PERCENTILE=95, GEMINI_HEDGE_MIN_SAMPLES=3,
+        )
+        for _ in range(3):
+            gemini.latency_tracker.record(0.05)
+
+        started = time.monotonic()
+        self.assertEqual(gemini.generate_text("Hallo"), "fast")
+        self.assertLess(time.monotonic() - started, 1.5)
+        self.assertEqual(len(server.requests), 2)
+
+    def test_generate_quiz_with_gemini(self):
+        self.start_server([{"text": "Hier ist das Quiz:\n" + QUIZ_JSON}])
+
+        quiz_data = utils.generate_quiz_with_gemini("Ein Transkript")
+
+        self.assertEqual(quiz_data["title"], "Quiz")
+        self.assertEqual(len(quiz_data["questions"]), 1)
+
+
+class LatencyTrackerTest(SimpleTestCase):
+
+    def test_percentile(self):
+        tracker = gemini.LatencyTracker(window=100)
+        self.assertIsNone(tracker.percentile(95))
+        for i in range(1, 101):
+            tracker.record(i / 100)
+        self.assertEqual(tracker.percentile(50), 0.51)
+        self.assertEqual(tracker.percentile(95), 0.95)
+        self.assertIsNone(tracker.percentile(95, min_samples=200))
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import threading
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from quiz_app.api import utils
+from quiz_app.api.jobs import run_job
+from quiz_app.api.progress import ProgressBroker, broker
+from quiz_app.models import QuizGenerationJob
+
+User = get_user_model()
+
+
+def parse_frames(chunks):
+    """
+    Split SSE output into (event, data) pairs, skipping comments.
+    """
+    frames = []
+    for block in "".join(chunks).split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if "event" in fields:
+            frames.append((fields["event"], json.loads(fields["data"])))
+    return frames
+
+
+class ProgressBrokerTest(SimpleTestCase):
+
+    def test_events_from_other_threads_reach_async_listeners(self):
+        progress = ProgressBroker(history=10)
+
+        async def listen():
+            with progress.subscribe(1) as queue:
+                thread = threading.Thread(target=lambda: [progress.publish(1, "stage", status=s)
+                                                          for s in ("downloading", "generating")])
+                thread.start()
+                messages = [await asyncio.wait_for(queue.get(), 1) for _ in range(2)]
+                thread.join()
+            return messages
+
+        messages = asyncio.run(listen())
+
+        self.assertEqual([m["data"]["status"] for m in messages], ["downloading", "generating"])
+        self.assertEqual(progress.listener_count(), 0)
+
+    def test_late_listener_replays_history_after_last_event_id(self):
+        progress = ProgressBroker(history=10)
+        first = progress.publish(1, "stage", status="downloading")
+        progress.publish(1, "stage", status="transcribing")
+        progress.publish(2, "stage", status="downloading")
+
+        async def listen():
+            with progress.subscribe(1, after=first["id"]) as queue:
+                return [queue.get_nowait() for _ in range(queue.qsize())]
+
+        self.assertEqual([m["data"]["status"] for m in asyncio.run(listen())], ["transcribing"])
+
+
+class DownloadProgressHookTest(SimpleTestCase):
+
+    def test_one_event_per_percent(self):
+        events = []
+        hook = utils._download_progress_hook(lambda event, **data: events.append(data["percent"]))
+
+        for downloaded in (0, 5, 9, 10, 250, 999):
+            hook({"status": "downloading", "downloaded_bytes": downloaded, "total_bytes": 1000})
+        hook({"status": "finished", "downloaded_bytes": 1000, "total_bytes": 1000})
+
+        self.assertEqual(events, [0, 1, 25, 99, 100])
+
+
+class JobEventsViewTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", email="test@example.com", password="testpassword123")
+        self.other_user = User.objects.create_user(username="otheruser", email="other@example.com", password="otherpassword")
+        self.job = QuizGenerationJob.objects.create(owner=self.user, url="https://www.youtube.com/watch?v=abc")
+        self.url = reverse("quiz-job-events", args=[self.job.pk])
+        broker.clear()
+
+    def auth(self, user):
+        return {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+
+    async def read_stream(self, response):
+        return parse_frames([chunk.decode() async for chunk in response.streaming_content])
+
+    @patch("quiz_app.api.utils.generate_quiz_data_from_video")
+    async def test_stream_follows_job_until_it_fails(self, mock_generate):
+        def fake_pipeline(url, on_stage, on_progress):
+            on_stage("downloading")
+            on_progress("download", percent=50, downloaded_bytes=5, total_bytes=10)
+            on_stage("transcribing")
+            on_progress("transcription", segments=1, elapsed=0.5)
+            return {"success": False, "error": "Empty or failed transcript"}
+
+        mock_generate.side_effect = fake_pipeline
+        response = await self.async_client.get(self.url, headers=self.auth(self.user))
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+
+        stream = response.streaming_content.__aiter__()
+        first = (await stream.__anext__()).decode()
+        self.assertEqual(parse_frames([first]), [("status", {"status": "queued", "quiz": None})])
+
+        await sync_to_async(run_job)(self.job.pk)
+
+        chunks = [first]
+        async for chunk in stream:
+            chunks.append(chunk.decode())
+        events = parse_frames(chunks)
+
+        self.assertEqual([name for name, _ in events],
+                         ["status", "stage", "download", "stage", "transcription", "failed"])
+        self.assertEqual(events[2][1]["percent"], 50)
+        self.assertEqual(events[-1][1]["error"], "Empty or failed transcript")
+
+    async def test_finished_job_sends_snapshot_and_closes(self):
+        await QuizGenerationJob.objects.filter(pk=self.job.pk).aupdate(status="failed", error="boom")
+
+        response = await self.async_client.get(self.url, headers=self.auth(self.user))
+        events = await self.read_stream(response)
+
+        self.assertEqual(events, [("status", {"status": "failed", "quiz": None}),
+                                  ("failed", {"status": "failed", "error": "boom"})])
+
+    @override_settings(PROGRESS_HEARTBEAT_SECONDS=0.05)
+    async def test_job_finished_elsewhere_is_picked_up_from_the_database(self):
+        response = await self.async_client.get(self.url, headers=self.auth(self.user))
+        stream = response.streaming_content.__aiter__()
+        chunks = [(await stream.__anext__()).decode()]
+
+        await QuizGenerationJob.objects.filter(pk=self.job.pk).aupdate(status="done")
+        async for chunk in stream:
+            chunks.append(chunk.decode())
+
+        self.assertEqual(parse_frames(chunks)[-1], ("done", {"status": "done", "quiz": None}))
+
+    async def test_requires_owner(self):
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+        response = await self.async_client.get(self.url, headers=self.auth(self.other_user))
+        self.assertEqual(response.status_code, 403)
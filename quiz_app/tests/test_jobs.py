@@ -0,0 +1,119 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quiz_app.api.jobs import run_job
+from quiz_app.models import Quiz, QuizGenerationJob
+
+User = get_user_model()
+
+QUIZ_DATA = {
+    "title": "Neues Quiz",
+    "description": "Beschreibung",
+    "questions": [
+        {"question_title": "Q1", "question_options": ["A", "B", "C", "D"], "answer": "A"},
+        {"question_title": "Q2", "question_options": ["A", "B", "C", "D"], "answer": "B"},
+    ],
+}
+
+
+class QuizGenerationJobTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", email="test@example.com", password="testpassword123")
+        self.other_user = User.objects.create_user(username="otheruser", email="other@example.com", password="otherpassword")
+        self.create_url = reverse("quiz-list-create")
+        self.job_url = lambda pk: reverse("quiz-job-detail", args=[pk])
+
+    @patch("quiz_app.api.views.enqueue_job")
+    def test_create_returns_202_with_queued_job(self, mock_enqueue):
+        """
+        POST answers immediately with the queued job and a polling URL.
+        """
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.create_url, {"url": "https://www.youtube.com/watch?v=abc"})
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], "queued")
+        self.assertIsNone(response.data["quiz"])
+        self.assertTrue(response.data["status_url"].endswith(self.job_url(response.data["id"])))
+        self.assertEqual(response["Location"], response.data["status_url"])
+        self.assertFalse(Quiz.objects.exists())
+        mock_enqueue.assert_called_once()
+
+    @override_settings(QUIZ_JOBS_EAGER=True)
+    @patch("quiz_app.api.utils.generate_quiz_data_from_video")
+    def test_job_status_after_success(self, mock_generate):
+        mock_generate.return_value = {"success": True, "data": QUIZ_DATA}
+        self.client.force_authenticate(user=self.user)
+
+        job_id = self.client.post(self.create_url, {"url": "https://www.youtube.com/watch?v=abc"}).data["id"]
+        response = self.client.get(self.job_url(job_id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "done")
+        quiz = Quiz.objects.get(pk=response.data["quiz"])
+        self.assertEqual(quiz.owner, self.user)
+        self.assertEqual(quiz.questions.count(), 2)
+
+    @patch("quiz_app.api.utils.generate_quiz_data_from_video")
+    def test_run_job_records_stages_and_failure(self, mock_generate):
+        seen = []
+
+        def fake_pipeline(url, on_stage, on_progress):
+            for stage in ("downloading", "transcribing"):
+                on_stage(stage)
+                seen.append(QuizGenerationJob.objects.get(pk=job.pk).status)
+            return {"success": False, "error": "Empty or failed transcript"}
+
+        mock_generate.side_effect = fake_pipeline
+        job = QuizGenerationJob.objects.create(owner=self.user, url="https://www.youtube.com/watch?v=abc")
+
+        run_job(job.id)
+        job.refresh_from_db()
+
+        self.assertEqual(seen, ["downloading", "transcribing"])
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(job.error, "Empty or failed transcript")
+        self.assertIsNotNone(job.finished_at)
+        self.assertFalse(Quiz.objects.exists())
+
+    @patch("quiz_app.api.utils.save_quiz_data")
+    @patch("quiz_app.api.utils.generate_quiz_data_from_video", return_value={"success": True, "data": {}})
+    def test_locked_database_is_retried_instead_of_failing_the_job(self, mock_generate, mock_save_quiz):
+        mock_save_quiz.return_value = Quiz.objects.create(title="Quiz", owner=self.user, url="https://youtu.be/abc")
+        job = QuizGenerationJob.objects.create(owner=self.user, url="https://www.youtube.com/watch?v=abc")
+        save = QuizGenerationJob.save
+        locked = [OperationalError("database table is locked: quiz_app_quizgenerationjob")] * 2
+
+        def flaky_save(instance, *args, **kwargs):
+            if locked:
+                raise locked.pop()
+            return save(instance, *args, **kwargs)
+
+        with patch.object(QuizGenerationJob, "save", autospec=True, side_effect=flaky_save):
+            run_job(job.id)
+        job.refresh_from_db()
+
+        self.assertEqual(job.status, "done")
+        self.assertEqual(job.quiz, mock_save_quiz.return_value)
+        self.assertEqual(job.error, "")
+
+    @patch("quiz_app.api.utils.generate_quiz_data_from_video", side_effect=RuntimeError("boom"))
+    def test_run_job_marks_crash_as_failed(self, mock_generate):
+        job = QuizGenerationJob.objects.create(owner=self.user, url="https://www.youtube.com/watch?v=abc")
+        run_job(job.id)
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(job.error, "boom")
+
+    def test_job_status_not_owner(self):
+        job = QuizGenerationJob.objects.create(owner=self.user, url="https://www.youtube.com/watch?v=abc")
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.get(self.job_url(job.id))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,150 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from quiz_app.api import media_spool, utils
+from quiz_app.api.media_spool import MediaSpool, MediaSpoolFull
+
+
+def use_temporary_spool(test, max_bytes: int = 10 ** 6) -> MediaSpool:
+    """
+    Replace the process-wide spool with one in a temporary directory for the duration of `test`.
+    """
+    tmp = tempfile.TemporaryDirectory()
+    test.addCleanup(tmp.cleanup)
+    spool = MediaSpool(root=tmp.name, max_bytes=max_bytes)
+    patcher = patch.object(media_spool, "spool", spool)
+    patcher.start()
+    test.addCleanup(patcher.stop)
+    return spool
+
+
+def dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+class MediaSpoolTest(SimpleTestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.spool = MediaSpool(root=self.root, max_bytes=1000)
+
+    def add_entry(self, name: str, size: int, age: float = 0) -> str:
+        path = os.path.join(self.root, name)
+        os.makedirs(path)
+        with open(os.path.join(path, "audio.opus"), "wb") as f:
+            f.write(b"x" * size)
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_lease_is_deleted_on_exit(self):
+        with self.spool.allocate("audio") as lease:
+            with open(lease.file("a.opus"), "wb") as f:
+                f.write(b"x" * 10)
+            self.assertTrue(self.spool.is_leased(lease.path))
+            self.assertEqual(self.spool.usage(), 10)
+
+        self.assertFalse(os.path.exists(lease.path))
+        self.assertEqual(self.spool.entries(), [])
+
+    def test_lease_is_deleted_when_the_block_raises(self):
+        with self.assertRaises(RuntimeError):
+            with self.spool.allocate("audio") as lease:
+                raise RuntimeError("boom")
+        self.assertFalse(os.path.exists(lease.path))
+
+    def test_least_recently_used_leftovers_are_evicted_first(self):
+        pid = dead_pid()
+        oldest = self.add_entry(f"{pid}-audio-a", 400, age=300)
+        older = self.add_entry(f"{pid}-audio-b", 400, age=200)
+        recent = self.add_entry(f"{pid}-audio-c", 100, age=100)
+
+        with self.spool.allocate("audio", needed_bytes=300):
+            pass
+
+        self.assertFalse(os.path.exists(oldest))
+        self.assertTrue(os.path.exists(older))
+        self.assertTrue(os.path.exists(recent))
+
+    def test_leased_workspaces_are_never_evicted(self):
+        with self.spool.allocate("audio") as lease:
+            with open(lease.file("a.opus"), "wb") as f:
+                f.write(b"x" * 900)
+
+            with self.assertRaises(MediaSpoolFull):
+                self.spool.allocate("audio", needed_bytes=200)
+            self.assertTrue(os.path.exists(lease.file("a.opus")))
+
+    def test_sweep_removes_orphans_only(self):
+        dead = self.add_entry(f"{dead_pid()}-audio-a", 10)
+        legacy = os.path.join(self.root, "quiz_temp_abc.m4a")
+        open(legacy, "wb").close()
+        other_live = self.add_entry(f"{os.getppid()}-audio-b", 10)
+        stale = self.add_entry(f"{os.getppid()}-audio-c", 10, age=7200)
+        leaked = self.add_entry(f"{os.getpid()}-audio-d", 10)
+
+        with self.spool.allocate("audio") as lease:
+            swept = {path for path, _ in self.spool.sweep(max_age=3600)}
+            self.assertTrue(os.path.exists(lease.path))
+
+        self.assertEqual(swept, {dead, legacy, stale, leaked})
+        self.assertTrue(os.path.exists(other_live))
+
+    def test_sweep_command(self):
+        orphan = self.add_entry(f"{dead_pid()}-audio-a", 10)
+        out = io.StringIO()
+
+        with patch("quiz_app.management.commands.sweep_media.spool", self.spool):
+            call_command("sweep_media", "--dry-run", stdout=out)
+            self.assertTrue(os.path.exists(orphan))
+            call_command("sweep_media", stdout=out)
+
+        self.assertFalse(os.path.exists(orphan))
+        self.assertIn("1 orphaned entries, 10 bytes freed", out.getvalue())
+
+
+class PipelineCleanupTest(SimpleTestCase):
+
+    def setUp(self):
+        self.spool = use_temporary_spool(self)
+
+    @patch("quiz_app.api.utils.yt_dlp.YoutubeDL")
+    def test_failed_download_releases_its_workspace(self, mock_ydl):
+        mock_ydl.return_value.__enter__.return_value.extract_info.side_effect = RuntimeError("HTTP 403")
+
+        result = utils.download_audio_from_url("https://youtu.be/x")
+
+        self.assertEqual(result, {"success": False, "error": "HTTP 403"})
+        self.assertEqual(self.spool.entries(), [])
+
+    def test_download_beyond_the_quota_is_refused(self):
+        info = {"id": "x", "duration": 3600, "format_id": "251", "abr": 128, "vcodec": "none", "formats": []}
+
+        result = utils.download_audio_from_url("https://youtu.be/x", info=info)
+
+        self.assertFalse(result["success"])
+        self.assertIn("is full", result["error"])
+
+    @override_settings(TRANSCRIPTION_WORKERS=0)
+    @patch("quiz_app.api.utils.run_whisper_transcription", side_effect=RuntimeError("boom"))
+    def test_audio_is_deleted_when_transcription_crashes(self, mock_whisper):
+        lease = self.spool.allocate("audio")
+        media = {"success": True, "url": "https://youtu.be/x", "info": {}, "max_seconds": None,
+                 "audio_path": lease.file("a.opus"), "lease": lease}
+
+        with self.assertRaises(RuntimeError):
+            utils.transcribe_media(media)
+
+        self.assertFalse(os.path.exists(lease.path))
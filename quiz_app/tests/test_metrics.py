@@ -0,0 +1,253 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.core.handlers.base import BaseHandler
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core import metrics
+from core.metrics import Counter, Gauge, Histogram, MetricsRegistry
+from core.middleware import MetricsMiddleware
+from quiz_app.api import metrics as quiz_metrics, utils
+from quiz_app.api.jobs import run_job
+from quiz_app.models import Question, Quiz, QuizGenerationJob
+
+User = get_user_model()
+
+
+def dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def sample(text: str, line: str) -> float:
+    """
+    Value of the exposition line starting with `line` (name and labels).
+    """
+    for row in text.splitlines():
+        if row.startswith(line + " "):
+            return float(row.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line} not in the metrics:\n{text}")
+
+
+def series(metric, **labels):
+    return metric.samples().get(tuple(str(labels[name]) for name in metric.labelnames))
+
+
+class MetricsRegistryTest(SimpleTestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = tmp.name
+        self.registry = MetricsRegistry(directory=self.directory)
+
+    def test_exposition_format(self):
+        requests = Counter("app_requests_total", "Requests.", ["path"], registry=self.registry)
+        latency = Histogram("app_seconds", "Latency.", buckets=(0.1, 1), registry=self.registry)
+        requests.inc(path='/a"b')
+        requests.inc(2, path='/a"b')
+        latency.observe(0.05)
+        latency.observe(0.1)
+        latency.observe(3)
+
+        text = self.registry.render()
+
+        self.assertIn("# TYPE app_requests_total counter", text)
+        self.assertEqual(sample(text, 'app_requests_total{path="/a\\"b"}'), 3)
+        self.assertEqual(sample(text, 'app_seconds_bucket{le="0.1"}'), 2)
+        self.assertEqual(sample(text, 'app_seconds_bucket{le="1"}'), 2)
+        self.assertEqual(sample(text, 'app_seconds_bucket{le="+Inf"}'), 3)
+        self.assertEqual(sample(text, "app_seconds_count"), 3)
+        self.assertAlmostEqual(sample(text, "app_seconds_sum"), 3.15)
+
+    def test_labels_must_match(self):
+        requests = Counter("app_requests_total", "Requests.", ["path"], registry=self.registry)
+        with self.assertRaises(ValueError):
+            requests.inc(method="GET")
+
+    def test_processes_are_added_up(self):
+        other = MetricsRegistry(directory=self.directory)
+        for registry, count, depth in ((self.registry, 2, 1), (other, 3, 4)):
+            Counter("jobs_total", "Jobs.", registry=registry).inc(count)
+            Gauge("queue_depth", "Queue.", registry=registry).set(depth)
+            Histogram("stage_seconds", "Stages.", buckets=(1,), registry=registry).observe(count)
+        other.flush()
+
+        text = self.registry.render()
+
+        self.assertEqual(sample(text, "jobs_total"), 5)
+        self.assertEqual(sample(text, "queue_depth"), 5)
+        self.assertEqual(sample(text, "stage_seconds_count"), 2)
+        self.assertEqual(sample(text, "stage_seconds_sum"), 5)
+
+    def test_gauges_of_exited_processes_are_dropped(self):
+        with open(os.path.join(self.directory, f"{dead_pid()}-abc.json"), "w") as f:
+            json.dump({"pid": dead_pid(), "metrics": {
+                "jobs_total": {"type": "counter", "help": "Jobs.", "labels": [], "samples": [[[], 7]]},
+                "queue_depth": {"type": "gauge", "help": "Queue.", "labels": [], "samples": [[[], 9]]},
+            }}, f)
+        Gauge("queue_depth", "Queue.", registry=self.registry).set(1)
+
+        text = self.registry.render()
+
+        self.assertEqual(sample(text, "jobs_total"), 7)
+        self.assertEqual(sample(text, "queue_depth"), 1)
+
+    def test_flush_is_atomic_and_skips_broken_files(self):
+        Counter("jobs_total", "Jobs.", registry=self.registry).inc()
+        self.registry.flush()
+        with open(os.path.join(self.directory, "1-broken.json"), "w") as f:
+            f.write('{"pid": 1, "metr')
+
+        self.assertEqual(os.listdir(self.directory).count(self.registry.filename), 1)
+        self.assertEqual(sample(MetricsRegistry(directory=self.directory).render(), "jobs_total"), 1)
+
+    def test_single_process_without_directory(self):
+        registry = MetricsRegistry(directory="")
+        Counter("jobs_total", "Jobs.", registry=registry).inc()
+        registry.flush()
+        self.assertEqual(sample(registry.render(), "jobs_total"), 1)
+
+
+@override_settings(METRICS_TOKEN="scrape-secret")
+class MetricsEndpointTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpassword123")
+
+    def test_requires_the_token_or_staff(self):
+        self.assertEqual(self.client.get("/api/metrics").status_code, 401)
+        self.assertEqual(self.client.get("/api/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code, 401)
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get("/api/metrics").status_code, 403)
+
+        self.user.is_staff = True
+        self.user.save()
+        self.assertEqual(self.client.get("/api/metrics").status_code, 200)
+
+    def test_request_latency_and_queries_per_endpoint(self):
+        self.client.force_authenticate(user=self.user)
+        quiz = Quiz.objects.create(title="Quiz", description="", url="https://youtu.be/x", owner=self.user)
+        Question.objects.create(quiz=quiz, question_title="Frage", question_options=["A", "B", "C", "D"], answer="A")
+        self.client.get(reverse("my-quizzes", args=[quiz.pk]))
+
+        response = self.client.get("/api/metrics", HTTP_AUTHORIZATION="Bearer scrape-secret")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], metrics.CONTENT_TYPE)
+        text = response.content.decode()
+        endpoint = 'endpoint="api/quizzes/<int:pk>/"'
+        self.assertGreaterEqual(sample(text, f'http_request_duration_seconds_count{{method="GET",{endpoint},status="200"}}'), 1)
+        self.assertGreaterEqual(sample(text, f'http_request_db_queries_sum{{method="GET",{endpoint}}}'), 1)
+
+
+class MetricsMiddlewareTest(TestCase):
+
+    @override_settings(DEBUG=True)
+    def test_async_requests_are_not_adapted_to_sync(self):
+        """
+        No middleware forces the async views onto a thread (Django logs every adaptation in DEBUG).
+        """
+        with self.assertLogs("django.request", "DEBUG") as logs:
+            BaseHandler().load_middleware(is_async=True)
+            logging.getLogger("django.request").debug("loaded")
+
+        self.assertEqual([record.getMessage() for record in logs.records if "adapted" in record.getMessage()], [])
+
+    def test_async_requests_are_measured(self):
+        metrics.REQUEST_SECONDS.clear()
+        metrics.REQUEST_QUERIES.clear()
+
+        async def view(request):
+            await Quiz.objects.acount()
+            return HttpResponse("ok")
+
+        middleware = MetricsMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        async_to_sync(middleware)(RequestFactory().get("/"))
+
+        self.assertEqual(series(metrics.REQUEST_QUERIES, method="GET", endpoint="unmatched")[-1], 1)
+        self.assertIsNotNone(series(metrics.REQUEST_SECONDS, method="GET", endpoint="unmatched", status=200))
+
+
+class PipelineMetricsTest(TestCase):
+
+    def setUp(self):
+        for metric in (quiz_metrics.PIPELINE_STAGE_SECONDS, quiz_metrics.CACHE_REQUESTS, quiz_metrics.JOBS_FINISHED):
+            metric.clear()
+
+    @patch("quiz_app.api.utils.yt_dlp.YoutubeDL")
+    def test_stage_durations(self, mock_ydl):
+        mock_ydl.return_value.__enter__.return_value.extract_info.return_value = {"id": "x"}
+        utils.extract_video_info("https://youtu.be/x")
+
+        with patch("quiz_app.api.gemini.generate_text", return_value='{"questions": []}'):
+            utils.generate_quiz_with_gemini("Hallo")
+
+        self.assertEqual(sum(series(quiz_metrics.PIPELINE_STAGE_SECONDS, stage="extract", outcome="success")[:-1]), 1)
+        self.assertEqual(sum(series(quiz_metrics.PIPELINE_STAGE_SECONDS, stage="generation", outcome="success")[:-1]), 1)
+
+    @patch("quiz_app.api.utils.yt_dlp.YoutubeDL")
+    def test_failed_stages(self, mock_ydl):
+        mock_ydl.return_value.__enter__.return_value.extract_info.side_effect = RuntimeError("Video unavailable")
+        self.assertFalse(utils.extract_video_info("https://youtu.be/x")["success"])
+
+        with patch("quiz_app.api.gemini.generate_text", side_effect=RuntimeError("quota")):
+            utils.generate_quiz_with_gemini("Hallo")
+        with patch("quiz_app.api.gemini.generate_text", return_value="Tut mir leid, kein Quiz."):
+            utils.generate_quiz_with_gemini("Hallo")
+
+        self.assertEqual(sum(series(quiz_metrics.PIPELINE_STAGE_SECONDS, stage="extract", outcome="error")[:-1]), 1)
+        self.assertEqual(sum(series(quiz_metrics.PIPELINE_STAGE_SECONDS, stage="generation", outcome="error")[:-1]), 2)
+        self.assertIsNone(series(quiz_metrics.PIPELINE_STAGE_SECONDS, stage="generation", outcome="success"))
+
+    @override_settings(TRANSCRIPT_CACHE_ENABLED=True)
+    def test_transcript_cache_hits_and_misses(self):
+        from quiz_app.api import transcript_cache
+
+        info = {"extractor_key": "Youtube", "id": "abc"}
+        transcript_cache.get_cached_transcript(info, "small", "de")
+        transcript_cache.store_transcript(info, "small", "de", "Hallo")
+        transcript_cache.get_cached_transcript(info, "small", "de")
+
+        self.assertEqual(series(quiz_metrics.CACHE_REQUESTS, cache="transcript", result="miss"), 1)
+        self.assertEqual(series(quiz_metrics.CACHE_REQUESTS, cache="transcript", result="hit"), 1)
+
+    @patch("quiz_app.api.utils.generate_quiz_data_from_video", return_value={"success": False, "error": "x"})
+    def test_finished_jobs(self, mock_generate):
+        user = User.objects.create_user(username="testuser", password="testpassword123")
+        job = QuizGenerationJob.objects.create(owner=user, url="https://www.youtube.com/watch?v=abc")
+
+        run_job(job.id)
+
+        self.assertEqual(series(quiz_metrics.JOBS_FINISHED, status="failed"), 1)
+
+    def test_queue_depth(self):
+        from quiz_app.api import jobs
+
+        quiz_metrics.JOB_QUEUE_DEPTH.clear()
+        seen = []
+
+        class InlineExecutor:
+            def submit(self, func, *args):
+                seen.append(series(quiz_metrics.JOB_QUEUE_DEPTH, stage="generate"))
+                func(*args)
+
+        with patch.object(jobs, "get_executor", return_value=InlineExecutor()):
+            jobs._submit_to("generate", lambda: seen.append(series(quiz_metrics.JOBS_RUNNING, stage="generate")))
+
+        self.assertEqual(seen, [1, 1])
+        self.assertEqual(series(quiz_metrics.JOB_QUEUE_DEPTH, stage="generate"), 0)
+        self.assertEqual(series(quiz_metrics.JOBS_RUNNING, stage="generate"), 0)
@@ -0,0 +1,167 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core import profiling
+from core.profiling import ProfileStore, StackSampler
+
+User = get_user_model()
+
+
+def spin(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class StackSamplerTest(SimpleTestCase):
+
+    def test_samples_the_given_thread(self):
+        sampler = StackSampler(threading.get_ident(), 0.001).start()
+        spin(0.2)
+        stacks = sampler.stop()
+
+        self.assertGreater(sum(stacks.values()), 10)
+        leaf_functions = {stack.rsplit(";", 1)[-1] for stack in stacks}
+        self.assertIn(f"{__name__}:spin", leaf_functions)
+        self.assertTrue(all(";" in stack and " " not in stack for stack in stacks))
+
+    def test_summary(self):
+        collapsed = "a:main;b:view;c:json 6\na:main;b:view 3\na:main;d:log 1\n"
+        self.assertEqual(profiling.summarize(collapsed), [("c:json", 6, 6), ("b:view", 3, 9), ("d:log", 1, 1)])
+
+
+class ProfileStoreTest(SimpleTestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = ProfileStore(root=tmp.name, max_profiles=2)
+
+    def test_only_the_newest_profiles_are_kept(self):
+        ids = [self.store.save(Counter({"a:main;b:view": i + 1}), path=f"/{i}") for i in range(3)]
+
+        self.assertEqual(len(self.store.list()), 2)
+        self.assertEqual(len(os.listdir(self.store.root)), 4)
+        self.assertEqual(self.store.stacks(ids[-1]), "a:main;b:view 3\n")
+        self.assertEqual(self.store.meta(ids[-1])["samples"], 3)
+
+    def test_ids_cannot_escape_the_store(self):
+        self.assertIsNone(self.store.stacks("../../etc/passwd"))
+        self.assertIsNone(self.store.meta("../settings"))
+
+
+class ProfilerMiddlewareTest(APITestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = ProfileStore(root=tmp.name, max_profiles=10)
+        original, profiling.store = profiling.store, self.store
+        self.addCleanup(setattr, profiling, "store", original)
+
+        self.user = User.objects.create_user(username="testuser", password="testpassword123")
+        self.staff = User.objects.create_user(username="staff", password="testpassword123", is_staff=True)
+
+    def test_staff_header_stores_a_profile(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.staff)}")
+        response = self.client.get(reverse("quiz-list"), HTTP_X_PROFILE="1")
+
+        self.assertEqual(response.status_code, 200)
+        [profile] = self.store.list()
+        self.assertEqual(response["X-Profile-Id"], profile["id"])
+        self.assertEqual((profile["path"], profile["route"], profile["user"], profile["trigger"]),
+                         ("/api/quizzes/", "api/quizzes/", "staff", "header"))
+
+    def test_staff_session_header_stores_a_profile(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse("admin:index"), HTTP_X_PROFILE="1")
+
+        [profile] = self.store.list()
+        self.assertEqual(response["X-Profile-Id"], profile["id"])
+        self.assertEqual(profile["user"], "staff")
+
+    def test_header_of_other_clients_does_not_start_the_sampler(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+        with patch.object(profiling, "StackSampler") as sampler:
+            response = self.client.get(reverse("quiz-list"), HTTP_X_PROFILE="1")
+            self.client.credentials()
+            anonymous = self.client.get(reverse("quiz-list"), HTTP_X_PROFILE="1")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(anonymous.status_code, 401)
+        self.assertNotIn("X-Profile-Id", response)
+        sampler.assert_not_called()
+        self.assertEqual(self.store.list(), [])
+
+    @override_settings(PROFILER_TOKEN="s3cret")
+    def test_token_as_header_value(self):
+        response = self.client.get(reverse("quiz-list"), HTTP_X_PROFILE="s3cret")
+
+        self.assertEqual(response.status_code, 401)
+        [profile] = self.store.list()
+        self.assertEqual(response["X-Profile-Id"], profile["id"])
+        self.assertEqual((profile["user"], profile["trigger"]), (None, "header"))
+
+    def test_async_requests_stay_async(self):
+        async def view(request):
+            return HttpResponse("ok")
+
+        middleware = profiling.ProfilerMiddleware(view)
+        request = RequestFactory().get("/", HTTP_X_PROFILE="1")
+        request.user = self.staff
+
+        save = self.store.save
+        loops = []
+
+        def save_off_the_loop(*args, **kwargs):
+            try:
+                loops.append(asyncio.get_running_loop())
+            except RuntimeError:
+                pass
+            return save(*args, **kwargs)
+
+        self.assertTrue(iscoroutinefunction(middleware))
+        with patch.object(self.store, "save", side_effect=save_off_the_loop):
+            response = async_to_sync(middleware)(request)
+
+        self.assertEqual(response["X-Profile-Id"], self.store.list()[0]["id"])
+        self.assertEqual(loops, [])
+
+    @override_settings(PROFILER_SAMPLE_RATE=1.0)
+    def test_sampled_requests_are_stored_anonymously(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse("quiz-list"))
+
+        self.assertNotIn("X-Profile-Id", response)
+        [profile] = self.store.list()
+        self.assertEqual((profile["trigger"], profile["user"]), ("sampling", None))
+
+    def test_admin_pages(self):
+        profile_id = self.store.save(Counter({"a:main;b:view": 3}), method="GET", path="/api/quizzes/",
+                                     status=200, seconds=0.1)
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse("profile-list")).status_code, 302)
+
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse("profile-list"))
+        self.assertContains(response, profile_id)
+        self.assertContains(self.client.get(reverse("profile-detail", args=[profile_id])), "b:view")
+        download = self.client.get(reverse("profile-detail", args=[profile_id]) + "?download")
+        self.assertEqual(download.content, b"a:main;b:view 3\n")
+        self.assertEqual(self.client.get(reverse("profile-detail", args=["missing"])).status_code, 404)
+        self.assertContains(self.client.get(reverse("admin:index")), reverse("profile-list"))
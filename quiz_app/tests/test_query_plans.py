@@ -0,0 +1,131 @@
+import re
+import unittest
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from quiz_app.models import Quiz, Question
+
+User = get_user_model()
+
+# "SCAN quiz_app_quiz" without "USING [COVERING] INDEX" reads the whole table.
+FULL_SCAN = re.compile(r"SCAN (TABLE )?\w+( AS \w+)?$")
+TEMP_SORT = "USE TEMP B-TREE"
+
+
+@contextmanager
+def capture_selects(using=connection):
+    """
+    Collect (sql, params) of every SELECT run on `using` inside the block.
+    """
+    selects = []
+
+    def wrapper(execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith("SELECT"):
+            selects.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with using.execute_wrapper(wrapper):
+        yield selects
+
+
+def query_plan(sql, params) -> list:
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[3] for row in cursor.fetchall()]
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite syntax")
+class QueryPlanTest(TestCase):
+    """
+    The queries behind the quiz list, the quiz detail and the admin must be answered from indexes:
+    no full table scan and no temporary B-tree to sort the rows.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="planner", password="pw-planner-123")
+        cls.admin = User.objects.create_superuser(username="planadmin", password="pw-admin-123")
+        other = User.objects.create_user(username="other", password="pw-other-123")
+        quizzes = Quiz.objects.bulk_create([
+            Quiz(title=f"Quiz {i}", url="https://www.youtube.com/watch?v=plan", owner=owner)
+            for i in range(30) for owner in (cls.user, other)
+        ])
+        Question.objects.bulk_create([
+            Question(quiz=quiz, question_title=f"Frage {j}", question_options=["A", "B", "C", "D"], answer="A")
+            for quiz in quizzes for j in range(5)
+        ])
+        cls.quiz = quizzes[0]
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def setUp(self):
+        # The detail view must reach the database.
+        caches[settings.QUIZ_DETAIL_CACHE_ALIAS].clear()
+
+    def assertIndexedPlans(self, selects):
+        self.assertTrue(selects)
+        for sql, params in selects:
+            plan = query_plan(sql, params)
+            for step in plan:
+                with self.subTest(sql=sql, step=step):
+                    self.assertIsNone(FULL_SCAN.search(step), f"full table scan: {plan}")
+                    self.assertNotIn(TEMP_SORT, step, f"sort in a temporary B-tree: {plan}")
+
+    def api_get(self, url, params=None):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        with capture_selects() as selects:
+            response = client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return selects
+
+    def admin_get(self, url, params=None):
+        self.client.force_login(self.admin)
+        with capture_selects() as selects:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return selects
+
+    def test_quiz_list(self):
+        self.assertIndexedPlans(self.api_get(reverse("quiz-list")))
+
+    def test_quiz_list_pages(self):
+        first = self.api_get(reverse("quiz-list"), {"page_size": 5})
+        self.assertIndexedPlans(first)
+
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        next_url = client.get(reverse("quiz-list"), {"page_size": 5}).data["next"]
+        self.assertIndexedPlans(self.api_get(next_url))
+
+    def test_quiz_list_summary(self):
+        self.assertIndexedPlans(self.api_get(reverse("quiz-list"), {"view": "summary"}))
+        self.assertIndexedPlans(self.api_get(reverse("quiz-list"), {"view": "summary", "page_size": 5}))
+
+    def test_quiz_detail(self):
+        self.assertIndexedPlans(self.api_get(reverse("my-quizzes", args=[self.quiz.pk])))
+
+    def test_quiz_admin(self):
+        self.assertIndexedPlans(self.admin_get(reverse("admin:quiz_app_quiz_changelist")))
+        self.assertIndexedPlans(self.admin_get(reverse("admin:quiz_app_quiz_changelist"),
+                                               {"created_at__gte": "2000-01-01", "created_at__lt": "2100-01-01"}))
+        self.assertIndexedPlans(self.admin_get(reverse("admin:quiz_app_quiz_change", args=[self.quiz.pk])))
+
+    def test_question_admin(self):
+        self.assertIndexedPlans(self.admin_get(reverse("admin:quiz_app_question_changelist")))
+        self.assertIndexedPlans(self.admin_get(reverse("admin:quiz_app_question_changelist"),
+                                               {"quiz__id__exact": self.quiz.pk}))
+
+    def test_detects_unindexed_queries(self):
+        with capture_selects() as selects:
+            list(Question.objects.filter(answer="A").order_by("question_title"))
+
+        plan = query_plan(*selects[0])
+        self.assertTrue(any(FULL_SCAN.search(step) for step in plan))
+        self.assertTrue(any(TEMP_SORT in step for step in plan))
@@ -13,6 +13,7 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.test import override_settings
 from quiz_app.models import Quiz
 
 User = get_user_model()
@@ -36,6 +37,7 @@ class QuizViewsPositiveTest(APITestCase):
         self.list_create_url = reverse("quiz-list-create")
         self.detail_url = lambda pk: reverse("my-quizzes", args=[pk])
 
+    @override_settings(QUIZ_JOBS_EAGER=True)
     @patch("quiz_app.api.utils.generate_quiz_data_from_video")
     def test_create_quiz_authenticated_user(self, mock_generate):
         """
@@ -63,7 +65,8 @@ class QuizViewsPositiveTest(APITestCase):
         }
 
         response = self.client.post(self.list_create_url, data)
-        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], "done")
         self.assertTrue(Quiz.objects.filter(title="Neues Quiz", owner=self.user).exists())
 
     def test_list_quizzes_authenticated_user(self):
@@ -0,0 +1,94 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quiz_app.api.cache import quiz_detail_cache
+from quiz_app.models import Quiz, Question
+
+User = get_user_model()
+
+
+class QuizDetailCacheTest(APITestCase):
+
+    def setUp(self):
+        quiz_detail_cache().clear()
+        self.user = User.objects.create_user(username="testuser", email="test@example.com", password="testpassword123")
+        self.other_user = User.objects.create_user(username="otheruser", email="other@example.com", password="otherpassword")
+        self.quiz = Quiz.objects.create(title="Test Quiz", owner=self.user, url="https://www.youtube.com/watch?v=example")
+        self.question = Question.objects.create(
+            quiz=self.quiz, question_title="Q1", question_options=["A", "B", "C", "D"], answer="A"
+        )
+        self.detail_url = reverse("my-quizzes", args=[self.quiz.id])
+
+    def test_second_request_is_served_from_cache(self):
+        self.client.force_authenticate(user=self.user)
+
+        with self.assertNumQueries(2):
+            first = self.client.get(self.detail_url)
+        with self.assertNumQueries(1):
+            second = self.client.get(self.detail_url)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(second["Content-Type"], "application/json")
+        self.assertEqual(second.data["questions"][0]["question_title"], "Q1")
+
+    def test_update_invalidates_cache(self):
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.detail_url)
+
+        self.client.patch(self.detail_url, {"title": "Neu"})
+
+        self.assertEqual(self.client.get(self.detail_url).data["title"], "Neu")
+
+    def test_question_change_invalidates_cache(self):
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.detail_url)
+
+        self.question.question_title = "Geändert"
+        self.question.save()
+
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.data["questions"][0]["question_title"], "Geändert")
+
+    @patch("quiz_app.signals.invalidate_quiz_detail")
+    def test_question_changes_reach_other_workers(self, mock_invalidate):
+        # Another worker process: the key is not deleted in its cache, only the quiz version moves.
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.detail_url)
+
+        self.question.question_title = "Geändert"
+        self.question.save()
+        self.assertEqual(self.client.get(self.detail_url).data["questions"][0]["question_title"], "Geändert")
+
+        self.question.delete()
+        self.assertEqual(self.client.get(self.detail_url).data["questions"], [])
+
+    def test_deleting_a_quiz_does_not_touch_it_per_question(self):
+        Question.objects.create(quiz=self.quiz, question_title="Q2", question_options=["A", "B", "C", "D"], answer="A")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.quiz.delete()
+
+        self.assertFalse([q["sql"] for q in queries if q["sql"].startswith('UPDATE "quiz_app_quiz"')])
+
+    def test_cached_quiz_is_still_owner_only(self):
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.detail_url)
+
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_deleted_quiz_is_not_served(self):
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.detail_url)
+
+        self.client.delete(self.detail_url)
+
+        self.assertEqual(self.client.get(self.detail_url).status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,62 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quiz_app.models import Quiz, Question
+
+User = get_user_model()
+
+
+def make_quiz(i, questions=3):
+    return {
+        "title": f"Quiz {i}",
+        "description": "Beschreibung",
+        "questions": [
+            {"question_title": f"Q{j}", "question_options": ["A", "B", "C", "D"], "answer": "A"}
+            for j in range(questions)
+        ],
+    }
+
+
+class QuizBulkImportTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", email="test@example.com", password="testpassword123")
+        self.import_url = reverse("quiz-bulk-import")
+
+    def test_import_creates_quizzes_and_questions(self):
+        self.client.force_authenticate(user=self.user)
+        payload = {"quizzes": [make_quiz(i) for i in range(50)]}
+
+        with self.assertNumQueries(4):  # savepoint, quizzes, questions, release
+            response = self.client.post(self.import_url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 50)
+        self.assertEqual(Quiz.objects.filter(owner=self.user).count(), 50)
+        self.assertEqual(Question.objects.filter(quiz__owner=self.user).count(), 150)
+        first = Quiz.objects.get(pk=response.data["ids"][0])
+        self.assertEqual(first.title, "Quiz 0")
+        self.assertEqual(sorted(first.questions.values_list("question_title", flat=True)), ["Q0", "Q1", "Q2"])
+
+    def test_invalid_quiz_rolls_back_everything(self):
+        self.client.force_authenticate(user=self.user)
+        broken = make_quiz(1)
+        broken["questions"][0]["answer"] = "Z"
+
+        response = self.client.post(self.import_url, {"quizzes": [make_quiz(0), broken]}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Quiz.objects.exists())
+
+    @override_settings(QUIZ_IMPORT_MAX_QUIZZES=2)
+    def test_import_size_is_limited(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.import_url, {"quizzes": [make_quiz(i) for i in range(3)]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_import_unauthenticated(self):
+        response = self.client.post(self.import_url, {"quizzes": [make_quiz(0)]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,122 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quiz_app.models import Quiz, Question
+
+User = get_user_model()
+
+
+class QuizListQueryTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", email="test@example.com", password="testpassword123")
+        self.list_url = reverse("quiz-list")
+        self.client.force_authenticate(user=self.user)
+
+    def create_quizzes(self, count, questions_per_quiz=3):
+        for i in range(count):
+            quiz = Quiz.objects.create(title=f"Quiz {i}", owner=self.user, url="https://www.youtube.com/watch?v=example")
+            Question.objects.bulk_create([
+                Question(quiz=quiz, question_title=f"Q{j}", question_options=["A", "B", "C", "D"], answer="A")
+                for j in range(questions_per_quiz)
+            ])
+
+    def count_list_queries(self, params=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.list_url, params or {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries)
+
+    def test_query_count_does_not_grow_with_quizzes(self):
+        """
+        Questions are prefetched in one query, no matter how many quizzes the user has.
+        """
+        self.create_quizzes(1)
+        few = self.count_list_queries()
+
+        self.create_quizzes(20)
+        many = self.count_list_queries()
+
+        self.assertEqual(few, many)
+        self.assertEqual(many, 2)
+
+    def test_paginated_query_count_is_constant(self):
+        self.create_quizzes(30)
+        self.assertEqual(self.count_list_queries({"page_size": 5}), 2)
+        self.assertEqual(self.count_list_queries({"page_size": 25}), 2)
+
+    def test_unpaginated_list_is_newest_first(self):
+        self.create_quizzes(3, questions_per_quiz=2)
+        response = self.client.get(self.list_url)
+        self.assertEqual([q["title"] for q in response.data], ["Quiz 2", "Quiz 1", "Quiz 0"])
+        self.assertEqual([q["question_title"] for q in response.data[0]["questions"]], ["Q0", "Q1"])
+
+    def test_cursor_pagination_walks_all_quizzes_once(self):
+        self.create_quizzes(7, questions_per_quiz=1)
+        # Identical timestamps must still page stably via the id tie-breaker.
+        Quiz.objects.update(created_at=Quiz.objects.first().created_at)
+
+        titles = []
+        response = self.client.get(self.list_url, {"page_size": 3})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            titles += [q["title"] for q in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+
+        self.assertEqual(titles, [f"Quiz {i}" for i in reversed(range(7))])
+
+    def test_default_response_keeps_all_fields(self):
+        self.create_quizzes(1, questions_per_quiz=2)
+        response = self.client.get(self.list_url)
+        self.assertEqual(set(response.data[0]), {"id", "title", "description", "created_at", "updated_at",
+                                                 "video_url", "questions"})
+
+    def test_summary_counts_questions_without_loading_them(self):
+        self.create_quizzes(2, questions_per_quiz=4)
+        Quiz.objects.create(title="Empty", owner=self.user, url="https://www.youtube.com/watch?v=example")
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.list_url, {"view": "summary"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data[0]), {"id", "title", "created_at", "updated_at", "video_url",
+                                                 "questions_count"})
+        self.assertEqual([(q["title"], q["questions_count"]) for q in response.data],
+                         [("Empty", 0), ("Quiz 1", 4), ("Quiz 0", 4)])
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn('"quiz_app_quiz"."description"', ctx.captured_queries[0]["sql"])
+        self.assertNotIn('"quiz_app_question"."question_options"', ctx.captured_queries[0]["sql"])
+
+    def test_summary_pages(self):
+        self.create_quizzes(5, questions_per_quiz=1)
+        response = self.client.get(self.list_url, {"view": "summary", "page_size": 2})
+        response = self.client.get(response.data["next"])
+
+        self.assertEqual([q["title"] for q in response.data["results"]], ["Quiz 2", "Quiz 1"])
+        self.assertEqual(response.data["results"][0]["questions_count"], 1)
+
+    def test_fields_select_the_returned_fields(self):
+        self.create_quizzes(2, questions_per_quiz=2)
+
+        self.assertEqual(self.count_list_queries({"fields": "id,title"}), 1)
+        response = self.client.get(self.list_url, {"fields": "id, title"})
+        self.assertEqual(response.data[0], {"id": response.data[0]["id"], "title": "Quiz 1"})
+
+        self.assertEqual(self.count_list_queries({"fields": "title,questions"}), 2)
+        response = self.client.get(self.list_url, {"view": "summary", "fields": "title,questions_count"})
+        self.assertEqual(response.data[0], {"title": "Quiz 1", "questions_count": 2})
+
+    def test_unknown_view_or_fields_are_rejected(self):
+        for params, key in (({"view": "compact"}, "view"), ({"fields": "title,answer"}, "fields"),
+                            ({"fields": "questions_count"}, "fields"), ({"fields": ","}, "fields"),
+                            ({"fields": "url"}, "fields")):
+            with self.subTest(params=params):
+                response = self.client.get(self.list_url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn(key, response.data)
@@ -0,0 +1,146 @@
+import json
+import random
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quiz_app.api import gemini, utils
+from quiz_app.api.stream_parser import QuizStreamParser
+from quiz_app.bench.fake_gemini import FakeGeminiServer
+from quiz_app.models import Quiz, Question
+
+User = get_user_model()
+
+QUIZ = {
+    "title": "Quiz \"Eins\"",
+    "description": "Beschreibung mit {Klammern} und [Listen]",
+    "questions": [
+        {"question_title": f"Frage {i}?", "question_options": ["A", "B", "C", "D"], "answer": "A"}
+        for i in range(3)
+    ],
+}
+
+
+def split(text, pieces):
+    cuts = sorted(random.Random(pieces).sample(range(1, len(text)), pieces - 1))
+    return [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+
+
+class QuizStreamParserTest(SimpleTestCase):
+
+    def test_events_from_arbitrary_chunks(self):
+        text = "```json\n" + json.dumps(QUIZ, indent=2) + "\n```"
+        for pieces in (1, 7, len(text)):
+            parser = QuizStreamParser()
+            events = [event for chunk in split(text, pieces) for event in parser.feed(chunk)]
+
+            self.assertEqual(events[:2], [("field", "title", QUIZ["title"]),
+                                          ("field", "description", QUIZ["description"])])
+            self.assertEqual([e[1] for e in events[2:]], QUIZ["questions"])
+            self.assertTrue(parser.finished)
+
+    def test_question_is_emitted_before_the_response_ends(self):
+        text = json.dumps(QUIZ)
+        parser = QuizStreamParser()
+        first_question_end = text.index('"A"}') + len('"A"}')
+
+        events = parser.feed(text[:first_question_end])
+
+        self.assertEqual(events[-1], ("question", QUIZ["questions"][0]))
+        self.assertFalse(parser.finished)
+
+
+class QuizStreamViewTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", email="test@example.com", password="testpassword123")
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("quiz-create-stream")
+
+    def start_server(self, responses):
+        server = FakeGeminiServer(responses).start()
+        self.addCleanup(server.stop)
+        overrides = override_settings(API_KEY="test-key", GEMINI_BASE_URL=server.base_url,
+                                      GEMINI_RETRY_INITIAL_DELAY=0.01, GEMINI_RETRY_MAX_DELAY=0.02)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        gemini.reset_client()
+        self.addCleanup(gemini.reset_client)
+        return server
+
+    def read_events(self, response):
+        return [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+
+    @patch("quiz_app.api.utils.obtain_transcript", return_value={"success": True, "text": "Hallo Welt"})
+    def test_questions_are_streamed_and_saved(self, mock_transcript):
+        self.start_server([{"status": 503}, {"chunks": split(json.dumps(QUIZ), 12)}])
+
+        response = self.client.post(self.url, {"url": "https://www.youtube.com/watch?v=abc"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        events = self.read_events(response)
+        self.assertEqual([e["event"] for e in events],
+                         ["stage", "stage", "quiz", "quiz", "quiz", "question", "question", "question", "done"])
+        self.assertEqual(events[5]["question"]["question_title"], "Frage 0?")
+        self.assertEqual(events[-1]["quiz"]["title"], QUIZ["title"])
+        self.assertEqual(len(events[-1]["quiz"]["questions"]), 3)
+
+        quiz = Quiz.objects.get(owner=self.user)
+        self.assertEqual(quiz.description, QUIZ["description"])
+        self.assertEqual(quiz.questions.count(), 3)
+
+    @patch("quiz_app.api.utils.obtain_transcript", return_value={"success": True, "text": "Hallo Welt"})
+    def test_incomplete_question_discards_the_quiz(self, mock_transcript):
+        broken = {**QUIZ, "questions": [QUIZ["questions"][0], {"question_title": "Ohne Antwort"}]}
+        self.start_server([{"text": json.dumps(broken)}])
+
+        response = self.client.post(self.url, {"url": "https://www.youtube.com/watch?v=abc"}, format="json")
+
+        events = self.read_events(response)
+        self.assertEqual(events[-1], {"event": "error", "error": "Frage 1 unvollständig"})
+        self.assertFalse(Quiz.objects.exists())
+        self.assertFalse(Question.objects.exists())
+
+    @patch("quiz_app.api.utils.obtain_transcript", return_value={"success": False, "error": "Download failed"})
+    def test_transcript_failure_is_reported(self, mock_transcript):
+        response = self.client.post(self.url, {"url": "https://www.youtube.com/watch?v=abc"}, format="json")
+
+        self.assertEqual(self.read_events(response)[-1], {"event": "error", "error": "Download failed"})
+        self.assertFalse(Quiz.objects.exists())
+
+    @patch("quiz_app.api.utils.obtain_transcript", return_value={"success": True, "text": "Hallo Welt"})
+    def test_disconnected_client_discards_the_quiz(self, mock_transcript):
+        self.start_server([{"chunks": split(json.dumps(QUIZ), 12)}] * 2)
+
+        for last_event in ("quiz", "question"):
+            with self.subTest(last_event=last_event):
+                events = utils.stream_quiz_generation("https://www.youtube.com/watch?v=abc", self.user)
+                while next(events)["event"] != last_event:
+                    pass
+                self.assertTrue(Quiz.objects.exists())
+
+                # What StreamingHttpResponse does when the client goes away.
+                events.close()
+
+                self.assertFalse(Quiz.objects.exists())
+                self.assertFalse(Question.objects.exists())
+
+    @patch("quiz_app.api.utils.obtain_transcript", return_value={"success": True, "text": "Hallo Welt"})
+    def test_streams_are_not_recorded_as_latencies(self, mock_transcript):
+        self.start_server([{"text": json.dumps(QUIZ)}])
+        gemini.latency_tracker.clear()
+
+        events = list(utils.stream_quiz_generation("https://www.youtube.com/watch?v=abc", self.user))
+
+        self.assertEqual(events[-1]["event"], "done")
+        self.assertIsNone(gemini.latency_tracker.percentile(50, 1))
+
+    def test_invalid_url_is_rejected(self):
+        response = self.client.post(self.url, {"url": "kein-link"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,74 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from quiz_app.api import transcript_cache, utils
+from quiz_app.models import TranscriptCacheEntry
+
+INFO = {"id": "GPGk5QTBkLs", "extractor_key": "Youtube", "extractor": "youtube", "title": "Video"}
+QUIZ_DATA = {
+    "title": "Quiz",
+    "description": "Beschreibung",
+    "questions": [{"question_title": "Q1", "question_options": ["A", "B", "C", "D"], "answer": "A"}],
+}
+
+
+class TranscriptCacheTest(TestCase):
+
+    def test_video_key_uses_extractor_and_id(self):
+        self.assertEqual(transcript_cache.video_key_from_info(INFO), ("youtube", "GPGk5QTBkLs"))
+        self.assertIsNone(transcript_cache.video_key_from_info({"title": "no id"}))
+
+    def test_store_and_hit(self):
+        transcript_cache.store_transcript(INFO, "small", "de", "Hallo Welt")
+
+        self.assertEqual(transcript_cache.get_cached_transcript(INFO, "small", "de"), "Hallo Welt")
+        self.assertIsNone(transcript_cache.get_cached_transcript(INFO, "medium", "de"))
+        self.assertIsNone(transcript_cache.get_cached_transcript(INFO, "small", "en"))
+        self.assertEqual(TranscriptCacheEntry.objects.get().hits, 1)
+
+    def test_partial_transcript_only_serves_smaller_budgets(self):
+        transcript_cache.store_transcript(INFO, "small", "de", "Anfang", max_seconds=600)
+
+        self.assertEqual(transcript_cache.get_cached_transcript(INFO, "small", "de", max_seconds=600), "Anfang")
+        self.assertEqual(transcript_cache.get_cached_transcript(INFO, "small", "de", max_seconds=300), "Anfang")
+        self.assertIsNone(transcript_cache.get_cached_transcript(INFO, "small", "de", max_seconds=900))
+        self.assertIsNone(transcript_cache.get_cached_transcript(INFO, "small", "de"))
+
+    @override_settings(TRANSCRIPT_CACHE_ENABLED=False)
+    def test_disabled_cache_stores_nothing(self):
+        transcript_cache.store_transcript(INFO, "small", "de", "Hallo Welt")
+        self.assertFalse(TranscriptCacheEntry.objects.exists())
+
+    @override_settings(TRANSCRIPT_CACHE_MAX_BYTES=10)
+    def test_least_recently_used_entries_are_evicted(self):
+        old = transcript_cache.store_transcript({**INFO, "id": "old"}, "small", "de", "aaaaa")
+        TranscriptCacheEntry.objects.filter(pk=old.pk).update(last_used_at=timezone.now() - timedelta(hours=1))
+        transcript_cache.store_transcript({**INFO, "id": "recent"}, "small", "de", "bbbbb")
+
+        transcript_cache.store_transcript({**INFO, "id": "new"}, "small", "de", "ccccc")
+
+        self.assertEqual(
+            set(TranscriptCacheEntry.objects.values_list("video_id", flat=True)),
+            {"recent", "new"},
+        )
+
+
+@override_settings(TRANSCRIPTION_WORKERS=0)
+class PipelineTranscriptCacheTest(TestCase):
+
+    @patch("quiz_app.api.utils.generate_quiz_with_gemini", return_value=QUIZ_DATA)
+    @patch("quiz_app.api.utils.run_whisper_transcription", return_value="Hallo Welt")
+    @patch("quiz_app.api.utils.download_audio_from_url", return_value={"success": True, "filepath": "x.mp3"})
+    @patch("quiz_app.api.utils.extract_video_info", return_value={"success": True, "info": INFO})
+    def test_second_submission_skips_download_and_transcription(self, mock_info, mock_download, mock_whisper, mock_gemini):
+        first = utils.generate_quiz_data_from_video("https://www.youtube.com/watch?v=GPGk5QTBkLs")
+        second = utils.generate_quiz_data_from_video("https://youtu.be/GPGk5QTBkLs")
+
+        self.assertTrue(first["success"])
+        self.assertTrue(second["success"])
+        mock_download.assert_called_once()
+        mock_whisper.assert_called_once()
+        self.assertEqual(mock_gemini.call_args_list[1].args[0], "Hallo Welt")
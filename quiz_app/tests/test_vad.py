@@ -0,0 +1,184 @@
+import os
+import tempfile
+import wave
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from quiz_app.api import chunked_transcription, utils, vad
+from quiz_app.api.jobs import run_job
+from quiz_app.api.whisper_registry import WhisperModelRegistry
+from quiz_app.models import QuizGenerationJob
+
+User = get_user_model()
+RATE = vad.SAMPLE_RATE
+
+
+def tone(seconds: float, db: float = -15.0) -> np.ndarray:
+    """
+    A stand-in for speech: a 220 Hz tone at `db` dBFS RMS.
+    """
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (10 ** (db / 20) * np.sqrt(2) * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def silence(seconds: float, db: float = None) -> np.ndarray:
+    if db is None:
+        return np.zeros(int(seconds * RATE), dtype=np.float32)
+    rng = np.random.default_rng(0)
+    return (10 ** (db / 20) * rng.standard_normal(int(seconds * RATE))).astype(np.float32)
+
+
+def write_wav(path: str, samples: np.ndarray):
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(RATE)
+        f.writeframes((samples * 32767).astype(np.int16).tobytes())
+
+
+class DetectSpeechTest(SimpleTestCase):
+
+    def test_long_silences_are_removed(self):
+        samples = np.concatenate([silence(1), tone(2), silence(3), tone(2), silence(1)])
+
+        speech, speech_map, stats = vad.trim_silence(samples, min_silence=0.8, padding=0.2)
+
+        self.assertEqual(len(speech_map.regions), 2)
+        (start1, end1), (start2, end2) = speech_map.regions
+        self.assertAlmostEqual(start1, 0.8, delta=0.05)
+        self.assertAlmostEqual(end1, 3.2, delta=0.05)
+        self.assertAlmostEqual(start2, 5.8, delta=0.05)
+        self.assertAlmostEqual(end2, 8.2, delta=0.05)
+        self.assertEqual(stats["audio_seconds"], 9.0)
+        self.assertAlmostEqual(stats["removed_seconds"], 4.2, delta=0.1)
+        self.assertEqual(len(speech), int(stats["speech_seconds"] * RATE))
+
+    def test_short_pauses_are_kept(self):
+        samples = np.concatenate([tone(1), silence(0.5), tone(1)])
+        _, speech_map, stats = vad.trim_silence(samples, min_silence=0.8, padding=0.2)
+
+        self.assertEqual(speech_map.regions, [(0.0, 2.5)])
+        self.assertEqual(stats["removed_seconds"], 0.0)
+
+    def test_background_noise_counts_as_silence(self):
+        samples = np.concatenate([silence(2, db=-50), tone(2), silence(2, db=-50)])
+        _, speech_map, _ = vad.trim_silence(samples, min_silence=0.8, padding=0)
+
+        self.assertEqual(len(speech_map.regions), 1)
+        self.assertAlmostEqual(speech_map.regions[0][0], 2.0, delta=0.05)
+        self.assertAlmostEqual(speech_map.regions[0][1], 4.0, delta=0.05)
+
+    def test_quiet_speaker_without_pauses_is_kept(self):
+        samples = np.concatenate([tone(2, db=-20), tone(2, db=-40), tone(2, db=-20)])
+        _, _, stats = vad.trim_silence(samples)
+        self.assertEqual(stats["removed_seconds"], 0.0)
+
+    def test_clicks_are_not_speech(self):
+        samples = np.concatenate([silence(2), tone(0.1), silence(2)])
+        speech, _, stats = vad.trim_silence(samples)
+
+        self.assertEqual(len(speech), 0)
+        self.assertEqual(stats["removed_seconds"], 4.1)
+
+    def test_speech_map_translates_back_to_the_original(self):
+        speech_map = vad.SpeechMap([(1.0, 3.0), (6.0, 8.0)])
+
+        self.assertEqual(speech_map.speech_seconds, 4.0)
+        self.assertEqual(speech_map.to_original(0.5), 1.5)
+        self.assertEqual(speech_map.to_original(2.5), 6.5)
+        self.assertEqual(speech_map.to_original(10), 8.0)
+
+
+class TranscriptionWithVadTest(SimpleTestCase):
+
+    def setUp(self):
+        self.model = MagicMock()
+        self.model.transcribe.return_value = {"text": " Hallo Welt "}
+
+    def test_segment_worker_decodes_only_speech(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, "segment_00000.wav")
+            write_wav(path, np.concatenate([silence(3), tone(2), silence(3)]))
+
+            with patch.object(chunked_transcription, "_worker_engine", self.model), \
+                    patch.object(chunked_transcription, "_worker_vad", {"min_silence": 0.8, "padding": 0.2}):
+                result = chunked_transcription._transcribe_segment(path, "de")
+
+        self.assertEqual(result["text"], "Hallo Welt")
+        self.assertEqual(result["audio_seconds"], 8.0)
+        self.assertAlmostEqual(result["speech_seconds"], 2.4, delta=0.05)
+        decoded = self.model.transcribe.call_args.args[0]
+        self.assertAlmostEqual(len(decoded) / RATE, 2.4, delta=0.05)
+
+    def test_silent_segment_is_not_decoded(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, "segment_00000.wav")
+            write_wav(path, silence(5))
+
+            with patch.object(chunked_transcription, "_worker_engine", self.model), \
+                    patch.object(chunked_transcription, "_worker_vad", {"min_silence": 0.8, "padding": 0.2}):
+                result = chunked_transcription._transcribe_segment(path, "de")
+
+        self.assertEqual(result["text"], "")
+        self.model.transcribe.assert_not_called()
+
+    @override_settings(VAD_ENABLED=True, WHISPER_DEFAULT_MODEL="tiny")
+    @patch("whisper.load_audio")
+    def test_whole_file_transcription_reports_removed_seconds(self, mock_load):
+        mock_load.return_value = np.concatenate([silence(10), tone(5), silence(10)])
+        registry = WhisperModelRegistry(loader=MagicMock(return_value=self.model), idle_timeout=0)
+        events = []
+
+        with patch.object(utils, "whisper_registry", registry):
+            text = utils.run_whisper_transcription("a.opus", max_seconds=20,
+                                                   on_progress=lambda event, **data: events.append((event, data)))
+
+        self.assertEqual(text, " Hallo Welt ")
+        self.assertAlmostEqual(len(self.model.transcribe.call_args.args[0]) / RATE, 5.4, delta=0.05)
+        self.assertEqual(self.model.transcribe.call_args.kwargs["clip_timestamps"], "0")
+        [(event, data)] = events
+        self.assertEqual(event, "vad")
+        self.assertEqual(data["audio_seconds"], 20.0)
+        self.assertAlmostEqual(data["removed_seconds"], 14.6, delta=0.05)
+
+    @override_settings(VAD_ENABLED=False)
+    def test_vad_can_be_disabled(self):
+        self.assertIsNone(vad.options_from_settings())
+        self.assertIsNone(utils.trim_audio_file("a.opus"))
+
+    def test_chunked_transcription_sums_up_the_segments(self):
+        def fake_stream(source, on_vad=None, **kwargs):
+            on_vad(120.0, 90.5)
+            on_vad(60.0, 59.5)
+            return "Hallo"
+
+        events = []
+        with patch.object(chunked_transcription, "transcribe_stream", side_effect=fake_stream):
+            result = utils.run_chunked_transcription(
+                "https://youtu.be/x", {"url": "https://media.example/a.m4a"},
+                on_progress=lambda event, **data: events.append((event, data)),
+            )
+
+        self.assertTrue(result["success"])
+        self.assertEqual(events, [("vad", {"audio_seconds": 180.0, "speech_seconds": 150.0, "removed_seconds": 30.0})])
+
+
+class JobSilenceRemovedTest(TestCase):
+
+    @patch("quiz_app.api.utils.generate_quiz_data_from_video")
+    def test_job_records_removed_seconds(self, mock_generate):
+        def fake_pipeline(url, on_stage, on_progress):
+            on_progress("vad", audio_seconds=600.0, speech_seconds=450.0, removed_seconds=150.0)
+            return {"success": False, "error": "Empty or failed transcript"}
+
+        mock_generate.side_effect = fake_pipeline
+        user = User.objects.create_user(username="testuser", password="testpassword123")
+        job = QuizGenerationJob.objects.create(owner=user, url="https://www.youtube.com/watch?v=abc")
+
+        run_job(job.id)
+        job.refresh_from_db()
+
+        self.assertEqual(job.silence_seconds_removed, 150.0)
@@ -0,0 +1,79 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, override_settings
+
+from quiz_app.api.whisper_registry import WhisperModelRegistry
+
+
+class WhisperModelRegistryTest(SimpleTestCase):
+
+    def test_model_is_loaded_once(self):
+        loader = MagicMock(side_effect=lambda name: object())
+        registry = WhisperModelRegistry(loader=loader, idle_timeout=0)
+
+        with registry.use("small") as first:
+            pass
+        with registry.use("small") as second:
+            pass
+
+        self.assertIs(first, second)
+        loader.assert_called_once_with("small")
+
+    def test_concurrent_first_use_loads_once(self):
+        def slow_loader(name):
+            time.sleep(0.05)
+            return object()
+
+        loader = MagicMock(side_effect=slow_loader)
+        registry = WhisperModelRegistry(loader=loader, idle_timeout=0)
+
+        threads = [threading.Thread(target=registry.get, args=("small",)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        loader.assert_called_once_with("small")
+
+    def test_idle_models_are_evicted(self):
+        registry = WhisperModelRegistry(loader=lambda name: object(), idle_timeout=60)
+        registry._ensure_reaper = lambda: None
+        entry = registry.get("small")
+
+        self.assertEqual(registry.evict_idle(now=entry.last_used + 30), [])
+        self.assertEqual(registry.evict_idle(now=entry.last_used + 61), ["small"])
+        self.assertEqual(registry.loaded_models(), [])
+
+    def test_model_in_use_is_not_evicted(self):
+        registry = WhisperModelRegistry(loader=lambda name: object(), idle_timeout=60)
+        registry._ensure_reaper = lambda: None
+
+        with registry.use("small"):
+            entry = registry.get("small")
+            self.assertEqual(registry.evict_idle(now=entry.last_used + 120), [])
+
+    def test_warm_up_ignores_load_errors(self):
+        registry = WhisperModelRegistry(loader=MagicMock(side_effect=RuntimeError("no weights")), idle_timeout=0)
+        registry.warm_up(["small"])
+        self.assertEqual(registry.loaded_models(), [])
+
+
+class RunWhisperTranscriptionTest(SimpleTestCase):
+
+    @override_settings(WHISPER_DEFAULT_MODEL="tiny")
+    @patch("quiz_app.api.utils.os.remove")
+    def test_uses_registry_model(self, mock_remove):
+        from quiz_app.api import utils
+
+        model = MagicMock()
+        model.transcribe.return_value = {"text": "Hallo Welt"}
+        registry = WhisperModelRegistry(loader=MagicMock(return_value=model), idle_timeout=0)
+
+        with patch.object(utils, "whisper_registry", registry):
+            self.assertEqual(utils.run_whisper_transcription("a.mp3"), "Hallo Welt")
+            self.assertEqual(utils.run_whisper_transcription("b.mp3"), "Hallo Welt")
+
+        self.assertEqual(registry.loaded_models(), ["tiny"])
+        self.assertEqual(model.transcribe.call_count, 2)